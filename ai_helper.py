@@ -6,11 +6,21 @@ Gemini 3 Flash Preview를 사용한 AI 기능
 - 리포트 생성
 """
 
+import asyncio
+import hashlib
 import os
 import json
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
-import google.generativeai as genai
+from typing import AsyncIterator, List, Dict, Optional
+
+from download_retry import RetryPolicy
+from llm_backends import RecordingBackend, create_backend, requires_api_key, selected_backend
+from llm_cache import ResponseCache
+from llm_limiter import ModelRateLimiter, is_quota_error, retry_after
+from pdf_extract import EXTRACT_SLACK, PdfExtractor, TextCache, format_pages
+from text_chunks import chunk_text
+from text_compact import compact_text, estimate_tokens
 
 # PDF 텍스트 추출
 try:
@@ -20,18 +30,161 @@ except ImportError:
     PDF_SUPPORT = False
     print("[WARN] PyPDF2가 설치되지 않았습니다. pip install PyPDF2")
 
+# 프롬프트 템플릿 버전 - 템플릿을 고치면 올려서 캐시된 이전 응답을 무효화
+PROMPT_VERSIONS = {
+    'summary': 1,
+    'chunk': 1,
+    'summary_reduce': 1,
+    'summary_pack': 1,
+    'summary_packed': 1,
+    'expand': 1,
+    'report': 2,
+    'report_group': 1,
+    'report_merge': 1,
+}
+
+# 작업별 응답 캐시 유효 시간 (초)
+RESPONSE_TTLS = {
+    'summary': 30 * 24 * 3600,
+    'chunk': 90 * 24 * 3600,
+    'summary_reduce': 30 * 24 * 3600,
+    'summary_pack': 30 * 24 * 3600,
+    'summary_packed': 30 * 24 * 3600,
+    'expand': 7 * 24 * 3600,
+    'report': 7 * 24 * 3600,
+    'report_group': 30 * 24 * 3600,
+    'report_merge': 7 * 24 * 3600,
+}
+
+# 한 번의 요약 요청에 넣는 문서 텍스트 최대 글자 수 (넘으면 청크 요약 또는 자르기)
+SUMMARY_CHAR_LIMIT = 30000
+
+# 청크 요약(map) 단계의 청크 크기 (글자 수)
+CHUNK_CHARS = 20000
+
+# 청크 노트가 합쳐도 너무 길면 노트를 다시 요약하는 최대 단계 수
+MAX_NOTE_LEVELS = 3
+
+# 여러 작은 문서를 한 요청으로 묶어 요약 (summarize_many_async)
+# - 압축 후 PACK_DOC_TOKENS 이하인 문서만 묶음
+# - 한 요청에 최대 PACK_MAX_DOCS개, 문서 텍스트 합계 PACK_TOKEN_BUDGET 토큰까지
+PACK_DOC_TOKENS = 3000
+PACK_MAX_DOCS = 6
+PACK_TOKEN_BUDGET = 12000
+
+# 종합 리포트 - 문서가 REPORT_GROUP_SIZE개보다 많으면 묶음별 분석 노트를 동시에 만든 뒤 합침
+# 묶음 경계는 문서 키 해시로 정하므로 문서가 추가되어도 그 문서가 들어간 묶음만 다시 생성됨
+REPORT_GROUP_SIZE = 10
+REPORT_GROUP_MAX = 2 * REPORT_GROUP_SIZE
+
+# 리포트 프롬프트에 넣는 문서별 요약 최대 글자 수
+REPORT_SUMMARY_CHARS = 1500
+
+SUMMARY_FORMAT = """다음 형식으로 요약해주세요:
+1. **제목**: 문서 제목
+2. **핵심 주제**: 1-2문장으로 주제 설명
+3. **주요 내용**: 3-5개의 핵심 포인트 (불릿 포인트)
+4. **주요 통계/수치**: 중요한 데이터가 있다면 나열
+5. **결론/시사점**: 문서의 결론이나 비즈니스 시사점
+
+간결하고 명확하게 작성해주세요."""
+
+REPORT_FORMAT = """리포트 구성:
+## 1. 개요 (Executive Summary)
+- 검색 주제에 대한 간략한 소개
+- 검색 결과 요약
+
+## 2. 주요 트렌드
+- 문서들에서 발견되는 주요 트렌드 3-5개
+- 각 트렌드에 대한 설명
+
+## 3. 문서 분류
+- 문서 유형별 분류 및 특징
+- 주요 문서 하이라이트
+
+## 4. 비즈니스 시사점
+- 보험사/금융사에 대한 시사점
+- 실무 적용 포인트
+
+## 5. 추가 연구 제안
+- 더 조사해볼 만한 관련 주제
+- 권장 키워드
+
+전문적이면서도 이해하기 쉽게 작성해주세요."""
+
+
+def _document_hash(doc: Dict) -> str:
+    key = doc.get('url') or doc.get('title') or ''
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def group_documents(documents: List[Dict], group_size: int = REPORT_GROUP_SIZE,
+                    max_size: int = REPORT_GROUP_MAX) -> List[List[Dict]]:
+    """리포트용 문서 묶음 (유형별로 모이도록 정렬, 평균 group_size개)
+
+    문서를 (유형, URL/제목 해시) 순으로 정렬하고, 해시가 group_size로 나누어떨어지는 문서에서
+    새 묶음을 시작합니다(max_size에 닿으면 강제로 나눔). 경계가 문서 내용으로 정해지므로
+    문서가 추가/삭제되어도 그 문서가 속한 묶음만 바뀌고 나머지 묶음(과 캐시된 노트)은 그대로입니다.
+    """
+    keyed = sorted(
+        ((doc.get('type') or 'Unknown', _document_hash(doc), doc) for doc in documents),
+        key=lambda item: item[:2]
+    )
+    groups = []
+    current = []
+    for _, digest, doc in keyed:
+        boundary = int(digest[:8], 16) % group_size == 0
+        if current and (boundary or len(current) >= max_size):
+            groups.append(current)
+            current = []
+        current.append(doc)
+    if current:
+        groups.append(current)
+    return groups
+
 
 class LimraAIHelper:
     """Gemini 3 Flash Preview를 사용한 AI 도우미"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    RESPONSE_CACHE_NAME = 'llm_cache.json'
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_text: bool = True,
+        cache_dir: Optional[str] = None,
+        max_concurrency: int = 5,
+        requests_per_minute: int = 30,
+        chunked: bool = True,
+        max_pages: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        packed: bool = True,
+        backend: Optional[str] = None,
+        llm_log: Optional[str] = None,
+        model=None
+    ):
         """
         Args:
             api_key: Google AI API 키 (없으면 환경변수 GOOGLE_API_KEY 사용)
+            cache_text: 추출 텍스트를 PDF 옆 .store/text에 캐시 (내용 해시 기준)
+            cache_dir: 모델 응답 캐시(llm_cache.json)를 저장할 폴더 (None이면 메모리에만 보관)
+            max_concurrency: 비동기 메서드의 동시 모델 요청 수
+            requests_per_minute: 분당 최대 모델 요청 수 (0이면 제한 없음)
+            chunked: 긴 문서를 자르지 않고 청크별로 요약한 뒤 합침 (map-reduce)
+            max_pages: PDF 최대 추출 페이지 수 (기본: chunked면 200, 아니면 20)
+            token_budget: 문서당 프롬프트 토큰 예산 - 예산이 차면 이후 페이지는 추출하지 않음
+                          (기본: chunked면 100000, 아니면 SUMMARY_CHAR_LIMIT 분량)
+            packed: 여러 문서를 요약할 때 작은 문서를 묶어 한 요청으로 요약
+            backend: 모델 백엔드 - gemini / record (호출을 JSONL로 기록) / replay (기록 재생, 오프라인)
+                     (기본: 환경변수 LIMRA_LLM_BACKEND, 없으면 gemini)
+            llm_log: record/replay JSONL 경로 (기본: 환경변수 LIMRA_LLM_LOG)
+            model: generate_content / generate_content_async를 가진 모델 객체
+                   (llm_backends.ReplayBackend 등, 주면 backend 대신 사용하고 API 키 없이 동작)
         """
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY")
+        backend = backend or selected_backend()
 
-        if not self.api_key:
+        if model is None and requires_api_key(backend) and not self.api_key:
             raise ValueError(
                 "Google API 키가 필요합니다.\n"
                 "1. https://aistudio.google.com/app/apikey 에서 API 키 생성\n"
@@ -39,66 +192,287 @@ class LimraAIHelper:
                 "   또는 LimraAIHelper(api_key='your_api_key') 로 직접 전달"
             )
 
-        # Gemini 설정
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        # 모델 백엔드 (gemini만 google.generativeai 필요)
+        if model is None:
+            model = create_backend(backend, api_key=self.api_key, log_path=llm_log)
+        self.model = model
+        self.model_name = getattr(model, 'model_name', type(model).__name__)
+
+        # 비동기 요청 동시성/분당 요청 수 제한, 할당량 초과 시 백오프 재시도
+        self.limiter = ModelRateLimiter(max_concurrency, requests_per_minute)
+        self.quota_retry = RetryPolicy(max_attempts=4, base_delay=5.0, max_delay=60.0)
+
+        # 같은 입력에 대한 모델 호출 재사용
+        # (record 모드는 캐시 적중으로 호출을 건너뛰면 기록이 빠져 재생이 실패하므로 조회하지 않음)
+        recording = isinstance(model, RecordingBackend)
+        self.response_cache = ResponseCache(
+            Path(cache_dir) / self.RESPONSE_CACHE_NAME if cache_dir else None,
+            readable=not recording
+        )
+        if recording:
+            print("[CACHE] record 모드 - 모델 응답 캐시를 조회하지 않고 모든 호출을 기록")
+
+        # 여러 PDF를 프로세스 풀로 병렬 추출 (처음 사용할 때 풀 생성)
+        self.chunked = chunked
+        self.packed = packed
+        self.max_pages = max_pages or (200 if chunked else 20)
+        self.token_budget = token_budget or (100000 if chunked else estimate_tokens('x' * SUMMARY_CHAR_LIMIT))
+        self.text_cache = TextCache() if cache_text else None
+        self.extractor = PdfExtractor(
+            max_pages=self.max_pages,
+            cache=self.text_cache,
+            token_budget=self.token_budget
+        )
+
+        print(f"[OK] AI 초기화 완료 (모델: {self.model_name})")
+
+    def _response_key(self, kind: str, prompt: str, language: str) -> str:
+        return ResponseCache.make_key(self.model_name, kind, PROMPT_VERSIONS[kind], language, prompt)
+
+    def _generate(self, kind: str, prompt: str, language: str) -> str:
+        """모델 호출 (같은 모델/템플릿 버전/언어/프롬프트면 캐시된 응답 반환)
 
-        print("[OK] Gemini AI 초기화 완료")
+        Args:
+            kind: 작업 종류 (summary / expand / report)
+            prompt: 완성된 프롬프트
+            language: 출력 언어
 
-    def extract_pdf_text(self, pdf_path: str, max_pages: int = 20) -> str:
+        Returns:
+            응답 텍스트 (호출 실패 시 예외, 실패한 응답은 캐시하지 않음)
+        """
+        key = self._response_key(kind, prompt, language)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            print(f"[CACHE] 캐시된 모델 응답 사용 ({kind})")
+            return cached
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.model.generate_content(prompt)
+                break
+            except Exception as e:
+                delay = self._quota_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+        text = response.text
+        self.response_cache.set(key, text, ttl=RESPONSE_TTLS.get(kind))
+        return text
+
+    async def _generate_async(self, kind: str, prompt: str, language: str) -> str:
+        """_generate의 비동기 버전 (limiter로 동시성/분당 요청 수 제한)"""
+        key = self._response_key(kind, prompt, language)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            print(f"[CACHE] 캐시된 모델 응답 사용 ({kind})")
+            return cached
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self.limiter.slot():
+                    response = await self.model.generate_content_async(prompt)
+                break
+            except Exception as e:
+                delay = self._quota_delay(e, attempt)
+                if delay is None:
+                    raise
+                # 대기는 슬롯 밖에서 - 다른 요청은 계속 진행
+                await asyncio.sleep(delay)
+
+        text = response.text
+        self.response_cache.set(key, text, ttl=RESPONSE_TTLS.get(kind))
+        return text
+
+    async def _generate_stream_async(self, kind: str, prompt: str, language: str) -> AsyncIterator[str]:
+        """_generate_async의 스트리밍 버전 - 생성되는 대로 텍스트 조각을 yield
+
+        캐시 적중이면 전체 응답을 한 번에 yield하고, 끝까지 받은 응답만 캐시에 저장합니다.
+        모델 스트림은 별도 태스크가 읽으므로 느린 소비자(SSE 클라이언트)가 있어도
+        limiter 슬롯은 생성이 끝나는 대로 반납됩니다.
+        """
+        key = self._response_key(kind, prompt, language)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            print(f"[CACHE] 캐시된 모델 응답 사용 ({kind})")
+            yield cached
+            return
+
+        pieces = asyncio.Queue()
+        task = asyncio.create_task(self._pump_stream(kind, key, prompt, pieces))
+        try:
+            while True:
+                piece = await pieces.get()
+                if piece is None:
+                    break
+                yield piece
+            await task  # 스트림 오류는 여기서 전달
+        finally:
+            # 소비자가 중간에 그만두면 모델 스트림도 중단
+            if not task.done():
+                task.cancel()
+
+    async def _pump_stream(self, kind: str, key: str, prompt: str, pieces: asyncio.Queue):
+        """모델 스트림을 끝까지 읽어 pieces에 넣음 (끝나면 None)
+
+        할당량 초과 재시도는 첫 조각을 받기 전까지만 합니다.
+        """
+        parts = []
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    async with self.limiter.slot():
+                        response = await self.model.generate_content_async(prompt, stream=True)
+                        async for chunk in response:
+                            if chunk.text:
+                                parts.append(chunk.text)
+                                pieces.put_nowait(chunk.text)
+                    break
+                except Exception as e:
+                    delay = None if parts else self._quota_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+
+            self.response_cache.set(key, "".join(parts), ttl=RESPONSE_TTLS.get(kind))
+        finally:
+            pieces.put_nowait(None)
+
+    def _quota_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """할당량 초과면 재시도 전 대기 시간, 재시도하지 않을 오류면 None"""
+        if not is_quota_error(error) or attempt >= self.quota_retry.max_attempts:
+            return None
+        delay = retry_after(error) or self.quota_retry.backoff(attempt)
+        print(f"[WARN] 모델 요청 한도 초과 - {delay:.1f}초 후 재시도 "
+              f"({attempt}/{self.quota_retry.max_attempts - 1})")
+        return delay
+
+    def extract_pdf_text(self, pdf_path: str, max_pages: Optional[int] = None) -> str:
         """PDF에서 텍스트 추출
 
         Args:
             pdf_path: PDF 파일 경로
-            max_pages: 최대 페이지 수
+            max_pages: 최대 페이지 수 (기본: self.max_pages)
 
         Returns:
             추출된 텍스트
         """
+        max_pages = max_pages or self.max_pages
+        if self.text_cache:
+            cached = self.text_cache.get(pdf_path, max_pages, self.token_budget)
+            if cached:
+                return cached['text']
+
         if not PDF_SUPPORT:
             return "[ERROR] PyPDF2가 설치되지 않았습니다."
 
         try:
-            text_parts = []
+            pages = []
             with open(pdf_path, 'rb') as f:
                 reader = PyPDF2.PdfReader(f)
                 total_pages = min(len(reader.pages), max_pages)
 
+                # 토큰 예산(압축 여유분 포함)이 차면 나머지 페이지는 읽지 않음
+                limit = self.token_budget * EXTRACT_SLACK
+                tokens = 0
                 for i in range(total_pages):
-                    page = reader.pages[i]
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(f"--- Page {i+1} ---\n{text}")
+                    page_text = reader.pages[i].extract_text() or ''
+                    pages.append((i, page_text))
+                    tokens += estimate_tokens(page_text)
+                    if tokens >= limit:
+                        break
 
-            return "\n\n".join(text_parts)
+            text = format_pages(pages)
+            if self.text_cache:
+                self.text_cache.set(pdf_path, max_pages, text, len(pages), self.token_budget)
+            return text
 
         except Exception as e:
             return f"[ERROR] PDF 읽기 실패: {e}"
 
-    def summarize_pdf(self, pdf_path: str, language: str = "ko") -> Dict:
-        """PDF 문서 요약
+    def extract_text(self, path: str, max_pages: Optional[int] = None) -> str:
+        """문서 텍스트 추출 (PDF 또는 페이지 캡처 텍스트 .md/.txt)
 
         Args:
-            pdf_path: PDF 파일 경로
-            language: 출력 언어 (ko: 한국어, en: 영어)
+            path: 파일 경로
+            max_pages: PDF 최대 페이지 수 (기본: self.max_pages)
 
         Returns:
-            요약 결과 딕셔너리
+            추출된 텍스트
         """
-        print(f"[AI] PDF 요약 중: {Path(pdf_path).name}")
+        if Path(path).suffix.lower() in ('.md', '.txt'):
+            try:
+                return Path(path).read_text(encoding='utf-8')
+            except Exception as e:
+                return f"[ERROR] 텍스트 파일 읽기 실패: {e}"
+        return self.extract_pdf_text(path, max_pages)
+
+    def extract_texts(self, paths: List[str]) -> List[str]:
+        """여러 문서 텍스트를 병렬 추출 (PDF는 프로세스 풀, .md/.txt는 직접 읽기)
+
+        Args:
+            paths: 파일 경로 목록
+
+        Returns:
+            입력 순서대로 추출된 텍스트 (실패한 파일은 "[ERROR] ..." 문자열)
+        """
+        texts = [None] * len(paths)
+        pdf_indices = []
+        for i, path in enumerate(paths):
+            if Path(path).suffix.lower() in ('.md', '.txt'):
+                texts[i] = self.extract_text(path)
+            else:
+                pdf_indices.append(i)
+
+        if pdf_indices:
+            results = self.extractor.extract_many([str(paths[i]) for i in pdf_indices])
+            for i, result in zip(pdf_indices, results):
+                texts[i] = f"[ERROR] {result['error']}" if result['error'] else result['text']
+            cached = sum(1 for result in results if result.get('cached'))
+            if cached:
+                print(f"[CACHE] 추출 텍스트 캐시 사용: {cached}/{len(results)}개 PDF")
+        return texts
+
+    async def extract_texts_async(self, paths: List[str]) -> List[str]:
+        """extract_texts를 스레드에서 실행 (비동기 파이프라인용)"""
+        return await asyncio.to_thread(self.extract_texts, paths)
+
+    def _prepare_summary(self, pdf_path: str, language: str, text: Optional[str]) -> Dict:
+        """요약 프롬프트 준비
 
+        Returns:
+            {'prompt', 'text', 'text_length'}, 긴 문서를 청크 요약할 때는 {'chunks', 'text_length'},
+            실패 시 {'error', 'summary': None}
+        """
         # 텍스트 추출
-        text = self.extract_pdf_text(pdf_path)
+        if text is None:
+            text = self.extract_text(pdf_path)
 
         if text.startswith("[ERROR]"):
             return {"error": text, "summary": None}
 
+        # 반복 머리글/바닥글, 공백 정리 + 토큰 예산 적용 (페이지 구분은 청크 경계로 쓰도록 유지)
+        raw_length = len(text)
+        text, stats = compact_text(text, self.token_budget)
+        if stats['removed_lines'] or stats['truncated']:
+            print(f"[AI] 텍스트 압축: {raw_length:,}자 -> {len(text):,}자 "
+                  f"(반복 줄 {stats['removed_lines']}개 제거, 약 {stats['tokens']:,} 토큰"
+                  f"{', 예산 초과로 뒷부분 생략' if stats['truncated'] else ''})")
+
         if not text.strip():
             return {"error": "PDF에서 텍스트를 추출할 수 없습니다.", "summary": None}
 
-        # 텍스트가 너무 길면 자르기 (약 30000자)
-        if len(text) > 30000:
-            text = text[:30000] + "\n\n[... 이하 생략 ...]"
+        if len(text) > SUMMARY_CHAR_LIMIT:
+            if self.chunked:
+                return {"chunks": chunk_text(text, CHUNK_CHARS), "text_length": len(text)}
+            # 텍스트가 너무 길면 자르기
+            text = text[:SUMMARY_CHAR_LIMIT] + "\n\n[... 이하 생략 ...]"
 
         # 요약 프롬프트
         lang_instruction = "한국어로" if language == "ko" else "in English"
@@ -108,25 +482,96 @@ class LimraAIHelper:
 문서 내용:
 {text}
 
-다음 형식으로 요약해주세요:
-1. **제목**: 문서 제목
-2. **핵심 주제**: 1-2문장으로 주제 설명
-3. **주요 내용**: 3-5개의 핵심 포인트 (불릿 포인트)
-4. **주요 통계/수치**: 중요한 데이터가 있다면 나열
-5. **결론/시사점**: 문서의 결론이나 비즈니스 시사점
+{SUMMARY_FORMAT}"""
 
-간결하고 명확하게 작성해주세요."""
+        return {"prompt": prompt, "text": text, "text_length": len(text)}
+
+    def _chunk_prompt(self, chunk: str) -> str:
+        """청크 노트 프롬프트 - 출력 언어와 무관하므로 다른 언어로 다시 요약할 때 재사용됨"""
+        return f"""다음은 보험/금융 산업 관련 긴 연구 문서의 일부입니다.
+나중에 문서 전체 요약을 만들 수 있도록 이 부분의 내용을 영어 불릿 노트로 정리해주세요.
+
+포함할 내용:
+- 제목 또는 장/절 제목 (있다면)
+- 핵심 주장과 발견
+- 중요한 통계/수치 (단위, 연도, 대상 포함)
+- 결론이나 시사점
+
+문서 일부:
+{chunk}"""
+
+    def _reduce_prompt(self, notes: List[str], language: str) -> str:
+        lang_instruction = "한국어로" if language == "ko" else "in English"
+        parts = "\n\n".join(f"[파트 {i}/{len(notes)}]\n{note}" for i, note in enumerate(notes, 1))
+        return f"""다음은 보험/금융 산업 관련 긴 연구 문서를 {len(notes)}개 부분으로 나누어 정리한 노트입니다.
+노트를 종합하여 문서 전체를 {lang_instruction} 요약해주세요.
+
+부분별 노트:
+{parts}
+
+{SUMMARY_FORMAT}"""
+
+    @staticmethod
+    def _notes_fit(notes: List[str]) -> bool:
+        return len("\n\n".join(notes)) <= SUMMARY_CHAR_LIMIT
+
+    def _map_chunks(self, chunks: List[str]) -> List[str]:
+        """청크별 노트 생성 (합친 노트가 너무 길면 노트를 다시 청크로 나눠 정리)"""
+        notes = [self._generate('chunk', self._chunk_prompt(chunk), 'notes') for chunk in chunks]
+        for _ in range(MAX_NOTE_LEVELS - 1):
+            if self._notes_fit(notes):
+                break
+            notes = [self._generate('chunk', self._chunk_prompt(chunk), 'notes')
+                     for chunk in chunk_text("\n\n".join(notes), CHUNK_CHARS)]
+        return notes
+
+    async def _map_chunks_async(self, chunks: List[str]) -> List[str]:
+        """_map_chunks의 비동기 버전 (청크 요청을 동시에)"""
+        async def map_level(level_chunks):
+            return list(await asyncio.gather(*[
+                self._generate_async('chunk', self._chunk_prompt(chunk), 'notes')
+                for chunk in level_chunks
+            ]))
+
+        notes = await map_level(chunks)
+        for _ in range(MAX_NOTE_LEVELS - 1):
+            if self._notes_fit(notes):
+                break
+            notes = await map_level(chunk_text("\n\n".join(notes), CHUNK_CHARS))
+        return notes
+
+    def summarize_pdf(self, pdf_path: str, language: str = "ko", text: Optional[str] = None) -> Dict:
+        """PDF 문서 요약
+
+        Args:
+            pdf_path: PDF 파일 경로 (페이지 캡처 .md/.txt도 가능)
+            language: 출력 언어 (ko: 한국어, en: 영어)
+            text: 미리 추출한 텍스트 (extract_texts 결과, 없으면 여기서 추출)
+
+        Returns:
+            요약 결과 딕셔너리
+        """
+        print(f"[AI] PDF 요약 중: {Path(pdf_path).name}")
+
+        prepared = self._prepare_summary(pdf_path, language, text)
+        if prepared.get("error"):
+            return prepared
 
         try:
-            response = self.model.generate_content(prompt)
-            summary = response.text
+            if "chunks" in prepared:
+                print(f"[AI] 긴 문서 - {len(prepared['chunks'])}개 청크로 나누어 요약")
+                notes = self._map_chunks(prepared["chunks"])
+                summary = self._generate('summary_reduce', self._reduce_prompt(notes, language), language)
+            else:
+                summary = self._generate('summary', prepared["prompt"], language)
 
             print("[OK] PDF 요약 완료")
 
             return {
                 "file": Path(pdf_path).name,
                 "summary": summary,
-                "text_length": len(text),
+                "text_length": prepared["text_length"],
+                "chunks": len(prepared.get("chunks", [])) or 1,
                 "error": None
             }
 
@@ -134,20 +579,256 @@ class LimraAIHelper:
             print(f"[ERROR] AI 요약 실패: {e}")
             return {"error": str(e), "summary": None}
 
-    def expand_keywords(self, keyword: str, industry: str = "insurance", count: int = 10) -> Dict:
-        """키워드 확장 - 관련 검색어 생성
+    async def summarize_pdf_async(
+        self,
+        pdf_path: str,
+        language: str = "ko",
+        text: Optional[str] = None
+    ) -> Dict:
+        """summarize_pdf의 비동기 버전 (동시성/분당 요청 수 제한 적용)"""
+        if text is None:
+            text = (await self.extract_texts_async([pdf_path]))[0]
+
+        prepared = self._prepare_summary(pdf_path, language, text)
+        if prepared.get("error"):
+            return prepared
+        return await self._summarize_prepared_async(pdf_path, language, prepared)
+
+    async def _summarize_prepared_async(self, pdf_path: str, language: str, prepared: Dict) -> Dict:
+        """_prepare_summary 결과로 요약 (단일 요청 또는 청크 map-reduce)"""
+        try:
+            if "chunks" in prepared:
+                print(f"[AI] 긴 문서 - {len(prepared['chunks'])}개 청크로 나누어 요약: {Path(pdf_path).name}")
+                notes = await self._map_chunks_async(prepared["chunks"])
+                summary = await self._generate_async(
+                    'summary_reduce', self._reduce_prompt(notes, language), language)
+            else:
+                summary = await self._generate_async('summary', prepared["prompt"], language)
+            print(f"[OK] PDF 요약 완료: {Path(pdf_path).name}")
+            return {
+                "file": Path(pdf_path).name,
+                "summary": summary,
+                "text_length": prepared["text_length"],
+                "chunks": len(prepared.get("chunks", [])) or 1,
+                "error": None
+            }
 
-        Args:
-            keyword: 원본 키워드
-            industry: 산업 분야 (insurance, finance, retirement 등)
-            count: 생성할 관련 키워드 수
+        except Exception as e:
+            print(f"[ERROR] AI 요약 실패 ({Path(pdf_path).name}): {e}")
+            return {"error": str(e), "summary": None}
+
+    async def summarize_pdf_stream(
+        self,
+        pdf_path: str,
+        language: str = "ko",
+        text: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """요약을 생성되는 대로 yield (긴 문서는 청크 노트를 만든 뒤 합치는 단계부터 스트리밍)
+
+        Raises:
+            ValueError: 텍스트를 추출할 수 없을 때
+        """
+        if text is None:
+            text = (await self.extract_texts_async([pdf_path]))[0]
+
+        prepared = self._prepare_summary(pdf_path, language, text)
+        if prepared.get("error"):
+            raise ValueError(prepared["error"])
+
+        if "chunks" in prepared:
+            print(f"[AI] 긴 문서 - {len(prepared['chunks'])}개 청크로 나누어 요약: {Path(pdf_path).name}")
+            notes = await self._map_chunks_async(prepared["chunks"])
+            stream = self._generate_stream_async('summary_reduce', self._reduce_prompt(notes, language), language)
+        else:
+            stream = self._generate_stream_async('summary', prepared["prompt"], language)
+
+        async for piece in stream:
+            yield piece
+
+    def _pack_prompt(self, docs: List[tuple], language: str) -> str:
+        """묶음 요약 프롬프트 - docs: [(문서 ID, 텍스트)]"""
+        lang_instruction = "한국어로" if language == "ko" else "in English"
+        parts = "\n\n".join(f"[문서 {doc_id}]\n{text}" for doc_id, text in docs)
+        ids = ", ".join(f'"{doc_id}"' for doc_id, _ in docs)
+        return f"""다음은 보험/금융 산업 관련 연구 문서 {len(docs)}개입니다. 각 문서를 따로 {lang_instruction} 요약해주세요.
+문서끼리 내용을 섞지 마세요.
+
+{parts}
+
+각 문서마다 {SUMMARY_FORMAT}
+
+JSON 객체 하나로만 응답해주세요. 키는 문서 ID({ids}), 값은 해당 문서의 요약(마크다운 문자열)입니다:
+{{
+    "{docs[0][0]}": "1. **제목**: ...",
+    ...
+}}"""
+
+    @staticmethod
+    def _strip_code_fence(text: str) -> str:
+        """응답에서 마크다운 코드블록 제거"""
+        if "```json" in text:
+            return text.split("```json")[1].split("```")[0]
+        if "```" in text:
+            return text.split("```")[1].split("```")[0]
+        return text
+
+    def _parse_pack(self, raw_text: str, ids: List[str]) -> Optional[Dict[str, str]]:
+        """묶음 요약 응답(JSON) 해석 - 문서 ID -> 요약 (JSON이 아니면 None, 빠진 문서는 제외)"""
+        try:
+            result = json.loads(self._strip_code_fence(raw_text).strip())
+        except json.JSONDecodeError as e:
+            print(f"[WARN] 묶음 요약 JSON 파싱 실패: {e}")
+            return None
+        if not isinstance(result, dict):
+            print("[WARN] 묶음 요약 응답이 JSON 객체가 아닙니다.")
+            return None
+        return {
+            doc_id: result[doc_id].strip()
+            for doc_id in ids
+            if isinstance(result.get(doc_id), str) and result[doc_id].strip()
+        }
+
+    @staticmethod
+    def _pack_groups(docs: List[tuple]) -> List[List[tuple]]:
+        """(index, prepared, tokens) 목록을 순서대로 PACK_MAX_DOCS / PACK_TOKEN_BUDGET 한도 안에서 묶음"""
+        groups = []
+        current = []
+        tokens = 0
+        for doc in docs:
+            if current and (len(current) >= PACK_MAX_DOCS or tokens + doc[2] > PACK_TOKEN_BUDGET):
+                groups.append(current)
+                current = []
+                tokens = 0
+            current.append(doc)
+            tokens += doc[2]
+        if current:
+            groups.append(current)
+        return groups
+
+    def _packed_result(self, pdf_path: str, prepared: Dict, summary: str, pack_size: Optional[int]) -> Dict:
+        result = {
+            "file": Path(pdf_path).name,
+            "summary": summary,
+            "text_length": prepared["text_length"],
+            "chunks": 1,
+            "error": None
+        }
+        if pack_size:
+            result["packed"] = pack_size
+        return result
+
+    async def _summarize_pack_async(self, paths: List[str], group: List[tuple], language: str) -> List[tuple]:
+        """작은 문서 여러 개를 한 요청으로 요약 (응답에 없는 문서는 개별 요약으로 재시도)
 
         Returns:
-            확장된 키워드 목록
+            [(index, 요약 결과)]
         """
-        print(f"[AI] 키워드 확장 중: {keyword}")
+        ids = [f"D{n}" for n in range(1, len(group) + 1)]
+        prompt = self._pack_prompt([(doc_id, prepared["text"]) for doc_id, (_, prepared, _) in zip(ids, group)],
+                                   language)
+        try:
+            summaries = self._parse_pack(await self._generate_async('summary_pack', prompt, language), ids)
+        except Exception as e:
+            print(f"[WARN] 묶음 요약 요청 실패: {e}")
+            summaries = {}
+        if summaries is None:
+            # 해석할 수 없는 응답은 캐시에 남기지 않음
+            self.response_cache.forget(self._response_key('summary_pack', prompt, language))
+            summaries = {}
+
+        results = []
+        missing = []
+        for doc_id, (index, prepared, _) in zip(ids, group):
+            summary = summaries.get(doc_id)
+            if summary is None:
+                missing.append((index, prepared))
+                continue
+            # 문서별로도 저장 - 다음 실행에서 묶음 구성이 달라져도 재사용
+            self.response_cache.set(self._response_key('summary_packed', prepared["prompt"], language),
+                                    summary, ttl=RESPONSE_TTLS['summary_packed'])
+            results.append((index, self._packed_result(paths[index], prepared, summary, len(group))))
+
+        if missing:
+            print(f"[WARN] 묶음 요약에서 {len(missing)}/{len(group)}개 문서 누락 - 개별 요약으로 재시도")
+            singles = await asyncio.gather(*[
+                self._summarize_prepared_async(paths[index], language, prepared)
+                for index, prepared in missing
+            ])
+            results.extend((index, result) for (index, _), result in zip(missing, singles))
+        return results
+
+    async def summarize_many_async(
+        self,
+        paths: List[str],
+        language: str = "ko",
+        texts: Optional[List[str]] = None,
+        packed: Optional[bool] = None
+    ) -> List[Dict]:
+        """여러 문서를 동시에 요약 (limiter 한도 안에서)
+
+        작은 문서(압축 후 PACK_DOC_TOKENS 이하)는 여러 개를 한 요청으로 묶어 요약하고,
+        묶음 응답을 해석할 수 없으면 개별 요청으로 다시 요약합니다.
 
-        prompt = f"""당신은 보험 및 금융 산업 전문가입니다.
+        Args:
+            paths: 문서 경로 목록
+            language: 출력 언어
+            texts: 미리 추출한 텍스트 (없으면 병렬 추출)
+            packed: 작은 문서 묶음 요약 여부 (기본: self.packed)
+
+        Returns:
+            입력 순서대로 요약 결과 (묶음으로 요약한 문서는 'packed': 묶음 문서 수)
+        """
+        paths = [str(path) for path in paths]
+        if texts is None:
+            texts = await self.extract_texts_async(paths)
+        packed = self.packed if packed is None else packed
+
+        print(f"[AI] {len(paths)}개 문서 동시 요약 "
+              f"(동시 {self.limiter.max_concurrency}개, 분당 {self.limiter.requests_per_minute or '무제한'}건)")
+
+        results = [None] * len(paths)
+        singles = []
+        small = []
+        for index, (path, text) in enumerate(zip(paths, texts)):
+            prepared = self._prepare_summary(path, language, text)
+            if prepared.get("error"):
+                results[index] = prepared
+                continue
+            tokens = estimate_tokens(prepared["text"]) if "prompt" in prepared else None
+            if (not packed or tokens is None or tokens > PACK_DOC_TOKENS
+                    or self.response_cache.has(self._response_key('summary', prepared["prompt"], language))):
+                # 큰 문서, 또는 이전에 개별 요약한 응답이 캐시에 있는 문서
+                singles.append((index, prepared))
+                continue
+            cached = self.response_cache.get(
+                self._response_key('summary_packed', prepared["prompt"], language))
+            if cached is not None:
+                print(f"[CACHE] 캐시된 묶음 요약 사용: {Path(path).name}")
+                results[index] = self._packed_result(path, prepared, cached, None)
+            else:
+                small.append((index, prepared, tokens))
+
+        groups = self._pack_groups(small)
+        # 한 개짜리 묶음은 개별 요청으로
+        singles.extend((group[0][0], group[0][1]) for group in groups if len(group) == 1)
+        groups = [group for group in groups if len(group) > 1]
+        if groups:
+            print(f"[AI] 작은 문서 {sum(len(group) for group in groups)}개를 {len(groups)}개 요청으로 묶어 요약")
+
+        async def single(index, prepared):
+            return [(index, await self._summarize_prepared_async(paths[index], language, prepared))]
+
+        batches = await asyncio.gather(
+            *[single(index, prepared) for index, prepared in singles],
+            *[self._summarize_pack_async(paths, group, language) for group in groups]
+        )
+        for batch in batches:
+            for index, result in batch:
+                results[index] = result
+        return results
+
+    def _expand_prompt(self, keyword: str, industry: str, count: int) -> str:
+        return f"""당신은 보험 및 금융 산업 전문가입니다.
 
 원본 키워드: "{keyword}"
 산업 분야: {industry}
@@ -173,71 +854,92 @@ JSON 형식으로 응답해주세요:
 
 영어 키워드로 생성해주세요 (LIMRA는 영어 사이트입니다)."""
 
-        try:
-            response = self.model.generate_content(prompt)
-            text = response.text
-
-            # JSON 추출 (마크다운 코드블록 제거)
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0]
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0]
+    def _parse_expansion(self, keyword: str, prompt: str, raw_text: str) -> Dict:
+        """키워드 확장 응답(JSON) 해석"""
+        # JSON 추출 (마크다운 코드블록 제거)
+        text = self._strip_code_fence(raw_text)
 
+        try:
             result = json.loads(text.strip())
-
-            # 모든 키워드를 하나의 리스트로
-            all_keywords = [keyword]  # 원본 포함
-            for key in ["synonyms", "related_concepts", "specific_topics", "metrics"]:
-                if key in result:
-                    all_keywords.extend(result[key])
-
-            result["all_keywords"] = list(set(all_keywords))  # 중복 제거
-
-            print(f"[OK] {len(result['all_keywords'])}개 키워드 생성 완료")
-
-            return result
-
         except json.JSONDecodeError as e:
             print(f"[WARN] JSON 파싱 실패, 텍스트로 반환: {e}")
+            # 파싱할 수 없는 응답은 캐시에 남기지 않음 (다음 실행에서 다시 요청)
+            self.response_cache.forget(self._response_key('expand', prompt, 'en'))
             return {
                 "original": keyword,
                 "all_keywords": [keyword],
-                "raw_response": response.text if 'response' in dir() else str(e),
+                "raw_response": raw_text,
                 "error": "JSON 파싱 실패"
             }
 
-        except Exception as e:
-            print(f"[ERROR] 키워드 확장 실패: {e}")
-            return {"original": keyword, "all_keywords": [keyword], "error": str(e)}
+        # 모든 키워드를 하나의 리스트로
+        all_keywords = [keyword]  # 원본 포함
+        for key in ["synonyms", "related_concepts", "specific_topics", "metrics"]:
+            if key in result:
+                all_keywords.extend(result[key])
 
-    def generate_report(self, documents: List[Dict], keyword: str, language: str = "ko") -> Dict:
-        """검색 결과 기반 종합 리포트 생성
+        result["all_keywords"] = list(set(all_keywords))  # 중복 제거
+
+        print(f"[OK] {len(result['all_keywords'])}개 키워드 생성 완료")
+
+        return result
+
+    def expand_keywords(self, keyword: str, industry: str = "insurance", count: int = 10) -> Dict:
+        """키워드 확장 - 관련 검색어 생성
 
         Args:
-            documents: 검색된 문서 목록 (title, type, url, summary 등)
-            keyword: 검색 키워드
-            language: 출력 언어
+            keyword: 원본 키워드
+            industry: 산업 분야 (insurance, finance, retirement 등)
+            count: 생성할 관련 키워드 수
 
         Returns:
-            생성된 리포트
+            확장된 키워드 목록
         """
-        print(f"[AI] 종합 리포트 생성 중: {keyword}")
+        print(f"[AI] 키워드 확장 중: {keyword}")
 
-        # 문서 정보 정리
-        doc_info = []
-        for i, doc in enumerate(documents[:20], 1):  # 최대 20개
-            info = f"{i}. [{doc.get('type', 'Unknown')}] {doc.get('title', 'No Title')}"
-            if doc.get('summary'):
-                info += f"\n   요약: {doc['summary'][:200]}..."
-            if doc.get('year'):
-                info += f"\n   연도: {doc['year']}"
-            doc_info.append(info)
+        prompt = self._expand_prompt(keyword, industry, count)
 
-        docs_text = "\n\n".join(doc_info)
+        try:
+            raw_text = self._generate('expand', prompt, 'en')
+        except Exception as e:
+            print(f"[ERROR] 키워드 확장 실패: {e}")
+            return {"original": keyword, "all_keywords": [keyword], "error": str(e)}
+
+        return self._parse_expansion(keyword, prompt, raw_text)
+
+    async def expand_keywords_async(self, keyword: str, industry: str = "insurance", count: int = 10) -> Dict:
+        """expand_keywords의 비동기 버전"""
+        print(f"[AI] 키워드 확장 중: {keyword}")
+
+        prompt = self._expand_prompt(keyword, industry, count)
+
+        try:
+            raw_text = await self._generate_async('expand', prompt, 'en')
+        except Exception as e:
+            print(f"[ERROR] 키워드 확장 실패: {e}")
+            return {"original": keyword, "all_keywords": [keyword], "error": str(e)}
+
+        return self._parse_expansion(keyword, prompt, raw_text)
+
+    @staticmethod
+    def _report_entry(index: int, doc: Dict) -> str:
+        info = f"{index}. [{doc.get('type', 'Unknown')}] {doc.get('title', 'No Title')}"
+        if doc.get('year'):
+            info += f"\n   연도: {doc['year']}"
+        if doc.get('summary'):
+            summary = doc['summary']
+            if len(summary) > REPORT_SUMMARY_CHARS:
+                summary = summary[:REPORT_SUMMARY_CHARS] + "..."
+            info += f"\n   요약: {summary}"
+        return info
+
+    def _report_prompt(self, documents: List[Dict], keyword: str, language: str) -> str:
+        """문서 목록으로 바로 리포트를 만드는 프롬프트 (문서가 REPORT_GROUP_SIZE개 이하일 때)"""
+        docs_text = "\n\n".join(self._report_entry(i, doc) for i, doc in enumerate(documents, 1))
 
         lang_instruction = "한국어로" if language == "ko" else "in English"
 
-        prompt = f"""당신은 보험 산업 리서치 전문가입니다.
+        return f"""당신은 보험 산업 리서치 전문가입니다.
 
 검색 키워드: "{keyword}"
 검색된 문서 수: {len(documents)}개
@@ -247,38 +949,118 @@ JSON 형식으로 응답해주세요:
 
 이 검색 결과를 바탕으로 {lang_instruction} 종합 분석 리포트를 작성해주세요.
 
-리포트 구성:
-## 1. 개요 (Executive Summary)
-- 검색 주제에 대한 간략한 소개
-- 검색 결과 요약
-
-## 2. 주요 트렌드
-- 문서들에서 발견되는 주요 트렌드 3-5개
-- 각 트렌드에 대한 설명
+{REPORT_FORMAT}"""
 
-## 3. 문서 분류
-- 문서 유형별 분류 및 특징
-- 주요 문서 하이라이트
+    def _report_group_prompt(self, keyword: str, entries: List[str], notes: bool = False) -> str:
+        """문서 묶음(notes=True면 하위 묶음 노트) -> 분석 노트 프롬프트
 
-## 4. 비즈니스 시사점
+        출력 언어와 무관하므로 다른 언어로 리포트를 다시 만들 때 재사용됩니다.
+        """
+        material = "문서 묶음별 분석 노트" if notes else "검색된 문서 일부"
+        body = "\n\n".join(entries)
+        return f"""당신은 보험 산업 리서치 전문가입니다.
+검색 키워드 "{keyword}"의 종합 리포트를 여러 부분으로 나누어 준비하고 있습니다.
+다음 {material}를 나중에 다른 부분과 합칠 수 있도록 영어 불릿 노트로 정리해주세요.
+
+포함할 내용:
+- 공통 주제와 트렌드 (근거가 되는 문서 제목과 함께)
+- 중요한 통계/수치 (단위, 연도, 대상 포함)
+- 문서 유형과 특히 중요한 문서
 - 보험사/금융사에 대한 시사점
-- 실무 적용 포인트
 
-## 5. 추가 연구 제안
-- 더 조사해볼 만한 관련 주제
-- 권장 키워드
+{material}:
+{body}"""
 
-전문적이면서도 이해하기 쉽게 작성해주세요."""
+    def _report_merge_prompt(self, documents: List[Dict], keyword: str, notes: List[str], language: str) -> str:
+        """묶음별 분석 노트를 합쳐 최종 리포트를 만드는 프롬프트"""
+        lang_instruction = "한국어로" if language == "ko" else "in English"
+        types = {}
+        for doc in documents:
+            doc_type = doc.get('type') or 'Unknown'
+            types[doc_type] = types.get(doc_type, 0) + 1
+        type_counts = ", ".join(f"{doc_type} {count}개" for doc_type, count in types.items())
+        parts = "\n\n".join(f"[묶음 {i}/{len(notes)}]\n{note}" for i, note in enumerate(notes, 1))
+
+        return f"""당신은 보험 산업 리서치 전문가입니다.
+
+검색 키워드: "{keyword}"
+검색된 문서 수: {len(documents)}개 ({type_counts})
+
+검색된 문서를 {len(notes)}개 묶음으로 나누어 정리한 분석 노트:
+{parts}
+
+이 노트를 종합하여 {lang_instruction} 종합 분석 리포트를 작성해주세요.
+
+{REPORT_FORMAT}"""
+
+    @staticmethod
+    def _note_groups(notes: List[str]) -> List[List[str]]:
+        """합친 노트가 너무 길 때 다시 정리할 노트 묶음 (REPORT_GROUP_SIZE개씩)"""
+        return [notes[i:i + REPORT_GROUP_SIZE] for i in range(0, len(notes), REPORT_GROUP_SIZE)]
+
+    def _report_notes(self, documents: List[Dict], keyword: str) -> List[str]:
+        """문서 묶음별 분석 노트 (합친 노트가 너무 길면 노트를 다시 묶어 정리)"""
+        groups = group_documents(documents)
+        notes = [
+            self._generate('report_group', self._report_group_prompt(
+                keyword, [self._report_entry(i, doc) for i, doc in enumerate(group, 1)]), 'notes')
+            for group in groups
+        ]
+        for _ in range(MAX_NOTE_LEVELS - 1):
+            if self._notes_fit(notes) or len(notes) == 1:
+                break
+            notes = [self._generate('report_group', self._report_group_prompt(keyword, level, notes=True), 'notes')
+                     for level in self._note_groups(notes)]
+        return notes
+
+    async def _report_notes_async(self, documents: List[Dict], keyword: str) -> List[str]:
+        """_report_notes의 비동기 버전 (묶음 요청을 동시에, 바뀌지 않은 묶음은 캐시 사용)"""
+        groups = group_documents(documents)
+        print(f"[AI] 문서 {len(documents)}개를 {len(groups)}개 묶음으로 나누어 분석")
+        notes = list(await asyncio.gather(*[
+            self._generate_async('report_group', self._report_group_prompt(
+                keyword, [self._report_entry(i, doc) for i, doc in enumerate(group, 1)]), 'notes')
+            for group in groups
+        ]))
+        for _ in range(MAX_NOTE_LEVELS - 1):
+            if self._notes_fit(notes) or len(notes) == 1:
+                break
+            notes = list(await asyncio.gather(*[
+                self._generate_async('report_group', self._report_group_prompt(keyword, level, notes=True), 'notes')
+                for level in self._note_groups(notes)
+            ]))
+        return notes
+
+    def generate_report(self, documents: List[Dict], keyword: str, language: str = "ko") -> Dict:
+        """검색 결과 기반 종합 리포트 생성
+
+        문서가 REPORT_GROUP_SIZE개보다 많으면 묶음별 분석 노트를 만든 뒤 합칩니다.
+
+        Args:
+            documents: 검색된 문서 목록 (title, type, url, summary 등)
+            keyword: 검색 키워드
+            language: 출력 언어
+
+        Returns:
+            생성된 리포트
+        """
+        print(f"[AI] 종합 리포트 생성 중: {keyword}")
 
         try:
-            response = self.model.generate_content(prompt)
-            report = response.text
+            if len(documents) > REPORT_GROUP_SIZE:
+                notes = self._report_notes(documents, keyword)
+                report = self._generate(
+                    'report_merge', self._report_merge_prompt(documents, keyword, notes, language), language)
+            else:
+                notes = []
+                report = self._generate('report', self._report_prompt(documents, keyword, language), language)
 
             print("[OK] 리포트 생성 완료")
 
             return {
                 "keyword": keyword,
                 "document_count": len(documents),
+                "groups": len(notes) or 1,
                 "report": report,
                 "error": None
             }
@@ -287,8 +1069,58 @@ JSON 형식으로 응답해주세요:
             print(f"[ERROR] 리포트 생성 실패: {e}")
             return {"keyword": keyword, "report": None, "error": str(e)}
 
+    async def generate_report_async(self, documents: List[Dict], keyword: str, language: str = "ko") -> Dict:
+        """generate_report의 비동기 버전 (묶음별 분석 노트는 동시에 생성)"""
+        print(f"[AI] 종합 리포트 생성 중: {keyword}")
+
+        try:
+            if len(documents) > REPORT_GROUP_SIZE:
+                notes = await self._report_notes_async(documents, keyword)
+                report = await self._generate_async(
+                    'report_merge', self._report_merge_prompt(documents, keyword, notes, language), language)
+            else:
+                notes = []
+                report = await self._generate_async(
+                    'report', self._report_prompt(documents, keyword, language), language)
+            print("[OK] 리포트 생성 완료")
+            return {
+                "keyword": keyword,
+                "document_count": len(documents),
+                "groups": len(notes) or 1,
+                "report": report,
+                "error": None
+            }
+
+        except Exception as e:
+            print(f"[ERROR] 리포트 생성 실패: {e}")
+            return {"keyword": keyword, "report": None, "error": str(e)}
+
+    async def generate_report_stream(
+        self,
+        documents: List[Dict],
+        keyword: str,
+        language: str = "ko"
+    ) -> AsyncIterator[str]:
+        """리포트를 생성되는 대로 yield (전체 텍스트는 호출한 쪽에서 이어 붙임)
+
+        문서가 많으면 묶음별 분석 노트를 먼저 만들고, 노트를 합치는 단계부터 스트리밍합니다.
+        """
+        print(f"[AI] 종합 리포트 생성 중: {keyword}")
+
+        if len(documents) > REPORT_GROUP_SIZE:
+            notes = await self._report_notes_async(documents, keyword)
+            stream = self._generate_stream_async(
+                'report_merge', self._report_merge_prompt(documents, keyword, notes, language), language)
+        else:
+            stream = self._generate_stream_async('report', self._report_prompt(documents, keyword, language), language)
+
+        async for piece in stream:
+            yield piece
+
     def summarize_multiple_pdfs(self, pdf_folder: str, language: str = "ko") -> List[Dict]:
-        """폴더 내 모든 PDF 요약
+        """폴더 내 모든 PDF 요약 (동시 요청)
+
+        이벤트 루프 안에서는 summarize_many_async를 직접 await하세요.
 
         Args:
             pdf_folder: PDF 파일들이 있는 폴더
@@ -302,13 +1134,10 @@ JSON 형식으로 응답해주세요:
 
         print(f"[AI] {len(pdf_files)}개 PDF 요약 시작...")
 
-        summaries = []
-        for i, pdf_path in enumerate(pdf_files, 1):
-            print(f"\n[{i}/{len(pdf_files)}] {pdf_path.name}")
-            summary = self.summarize_pdf(str(pdf_path), language)
-            summaries.append(summary)
+        # 텍스트는 먼저 병렬로 추출
+        texts = self.extract_texts(pdf_files)
 
-        return summaries
+        return asyncio.run(self.summarize_many_async(pdf_files, language, texts=texts))
 
 
 # 테스트 코드
@@ -14,6 +14,7 @@ import json
 import sys
 import warnings
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -30,6 +31,8 @@ if sys.platform == 'win32':
 
 from limra_search_agent import LimraSearchAgent
 from ai_helper import LimraAIHelper
+from llm_backends import requires_api_key, selected_backend
+from summary_pipeline import SummaryPipeline
 
 
 async def ai_search_and_analyze(
@@ -82,9 +85,11 @@ async def ai_search_and_analyze(
     ai = None
     api_key = os.environ.get("GOOGLE_API_KEY")
 
-    if api_key:
+    # replay 백엔드(LIMRA_LLM_BACKEND=replay)는 API 키 없이 기록된 응답으로 동작
+    if api_key or not requires_api_key(selected_backend()):
         try:
-            ai = LimraAIHelper(api_key)
+            # 모델 응답 캐시는 다운로드 폴더에 저장 - 같은 분석 재실행 시 모델 호출 없음
+            ai = LimraAIHelper(api_key, cache_dir=download_folder)
         except Exception as e:
             print(f"[WARN] AI 초기화 실패: {e}")
             print("[*] AI 기능 없이 진행합니다.")
@@ -100,7 +105,7 @@ async def ai_search_and_analyze(
         print("[STEP 1] AI 키워드 확장")
         print("-" * 40)
 
-        expanded = ai.expand_keywords(keyword, industry="insurance", count=8)
+        expanded = await ai.expand_keywords_async(keyword, industry="insurance", count=8)
         results["expanded_keywords"] = expanded
 
         if expanded.get("all_keywords"):
@@ -116,14 +121,17 @@ async def ai_search_and_analyze(
     print("[STEP 2] LIMRA 문서 검색")
     print("-" * 40)
 
+    # 요약만 할 문서는 파일 링크가 없을 때 페이지를 PDF로 인쇄하지 않고 본문 텍스트만 저장
     agent = LimraSearchAgent(
         email=email,
         password=password,
         download_folder=download_folder,
-        headless=False
+        headless=False,
+        capture_mode='text' if summarize_pdfs else 'pdf'
     )
 
     all_documents = []
+    pipeline = None
 
     try:
         await agent.initialize()
@@ -174,6 +182,13 @@ async def ai_search_and_analyze(
             print(f"[STEP 3] 문서 다운로드 (최대 {max_downloads}개)")
             print("-" * 40)
 
+            # 4. PDF 요약 - 문서가 저장되는 대로 추출/요약 시작 (다운로드와 겹쳐 진행)
+            if ai and summarize_pdfs:
+                print("[STEP 4] AI PDF 요약 - 다운로드되는 대로 동시에 진행")
+                pipeline = SummaryPipeline(ai, language=language, max_documents=max_downloads)
+                pipeline.start()
+                agent.events.add_sink(pipeline)
+
             agent.search_results = all_documents[:max_downloads]
             downloaded = await agent.download_all_results()
 
@@ -190,33 +205,22 @@ async def ai_search_and_analyze(
     finally:
         await agent.close()
 
-    # 4. PDF 요약
-    if ai and summarize_pdfs and results["documents_downloaded"] > 0:
+    # 4. PDF 요약 - 다운로드 중 시작한 요약이 끝나기를 기다림 (브라우저는 이미 닫힘)
+    if pipeline:
         print("\n" + "-" * 40)
-        print("[STEP 4] AI PDF 요약")
+        print("[STEP 4] AI PDF 요약 마무리")
         print("-" * 40)
 
-        pdf_files = list(Path(download_folder).glob("*.pdf"))
-        # 최근 다운로드된 파일만 (오늘 날짜)
-        today = datetime.now().strftime("%Y%m%d")
-
-        summaries = []
-        for pdf_path in pdf_files[:max_downloads]:
-            print(f"\n[*] 요약 중: {pdf_path.name}")
-            summary = ai.summarize_pdf(str(pdf_path), language=language)
-
-            if summary.get("summary"):
-                summaries.append(summary)
-                print("[OK] 요약 완료")
-
-                # 요약 내용 일부 출력
-                preview = summary["summary"][:200] + "..." if len(summary["summary"]) > 200 else summary["summary"]
-                print(f"    {preview}")
-            else:
-                print(f"[WARN] 요약 실패: {summary.get('error')}")
+        downloads_done = time.monotonic()
+        # 다운로드 폴더의 PDF도 대상 (이번에 저장된 문서는 이미 요약 중, 최대 max_downloads개)
+        for pdf_path in Path(download_folder).glob("*.pdf"):
+            pipeline.submit(pdf_path)
+        summaries = [summary for summary in await pipeline.finish() if summary.get("summary")]
 
         results["pdf_summaries"] = summaries
-        print(f"\n[OK] {len(summaries)}개 PDF 요약 완료")
+        first = pipeline.first_summary_after
+        print(f"\n[OK] {len(summaries)}/{len(pipeline.paths)}개 PDF 요약 완료 "
+              f"(첫 요약 {first or 0:.1f}초, 다운로드 종료 후 추가 {time.monotonic() - downloads_done:.1f}초)")
 
     # 5. 종합 리포트 생성
     if ai and generate_report and all_documents:
@@ -229,25 +233,41 @@ async def ai_search_and_analyze(
             for summary in results.get("pdf_summaries", []):
                 if doc.get("title") and summary.get("file"):
                     if doc["title"][:30] in summary["file"]:
-                        doc["summary"] = summary.get("summary", "")[:500]
+                        doc["summary"] = summary.get("summary", "")
 
-        report_result = ai.generate_report(all_documents, keyword, language=language)
+        # 생성되는 대로 콘솔에 출력하고, 전체 텍스트는 JSON/마크다운 저장용으로 모음
+        print("\n" + "=" * 60)
+        print("종합 리포트")
+        print("=" * 60)
 
-        if report_result.get("report"):
-            results["report"] = report_result["report"]
-            print("[OK] 리포트 생성 완료")
-            print("\n" + "=" * 60)
-            print("종합 리포트")
-            print("=" * 60)
-            print(report_result["report"])
-        else:
-            print(f"[ERROR] 리포트 생성 실패: {report_result.get('error')}")
+        report_parts = []
+        started = time.monotonic()
+        first_output = None
+        try:
+            async for piece in ai.generate_report_stream(all_documents, keyword, language=language):
+                if first_output is None:
+                    first_output = time.monotonic() - started
+                report_parts.append(piece)
+                print(piece, end="", flush=True)
+            print()
+
+            results["report"] = "".join(report_parts)
+            print(f"\n[OK] 리포트 생성 완료 (첫 출력 {first_output or 0:.1f}초, "
+                  f"전체 {time.monotonic() - started:.1f}초)")
+        except Exception as e:
+            print(f"\n[ERROR] 리포트 생성 실패: {e}")
 
     # 6. 결과 저장
     print("\n" + "-" * 40)
     print("[STEP 6] 결과 저장")
     print("-" * 40)
 
+    if ai:
+        cache_stats = ai.response_cache.stats()
+        results["llm_cache"] = cache_stats
+        print(f"[CACHE] 모델 응답 캐시: 적중 {cache_stats['hits']} / 호출 {cache_stats['misses']} "
+              f"(저장 항목 {cache_stats['entries']}개)")
+
     report_filename = f"ai_analysis_{keyword}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     report_path = Path(download_folder) / report_filename
 
@@ -0,0 +1,203 @@
+"""
+AI 요약 동시 요청 벤치마크 (오프라인 - 모델 스텁 사용)
+- 기존 방식: summarize_pdf를 문서마다 순서대로 호출
+- 새 방식: summarize_many_async로 동시 요청 (동시성/분당 요청 수 제한 적용)
+- 묶음 요약: 작은 문서 여러 개를 한 요청으로 (JSON 응답, 해석 실패 시 개별 요청)
+- 다운로드와 겹쳐 요약: --download-interval마다 문서가 저장된다고 가정하고
+  전부 받은 뒤 요약(단계별) vs 저장되는 대로 요약(SummaryPipeline)
+- 스트리밍: generate_report_stream의 첫 출력까지 시간 vs 전체 응답 시간
+
+모델은 llm_backends.ReplayBackend - 요청마다 지정한 지연(지터 포함)만큼 기다린 뒤
+스텁 응답(또는 --log로 준 기록의 응답)을 돌려주며, 일정 비율로 할당량 초과(429)나
+일반 오류를 흉내 낼 수 있습니다. 묶음 요약 요청에는 문서 ID별 JSON을 돌려주고,
+--bad-json 비율만큼은 해석할 수 없는 응답을 돌려줍니다.
+
+사용법:
+    python benchmarks/bench_ai_concurrency.py [--docs 20] [--latency 2.0] [--concurrency 5] [--rpm 0]
+                                              [--quota-errors 0.1] [--failures 0.05] [--log llm_log.jsonl]
+                                              [--large 0.2] [--bad-json 0.1] [--download-interval 0.5]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ai_helper import LimraAIHelper
+from download_events import SAVED, DownloadEvents
+from llm_backends import ReplayBackend, stub_response
+from summary_pipeline import SummaryPipeline
+
+
+# 묶음 요약 프롬프트의 문서 구분 ('[문서 D1]')
+PACK_IDS = re.compile(r'^\[문서 (D\d+)\]$', re.MULTILINE)
+
+
+def make_texts(count: int, large_ratio: float) -> list:
+    """작은 문서(5페이지 팩트시트) + large_ratio 비율의 큰 문서(40페이지 보고서)"""
+    large_every = round(1 / large_ratio) if large_ratio > 0 else 0
+    texts = []
+    for i in range(count):
+        pages = 40 if large_every and i % large_every == 0 else 5
+        body = f"Document {i} body text about retention and persistency. " * (10 if pages > 5 else 1)
+        texts.append("\n\n".join(f"--- Page {p} ---\n{body}" for p in range(1, pages + 1)))
+    return texts
+
+
+def make_fallback(bad_json: float, seed: int = None):
+    """스텁 응답 - 묶음 요약 요청이면 문서 ID별 JSON (bad_json 비율은 깨진 응답)"""
+    rng = random.Random(seed)
+
+    def respond(prompt: str) -> str:
+        ids = PACK_IDS.findall(prompt)
+        if not ids:
+            return stub_response(prompt)
+        if rng.random() < bad_json:
+            return "죄송합니다. 요약을 JSON으로 만들 수 없습니다."
+        return json.dumps({doc_id: stub_response(doc_id) for doc_id in ids}, ensure_ascii=False)
+
+    return respond
+
+
+def make_helper(args) -> tuple:
+    model = ReplayBackend(
+        args.log,
+        latency=args.latency,
+        jitter=0.3,
+        failure_rate=args.failures,
+        quota_error_rate=args.quota_errors,
+        fallback=make_fallback(args.bad_json, args.seed),
+        seed=args.seed,
+    )
+    ai = LimraAIHelper(
+        model=model,
+        cache_text=False,
+        max_concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+    )
+    return ai, model
+
+
+async def simulate_downloads(events: DownloadEvents, folder: str, texts: list, interval: float) -> list:
+    """interval마다 문서 하나를 저장하고 saved 이벤트 발행"""
+    paths = []
+    for i, text in enumerate(texts):
+        await asyncio.sleep(interval)
+        path = Path(folder) / f"doc_{i}.md"
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+        events.emit(SAVED, f"https://example.com/doc_{i}", filepath=str(path))
+    return paths
+
+
+async def phased(ai, texts: list, interval: float) -> int:
+    """기존 방식 - 전부 다운로드한 뒤 요약"""
+    with tempfile.TemporaryDirectory() as folder:
+        paths = await simulate_downloads(DownloadEvents(), folder, texts, interval)
+        results = await ai.summarize_many_async(paths, texts=await ai.extract_texts_async(paths))
+    return sum(1 for r in results if r.get("summary"))
+
+
+async def overlapped(ai, texts: list, interval: float) -> int:
+    """새 방식 - 저장되는 대로 요약"""
+    with tempfile.TemporaryDirectory() as folder:
+        pipeline = SummaryPipeline(ai)
+        pipeline.start()
+        await simulate_downloads(DownloadEvents([pipeline]), folder, texts, interval)
+        results = await pipeline.finish()
+    print(f"[overlap]    묶음 크기 {pipeline.batch_sizes}")
+    return sum(1 for r in results if r.get("summary"))
+
+
+def main(args):
+    paths = [f"doc_{i}.pdf" for i in range(args.docs)]
+    texts = make_texts(args.docs, args.large)
+
+    # 기존 방식 - 순차 호출
+    ai, model = make_helper(args)
+    started = time.perf_counter()
+    results = [ai.summarize_pdf(path, text=text) for path, text in zip(paths, texts)]
+    sequential = time.perf_counter() - started
+    ok = sum(1 for r in results if r.get("summary"))
+    print(f"[sequential] {sequential:.2f}s, 성공 {ok}/{args.docs}, 모델 호출 {model.calls}회")
+
+    # 새 방식 - 동시 요청
+    ai, model = make_helper(args)
+    started = time.perf_counter()
+    results = asyncio.run(ai.summarize_many_async(paths, texts=texts, packed=False))
+    concurrent = time.perf_counter() - started
+    ok = sum(1 for r in results if r.get("summary"))
+    print(f"[concurrent] {concurrent:.2f}s, 성공 {ok}/{args.docs}, 모델 호출 {model.calls}회")
+
+    # 묶음 요약 - 작은 문서를 한 요청으로
+    ai, model = make_helper(args)
+    started = time.perf_counter()
+    results = asyncio.run(ai.summarize_many_async(paths, texts=texts, packed=True))
+    packed = time.perf_counter() - started
+    ok = sum(1 for r in results if r.get("summary"))
+    in_packs = sum(1 for r in results if r.get("packed"))
+    print(f"[packed]     {packed:.2f}s, 성공 {ok}/{args.docs} (묶음 {in_packs}개), 모델 호출 {model.calls}회")
+
+    # 캐시 - 같은 입력 재실행
+    started = time.perf_counter()
+    asyncio.run(ai.summarize_many_async(paths, texts=texts))
+    print(f"[cached]     {time.perf_counter() - started:.2f}s, 모델 호출 {model.calls}회 (누적)")
+
+    # 스트리밍 - 리포트 첫 출력까지 시간
+    ai, model = make_helper(args)
+    documents = [{"title": f"Document {i}", "type": "PDF"} for i in range(args.docs)]
+
+    async def stream_report():
+        started = time.perf_counter()
+        first = None
+        try:
+            async for _ in ai.generate_report_stream(documents, "bench"):
+                first = first if first is not None else time.perf_counter() - started
+        except Exception as e:
+            print(f"[stream]     리포트 실패 (흉내 낸 오류): {e}")
+            return None
+        return first, time.perf_counter() - started
+
+    timings = asyncio.run(stream_report())
+    if timings:
+        print(f"[stream]     리포트 첫 출력 {timings[0]:.2f}s / 전체 {timings[1]:.2f}s")
+
+    # 다운로드와 겹쳐 요약
+    download_time = args.docs * args.download_interval
+    timings = {}
+    for name, run in (("phased", phased), ("overlap", overlapped)):
+        ai, model = make_helper(args)
+        started = time.perf_counter()
+        ok = asyncio.run(run(ai, texts, args.download_interval))
+        timings[name] = time.perf_counter() - started
+        print(f"[{name}]{' ' * (10 - len(name))} {timings[name]:.2f}s (다운로드 {download_time:.2f}s), "
+              f"성공 {ok}/{args.docs}, 모델 호출 {model.calls}회")
+
+    print(f"\n속도 향상: 동시 {sequential / concurrent:.1f}x, 동시+묶음 {sequential / packed:.1f}x, "
+          f"다운로드와 겹쳐 요약 {timings['phased'] / timings['overlap']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI 요약 동시 요청 벤치마크 (replay 백엔드)")
+    parser.add_argument('--docs', type=int, default=20, help='요약할 문서 수')
+    parser.add_argument('--latency', type=float, default=2.0, help='스텁 모델 응답 지연 (초)')
+    parser.add_argument('--concurrency', type=int, default=5, help='동시 요청 수')
+    parser.add_argument('--rpm', type=int, default=0, help='분당 요청 수 제한 (0이면 제한 없음)')
+    parser.add_argument('--quota-errors', type=float, default=0.0, help='할당량 초과 오류 비율 (0~1)')
+    parser.add_argument('--failures', type=float, default=0.0, help='일반 오류 비율 (0~1)')
+    parser.add_argument('--log', default=None, help='재생할 모델 호출 기록 (LIMRA_LLM_BACKEND=record로 남긴 JSONL)')
+    parser.add_argument('--large', type=float, default=0.2, help='큰 문서(묶지 않음) 비율 (0~1)')
+    parser.add_argument('--bad-json', type=float, default=0.0, help='묶음 요약 응답을 깨뜨릴 비율 (0~1)')
+    parser.add_argument('--download-interval', type=float, default=0.5,
+                        help='다운로드와 겹쳐 요약 비교에서 문서 하나를 받는 데 걸리는 시간 (초)')
+    parser.add_argument('--seed', type=int, default=None, help='지연/오류 난수 시드')
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,142 @@
+"""
+다운로드 링크 탐색 벤치마크
+- 기존 방식: 셀렉터 20개를 순회하며 요소마다 is_visible/get_attribute 호출 + _find_pdf_url DOM 재탐색
+- 새 방식: _rank_download_candidates 한 번의 in-page 점수화
+
+사용법:
+    python benchmarks/bench_download_links.py [--links 500] [--repeat 10]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import async_playwright
+
+from limra_search_agent import LimraSearchAgent
+
+FIXTURE = Path(__file__).parent / "fixtures" / "research_article.html"
+BASE_URL = "https://www.limra.com/en/research/insurance/fixture/"
+
+LEGACY_DOWNLOAD_SELECTORS = [
+    'a[href$=".pdf"]',
+    'a[href*=".pdf?"]',
+    'a[href*="/pdf/"]',
+    'a[download]',
+    'a:has-text("Download PDF")',
+    'a:has-text("Download Report")',
+    'a:has-text("Download")',
+    'a:has-text("다운로드")',
+    'a:has-text("PDF")',
+    'a[class*="download"]',
+    'a[class*="Download"]',
+    '.download-link',
+    '.download-btn',
+    '.pdf-download',
+    'button:has-text("Download")',
+    'button:has-text("다운로드")',
+    'a[href*="download"]',
+    'a[href*="Download"]',
+]
+
+LEGACY_PDF_URL_JS = """
+    () => {
+        const urls = [];
+        document.querySelectorAll('a[href]').forEach(a => {
+            const href = a.href || '';
+            if (href.toLowerCase().includes('.pdf')) urls.push(href);
+        });
+        document.querySelectorAll('iframe').forEach(iframe => {
+            const src = iframe.src || '';
+            if (src.toLowerCase().includes('.pdf')) urls.push(src);
+        });
+        document.querySelectorAll('embed[src], object[data]').forEach(el => {
+            const src = el.src || el.data || '';
+            if (src.toLowerCase().includes('.pdf')) urls.push(src);
+        });
+        return urls;
+    }
+"""
+
+
+async def legacy_find(page) -> tuple:
+    """기존 _find_download_element + _find_pdf_url 동작 재현 (CDP 호출 수 포함)"""
+    calls = 0
+    element_href = None
+    for selector in LEGACY_DOWNLOAD_SELECTORS:
+        elements = await page.query_selector_all(selector)
+        calls += 1
+        for element in elements:
+            calls += 1
+            if await element.is_visible():
+                calls += 1
+                href = await element.get_attribute('href')
+                if href and ('.pdf' in href.lower() or 'download' in href.lower()):
+                    element_href = href
+                    break
+        if element_href:
+            break
+
+    pdf_urls = await page.evaluate(LEGACY_PDF_URL_JS)
+    calls += 1
+    pdf_url = next((u for u in pdf_urls if '.pdf' in u.lower()), None)
+    return element_href, pdf_url, calls
+
+
+async def scorer_find(agent, page) -> tuple:
+    """새 방식: 한 번 점수화 후 최상위 후보 사용"""
+    candidates = await agent._rank_download_candidates(page)
+    best = agent._best_clickable(candidates)
+    pdf_url = await agent._find_pdf_url(page, candidates)
+    return (best['url'] if best else None), pdf_url, 1
+
+
+def build_page(extra_links: int) -> str:
+    """픽스처에 네비게이션 링크를 추가해 링크가 많은 페이지 생성"""
+    html = FIXTURE.read_text(encoding='utf-8')
+    links = "\n".join(
+        f'<a href="/en/research/topic-{i}/">Related topic {i} (PDF summary available)</a>'
+        for i in range(extra_links)
+    )
+    return html.replace('<footer id="site-footer">', f'<section class="related">{links}</section>\n<footer id="site-footer">')
+
+
+async def main(extra_links: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = LimraSearchAgent("bench@example.com", "", download_folder=tmp, headless=True)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            await page.route("**/*", lambda route: route.fulfill(
+                status=200, content_type="text/html", body=build_page(extra_links)))
+            await page.goto(BASE_URL)
+
+            for name, finder in (("legacy", legacy_find), ("scorer", lambda pg: scorer_find(agent, pg))):
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    element_url, pdf_url, calls = await finder(page)
+                    timings.append(time.perf_counter() - started)
+
+                timings.sort()
+                print(f"[{name}] median {timings[len(timings) // 2] * 1000:.1f}ms, "
+                      f"min {timings[0] * 1000:.1f}ms, CDP 호출 {calls}회")
+                print(f"    클릭 후보: {element_url}")
+                print(f"    PDF URL : {pdf_url}")
+
+            await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다운로드 링크 탐색 벤치마크")
+    parser.add_argument('--links', type=int, default=500, help='추가할 네비게이션 링크 수')
+    parser.add_argument('--repeat', type=int, default=10, help='반복 횟수')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.links, args.repeat))
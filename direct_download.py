@@ -0,0 +1,313 @@
+"""
+직접 스트리밍 다운로드
+- 브라우저 세션 쿠키로 인증된 요청을 보내 파일을 청크 단위로 .part 파일에 기록
+- HTTP Range로 중단된 전송 이어받기, Content-Length 검증
+  (.part 옆 메타 파일에 URL과 ETag/Last-Modified를 저장하고 If-Range로 같은 파일일 때만 이어받음)
+- 완료 시 원자적으로 최종 파일명으로 변경
+- 스트리밍하면서 SHA-256 계산 (콘텐츠 주소 저장소용)
+"""
+
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import re
+import urllib.error
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlparse
+
+
+class DirectDownloadError(Exception):
+    """직접 다운로드 실패 (브라우저 다운로드로 폴백해야 함)"""
+
+
+class StreamingDownloader:
+    """인증 쿠키를 사용해 파일을 .part로 스트리밍하는 다운로더"""
+
+    CHUNK_SIZE = 256 * 1024  # 256KB
+    PART_SUFFIX = '.part'
+    META_SUFFIX = '.part.json'
+
+    def __init__(
+        self,
+        cookies: list = None,
+        user_agent: str = None,
+        timeout: float = 60,
+        chunk_size: int = None,
+        max_resumes: int = 3
+    ):
+        """
+        Args:
+            cookies: Playwright context.cookies() 형식의 쿠키 목록
+            user_agent: 요청 User-Agent (브라우저와 동일하게 맞춤)
+            timeout: 소켓 타임아웃 (초)
+            chunk_size: 읽기/쓰기 청크 크기 (바이트)
+            max_resumes: 전송이 끊겼을 때 Range로 이어받기 최대 횟수
+        """
+        self.cookies = cookies or []
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.max_resumes = max_resumes
+
+    def _cookie_header(self, url: str) -> str:
+        """URL 호스트/경로에 해당하는 쿠키만 Cookie 헤더로 구성"""
+        parsed = urlparse(url)
+        host = parsed.hostname or ''
+        path = parsed.path or '/'
+
+        pairs = []
+        for cookie in self.cookies:
+            domain = cookie.get('domain', '').lstrip('.')
+            if domain and not (host == domain or host.endswith('.' + domain)):
+                continue
+            if not path.startswith(cookie.get('path', '/')):
+                continue
+            if cookie.get('secure') and parsed.scheme != 'https':
+                continue
+            pairs.append(f"{cookie['name']}={cookie['value']}")
+        return '; '.join(pairs)
+
+    def _build_request(
+        self,
+        url: str,
+        offset: int,
+        referer: str = None,
+        if_range: str = None
+    ) -> urllib.request.Request:
+        headers = {'Accept': '*/*'}
+        if self.user_agent:
+            headers['User-Agent'] = self.user_agent
+        if referer:
+            headers['Referer'] = referer
+        cookie_header = self._cookie_header(url)
+        if cookie_header:
+            headers['Cookie'] = cookie_header
+        if offset > 0:
+            headers['Range'] = f'bytes={offset}-'
+            if if_range:
+                # 서버 파일이 바뀌었으면 206 대신 전체(200)를 보내도록
+                headers['If-Range'] = if_range
+        return urllib.request.Request(url, headers=headers)
+
+    @staticmethod
+    def _if_range_value(validators: dict):
+        """If-Range 값 (약한 ETag는 If-Range에 쓸 수 없으므로 Last-Modified 사용)"""
+        etag = validators.get('etag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return validators.get('last_modified')
+
+    @staticmethod
+    def _load_meta(meta_path: Path) -> dict:
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _save_meta(meta_path: Path, url: str, validators: dict):
+        """.part가 어떤 URL/버전의 내용인지 기록"""
+        temp_path = meta_path.with_name(meta_path.name + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'url': url, **validators}, f, ensure_ascii=False)
+            os.replace(temp_path, meta_path)
+        except OSError as e:
+            print(f"[WARN] 이어받기 정보 저장 실패: {e}")
+
+    @staticmethod
+    def _discard_part(part_path: Path, meta_path: Path):
+        for path in (part_path, meta_path):
+            if path.exists():
+                path.unlink()
+
+    def _hash_existing(self, part_path: Path):
+        """이어받기 전에 기존 .part 내용을 해시에 반영"""
+        hasher = hashlib.sha256()
+        if part_path.exists():
+            with open(part_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                    hasher.update(chunk)
+        return hasher
+
+    @staticmethod
+    def _total_from_content_range(value: str):
+        """'bytes 100-199/1000' -> 1000 (알 수 없으면 None)"""
+        match = re.match(r'bytes\s+(?:\d+-\d+|\*)/(\d+)', value or '')
+        return int(match.group(1)) if match else None
+
+    def download(self, url: str, filepath: str, referer: str = None, progress=None) -> dict:
+        """
+        파일을 filepath로 다운로드 (동기). 중간에 끊기면 .part에서 이어받음
+
+        Args:
+            url: 파일 URL
+            filepath: 최종 저장 경로
+            referer: Referer 헤더 (문서 랜딩 페이지)
+            progress: 응답 시작 시(이어받을 오프셋)와 청크마다 호출할 콜백
+                      progress(받은 바이트, 전체 크기 또는 None) (다운로드 스레드에서 호출됨)
+
+        Returns:
+            {'filepath', 'size', 'sha256', 'resumed_from', 'content_type', 'etag', 'last_modified'}
+
+        Raises:
+            DirectDownloadError: HTML 응답(로그인 페이지 등), 크기 불일치, HTTP 오류
+        """
+        filepath = Path(filepath)
+        part_path = filepath.with_name(filepath.name + self.PART_SUFFIX)
+        meta_path = filepath.with_name(filepath.name + self.META_SUFFIX)
+
+        # 다른 URL이거나 버전을 확인할 수 없는 .part는 이어받지 않고 처음부터
+        validators = {}
+        if part_path.exists():
+            meta = self._load_meta(meta_path)
+            validators = {
+                'etag': meta.get('etag'),
+                'last_modified': meta.get('last_modified'),
+            }
+            if meta.get('url') != url or not self._if_range_value(validators):
+                print(f"[CACHE] 이어받을 수 없는 .part 삭제: {part_path.name}")
+                self._discard_part(part_path, meta_path)
+                validators = {}
+
+        resumed_from = part_path.stat().st_size if part_path.exists() else 0
+        content_type = ''
+        hasher = self._hash_existing(part_path)
+
+        for attempt in range(self.max_resumes + 1):
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            request = self._build_request(url, offset, referer, self._if_range_value(validators))
+
+            try:
+                response = urllib.request.urlopen(request, timeout=self.timeout)
+            except urllib.error.HTTPError as e:
+                if e.code == 416 and offset > 0:
+                    # 요청 범위가 파일 끝을 넘음 - 이미 전부 받았는지 확인
+                    total = self._total_from_content_range(e.headers.get('Content-Range'))
+                    if total == offset:
+                        break
+                    self._discard_part(part_path, meta_path)
+                    validators = {}
+                    hasher = hashlib.sha256()
+                    continue
+                raise DirectDownloadError(f"HTTP {e.code}: {url}") from e
+            except (urllib.error.URLError, OSError) as e:
+                if attempt < self.max_resumes:
+                    continue
+                raise DirectDownloadError(f"연결 실패: {e}") from e
+
+            with response:
+                content_type = response.headers.get('Content-Type', '')
+                received_validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+                if 'text/html' in content_type.lower():
+                    raise DirectDownloadError(f"파일 대신 HTML 응답 ({response.geturl()})")
+
+                # If-Range를 무시하는 서버 대비: 206이라도 검증자가 바뀌었으면 이어 붙이지 않음
+                changed = any(
+                    validators.get(name) and received_validators[name]
+                    and validators[name] != received_validators[name]
+                    for name in ('etag', 'last_modified')
+                )
+                if response.status == 206 and changed:
+                    self._discard_part(part_path, meta_path)
+                    validators = {}
+                    hasher = hashlib.sha256()
+                    continue
+
+                if response.status == 206:
+                    mode = 'ab'
+                    expected = self._total_from_content_range(response.headers.get('Content-Range'))
+                else:
+                    # 서버가 Range를 무시하거나 파일이 바뀌었으면(If-Range) 처음부터 다시 받음
+                    mode = 'wb'
+                    offset = 0
+                    resumed_from = 0
+                    hasher = hashlib.sha256()
+                    length = response.headers.get('Content-Length')
+                    expected = int(length) if length and length.isdigit() else None
+                    validators = received_validators
+                    self._save_meta(meta_path, url, validators)
+
+                received = offset
+                if progress:
+                    # 첫 청크 전에 시작 오프셋을 알려 처리량 기준점이 첫 청크를 포함하도록 함
+                    progress(received, expected)
+                try:
+                    with open(part_path, mode) as f:
+                        while True:
+                            chunk = response.read(self.chunk_size)
+                            if not chunk:
+                                break
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            received += len(chunk)
+                            if progress:
+                                progress(received, expected)
+                except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                    if attempt < self.max_resumes:
+                        # 기록된 만큼만 해시에 반영되어 있으므로 그대로 이어받기
+                        continue
+                    raise DirectDownloadError(f"전송 중단: {e}") from e
+
+            size = part_path.stat().st_size
+            if expected is None or size == expected:
+                break
+            if size > expected:
+                self._discard_part(part_path, meta_path)
+                raise DirectDownloadError(f"크기 초과: {size} > {expected}")
+            # 짧게 받았으면 다음 시도에서 Range로 이어받기
+        else:
+            raise DirectDownloadError(f"이어받기 재시도 초과: {url}")
+
+        os.replace(part_path, filepath)
+        if meta_path.exists():
+            meta_path.unlink()
+
+        return {
+            'filepath': str(filepath),
+            'size': filepath.stat().st_size,
+            'sha256': hasher.hexdigest(),
+            'resumed_from': resumed_from,
+            'content_type': content_type,
+            'etag': validators.get('etag'),
+            'last_modified': validators.get('last_modified'),
+        }
+
+    def head(self, url: str, referer: str = None) -> dict:
+        """HEAD 요청으로 재검증용 헤더 조회
+
+        Returns:
+            {'content_length', 'etag', 'last_modified', 'content_type'}
+
+        Raises:
+            DirectDownloadError: HTTP/연결 오류
+        """
+        request = self._build_request(url, 0, referer)
+        request.method = 'HEAD'
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                length = response.headers.get('Content-Length')
+                return {
+                    'content_length': int(length) if length and length.isdigit() else None,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'content_type': response.headers.get('Content-Type', ''),
+                }
+        except urllib.error.HTTPError as e:
+            raise DirectDownloadError(f"HTTP {e.code}: {url}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise DirectDownloadError(f"연결 실패: {e}") from e
+
+    async def head_async(self, url: str, referer: str = None) -> dict:
+        return await asyncio.to_thread(self.head, url, referer)
+
+    async def download_async(self, url: str, filepath: str, referer: str = None, progress=None) -> dict:
+        """download()를 스레드에서 실행 (이벤트 루프 차단 방지)"""
+        return await asyncio.to_thread(self.download, url, filepath, referer, progress)
@@ -0,0 +1,209 @@
+"""
+다운로드 진행 이벤트
+- queued / navigating / resolved / bytes / saved / failed 등 구조화된 이벤트 발행
+- 문서별 TTFB(첫 바이트까지 시간)와 처리량(bytes/s) 계산
+- 싱크(sink) 교체 가능: 콜백, JSONL 파일, 웹 스트림(SSE)
+
+이벤트는 직접 스트리밍 스레드에서도 발행되므로 싱크는 스레드 안전해야 합니다.
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+# 이벤트 종류
+QUEUED = 'queued'
+NAVIGATING = 'navigating'
+RESOLVED = 'resolved'
+BYTES = 'bytes'
+SAVED = 'saved'
+SKIPPED = 'skipped'
+RETRYING = 'retrying'
+FAILED = 'failed'
+
+
+class JsonlSink:
+    """이벤트를 JSONL 파일에 한 줄씩 추가"""
+
+    def __init__(self, path: str, include_bytes: bool = False):
+        """
+        Args:
+            path: JSONL 파일 경로
+            include_bytes: bytes(진행률) 이벤트도 기록할지 (기본: 제외 - 파일이 커짐)
+        """
+        self.path = Path(path)
+        self.include_bytes = include_bytes
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict):
+        if event['type'] == BYTES and not self.include_bytes:
+            return
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class StreamSink:
+    """웹 스트림(SSE)용 싱크 - 구독자마다 스레드 안전 큐로 이벤트 전달"""
+
+    def __init__(self, max_pending: int = 1000):
+        """
+        Args:
+            max_pending: 구독자별 최대 대기 이벤트 수 (넘치면 bytes 이벤트부터 버림)
+        """
+        self.max_pending = max_pending
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        subscriber = queue.Queue(maxsize=self.max_pending)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def __call__(self, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # 느린 구독자 - 진행률 이벤트는 버려도 최종 상태는 다음 이벤트로 전달됨
+                if event['type'] != BYTES:
+                    try:
+                        subscriber.get_nowait()
+                        subscriber.put_nowait(event)
+                    except (queue.Empty, queue.Full):
+                        pass
+
+
+class DownloadEvents:
+    """다운로드 이벤트 발행기
+
+    문서 URL별로 시작/요청/첫 바이트 시각을 추적하여 이벤트마다
+    elapsed(시작 후 경과), ttfb, throughput(bytes/s)을 붙입니다.
+
+    싱크는 event dict 하나를 받는 callable이면 무엇이든 가능합니다.
+    """
+
+    def __init__(self, sinks: list = None, bytes_interval: float = 0.5):
+        """
+        Args:
+            sinks: 초기 싱크 목록
+            bytes_interval: 같은 문서의 bytes 이벤트 최소 간격 (초)
+        """
+        self.sinks = list(sinks or [])
+        self.bytes_interval = bytes_interval
+        self._traces = {}
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    # ------------------------------------------------------------------
+    # 문서별 타이밍
+    # ------------------------------------------------------------------
+
+    def _trace(self, url: str) -> dict:
+        trace = self._traces.get(url)
+        if trace is None:
+            trace = self._traces[url] = {
+                'started': time.monotonic(),
+                'request_at': None,
+                'first_byte_at': None,
+                'bytes': 0,
+                'bytes_base': 0,
+                'total': None,
+                'last_bytes_event': 0,
+            }
+        return trace
+
+    def _timing(self, trace: dict, now: float) -> dict:
+        timing = {'elapsed': round(now - trace['started'], 3)}
+        if trace['request_at'] is not None and trace['first_byte_at'] is not None:
+            timing['ttfb'] = round(trace['first_byte_at'] - trace['request_at'], 3)
+            duration = now - trace['first_byte_at']
+            transferred = trace['bytes'] - trace['bytes_base']
+            if duration > 0 and transferred > 0:
+                timing['throughput'] = round(transferred / duration)
+        return timing
+
+    def emit(self, event_type: str, url: str, **fields) -> dict:
+        """이벤트 발행 (타이밍 정보 자동 추가)"""
+        now = time.monotonic()
+        with self._lock:
+            trace = self._trace(url)
+            if event_type == QUEUED:
+                trace['started'] = now
+            elif event_type == RESOLVED:
+                # 파일 요청 시작 - TTFB/처리량 기준점
+                trace['request_at'] = now
+                trace['first_byte_at'] = None
+                trace['bytes'] = trace['bytes_base'] = 0
+            timing = self._timing(trace, now)
+            if event_type == SAVED and 'throughput' not in timing:
+                # 브라우저 다운로드는 첫 바이트 시각을 모르므로 요청~저장 시간으로 처리량만 계산
+                size = fields.get('size')
+                duration = now - trace['request_at'] if trace['request_at'] is not None else 0
+                if size and duration > 0:
+                    timing['throughput'] = round(size / duration)
+            event = {
+                'type': event_type,
+                'url': url,
+                'ts': datetime.now().isoformat(timespec='milliseconds'),
+                **timing,
+                **{k: v for k, v in fields.items() if v is not None},
+            }
+            if event_type in (SAVED, SKIPPED, FAILED):
+                self._traces.pop(url, None)
+
+        for sink in list(self.sinks):
+            try:
+                sink(event)
+            except Exception as e:
+                print(f"  [WARN] 이벤트 싱크 오류: {e}")
+        return event
+
+    def progress(self, url: str, received: int, total: int = None):
+        """스트리밍 진행률 보고 (bytes 이벤트는 bytes_interval마다 한 번만 발행)
+
+        Args:
+            url: 문서 URL
+            received: 지금까지 파일에 기록된 바이트 (이어받기면 기존 부분 포함).
+                첫 호출은 응답 시작 시점의 오프셋(새 다운로드면 0)
+            total: 전체 크기 (모르면 None)
+        """
+        now = time.monotonic()
+        with self._lock:
+            trace = self._trace(url)
+            if trace['first_byte_at'] is None:
+                trace['first_byte_at'] = now
+                # 첫 호출은 청크 수신 전 오프셋 - 이어받기면 기존 .part 크기만 처리량 계산에서 제외
+                trace['bytes_base'] = received
+                if trace['request_at'] is None:
+                    trace['request_at'] = trace['started']
+            trace['bytes'] = received
+            trace['total'] = total
+            if now - trace['last_bytes_event'] < self.bytes_interval and received != total:
+                return
+            trace['last_bytes_event'] = now
+        self.emit(BYTES, url, bytes=received, total=total)
+
+    def progress_callback(self, url: str):
+        """StreamingDownloader에 넘길 진행률 콜백"""
+        return lambda received, total: self.progress(url, received, total)
@@ -0,0 +1,376 @@
+"""
+우선순위 다운로드 큐
+- 고정(pin) > 검색 순위 > (선택) 예상 크기 순으로 처리
+- 항목/배치 취소, 일시정지/재개
+- 실행 중인 배치에 웹 UI / CLI가 항목을 추가할 수 있음 (CLI는 inbox 파일 사용)
+
+큐 조작 메서드는 모두 동기 함수이며 에이전트 이벤트 루프 스레드에서 호출해야 합니다.
+다른 스레드(Flask 요청 등)에서는 loop.call_soon_threadsafe / run_coroutine_threadsafe로 넘기세요.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class QueueClosedError(RuntimeError):
+    """끝나 가는 배치에 항목을 추가하려 함 (배치가 끝난 뒤 새로 요청해야 함)"""
+
+
+class DownloadQueue:
+    """다운로드 작업자가 공유하는 우선순위 큐
+
+    항목: {'id', 'title', 'url', 'filename', 'batch', 'rank', 'size', 'pinned',
+           'status', 'filepath', 'elapsed', 'added_at'}
+    status: queued / running / done / failed / cancelled
+    """
+
+    INBOX_NAME = 'download_queue_inbox.jsonl'
+    STATE_NAME = 'download_queue_state.json'
+
+    def __init__(self, prefer_small: bool = False):
+        """
+        Args:
+            prefer_small: True면 같은 고정 여부 안에서 예상 크기가 작은 문서부터 처리
+        """
+        self.prefer_small = prefer_small
+        self.paused = False
+        # 진행 중인 배치 이름 (추가 시 배치를 주지 않으면 사용)
+        self.batch = None
+        # 대기/실행 항목이 모두 끝나 작업자가 종료하기 시작하면 True (이후 추가 거부)
+        self.closed = False
+
+        self.items = {}        # id -> 항목 (추가 순서 유지)
+        self._heap = []        # (우선순위 키, 버전, id)
+        self._versions = {}    # id -> 최신 힙 항목 버전 (재정렬 시 이전 항목 무효화)
+        self._queued = set()
+        self._tasks = {}       # 실행 중인 id -> 다운로드 태스크
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+        # 항목 추가/취소 시 호출할 콜백 (진행 이벤트 발행용)
+        self.on_add = None
+        self.on_cancel = None
+
+    # ------------------------------------------------------------------
+    # 추가 / 우선순위
+    # ------------------------------------------------------------------
+
+    def _key(self, item: dict) -> tuple:
+        size = item['size'] if item['size'] is not None else float('inf')
+        rank = item['rank'] if item['rank'] is not None else float('inf')
+        if self.prefer_small:
+            return (not item['pinned'], size, rank)
+        return (not item['pinned'], rank, size)
+
+    def _push(self, item: dict):
+        version = next(self._seq)
+        self._versions[item['id']] = version
+        heapq.heappush(self._heap, (self._key(item), version, item['id']))
+        self._changed.set()
+
+    def open(self, batch: str = None):
+        """새 배치 시작 - 항목 추가를 다시 허용"""
+        self.batch = batch
+        self.closed = False
+
+    def close(self):
+        """배치 종료 - 이후 추가는 QueueClosedError, 대기 중인 작업자는 종료"""
+        self.closed = True
+        self._changed.set()
+
+    def next_rank(self) -> int:
+        """기존 항목 다음 순위 (실행 중인 배치에 추가하는 문서가 앞서지 않도록)"""
+        ranks = [item['rank'] for item in self.items.values() if item['rank'] is not None]
+        return max(ranks) + 1 if ranks else 0
+
+    def add(
+        self,
+        doc: dict,
+        batch: str = None,
+        rank: int = None,
+        size: int = None,
+        pinned: bool = False,
+        filename: str = None
+    ) -> int:
+        """
+        문서를 큐에 추가
+
+        Args:
+            doc: {'title', 'url', ...} 검색 결과 항목
+            batch: 배치 이름 (배치 단위 취소/ZIP용, 기본: 진행 중인 배치)
+            rank: 검색 순위 (작을수록 먼저, 기본: doc['rank'] 또는 추가 순서)
+            size: 예상 크기 (바이트, 기본: doc['size'])
+            pinned: 사용자가 고정한 항목이면 가장 먼저 처리
+            filename: 저장 파일명
+
+        Returns:
+            항목 id (이미 대기/실행 중인 URL이면 기존 id)
+
+        Raises:
+            QueueClosedError: 배치가 끝나 가는 중 (작업자가 이미 종료하기 시작함)
+        """
+        if self.closed:
+            raise QueueClosedError("다운로드 배치가 끝나는 중입니다")
+
+        for existing in self.items.values():
+            if existing['url'] == doc['url'] and existing['status'] in ('queued', 'running'):
+                if pinned and not existing['pinned']:
+                    self.pin(existing['id'])
+                return existing['id']
+
+        item_id = next(self._ids)
+        item = {
+            'id': item_id,
+            'title': doc.get('title', ''),
+            'url': doc['url'],
+            'filename': filename,
+            'batch': batch or self.batch,
+            'rank': rank if rank is not None else doc.get('rank', item_id),
+            'size': size if size is not None else doc.get('size'),
+            'pinned': pinned,
+            'status': 'queued',
+            'filepath': None,
+            'elapsed': None,
+            'added_at': datetime.now().isoformat(),
+        }
+        self.items[item_id] = item
+        self._queued.add(item_id)
+        self._push(item)
+        if self.on_add:
+            self.on_add(item)
+        return item_id
+
+    def add_many(self, docs: list, batch: str = None, **kwargs) -> list:
+        """여러 문서를 목록 순서를 순위로 하여 추가
+
+        실행 중인 배치에 추가할 때 기존 항목보다 앞서지 않도록 순위는 현재 최대 순위 다음부터 매김
+        """
+        base = self.next_rank()
+        return [
+            self.add(doc, batch=batch, rank=base + doc.get('rank', index), **kwargs)
+            for index, doc in enumerate(docs)
+        ]
+
+    def pin(self, item_id: int, pinned: bool = True) -> bool:
+        """대기 중인 항목을 고정(맨 앞으로) 또는 고정 해제"""
+        item = self.items.get(item_id)
+        if not item or item['status'] != 'queued':
+            return False
+        item['pinned'] = pinned
+        self._push(item)
+        return True
+
+    def set_size(self, item_id: int, size: int):
+        """예상 크기 갱신 (대기 중이면 재정렬)"""
+        item = self.items.get(item_id)
+        if item and item['size'] != size:
+            item['size'] = size
+            if item['status'] == 'queued':
+                self._push(item)
+
+    # ------------------------------------------------------------------
+    # 취소 / 일시정지
+    # ------------------------------------------------------------------
+
+    def cancel(self, item_id: int) -> bool:
+        """항목 취소 (실행 중이면 다운로드 태스크도 취소)"""
+        item = self.items.get(item_id)
+        if not item or item['status'] not in ('queued', 'running'):
+            return False
+        if item['status'] == 'running':
+            task = self._tasks.get(item_id)
+            if task:
+                task.cancel()
+        item['status'] = 'cancelled'
+        self._queued.discard(item_id)
+        self._changed.set()
+        if self.on_cancel:
+            self.on_cancel(item)
+        return True
+
+    def cancel_batch(self, batch: str = None) -> int:
+        """배치 전체 취소 (batch=None이면 모든 대기/실행 항목)
+
+        Returns:
+            취소된 항목 수
+        """
+        targets = [
+            item_id for item_id, item in self.items.items()
+            if batch is None or item['batch'] == batch
+        ]
+        return sum(self.cancel(item_id) for item_id in targets)
+
+    def pause(self):
+        """새 항목 시작 중단 (실행 중인 다운로드는 끝까지 진행)"""
+        self.paused = True
+        self._changed.set()
+
+    def resume(self):
+        self.paused = False
+        self._changed.set()
+
+    # ------------------------------------------------------------------
+    # 작업자용
+    # ------------------------------------------------------------------
+
+    def _pop(self) -> dict:
+        while self._heap:
+            _, version, item_id = heapq.heappop(self._heap)
+            if self._versions.get(item_id) != version or item_id not in self._queued:
+                continue
+            self._queued.discard(item_id)
+            item = self.items[item_id]
+            item['status'] = 'running'
+            return item
+        return None
+
+    async def get(self) -> dict:
+        """다음 항목 (일시정지 중이면 재개될 때까지 대기)
+
+        대기 항목이 없어도 실행 중인 항목이 있으면 그동안 추가되는 항목을 받기 위해 기다리고,
+        대기/실행 항목이 모두 없으면 큐를 닫고 None을 반환합니다.
+        """
+        while True:
+            if self.closed:
+                return None
+            if not self.paused:
+                item = self._pop()
+                if item:
+                    return item
+            if not self._queued and not self.running_count():
+                self.close()
+                return None
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def run_item(self, item: dict, coro) -> bool:
+        """항목의 다운로드 코루틴 실행 (cancel()로 중단 가능)
+
+        Returns:
+            취소되지 않고 끝났으면 True
+        """
+        task = asyncio.ensure_future(coro)
+        self._tasks[item['id']] = task
+        started = time.monotonic()
+        try:
+            item['filepath'] = await task
+            item['status'] = 'done' if item['filepath'] else 'failed'
+            return True
+        except asyncio.CancelledError:
+            # 이 항목만 취소된 경우 작업자는 계속 진행 (작업자 자체 취소는 전파)
+            if item['status'] != 'cancelled':
+                raise
+            print(f"  [CANCEL] 다운로드 취소됨: {item['title'][:50]}")
+            return False
+        finally:
+            item['elapsed'] = round(time.monotonic() - started, 2)
+            self._tasks.pop(item['id'], None)
+            # 대기 중인 작업자가 종료 여부를 다시 판단하도록
+            self._changed.set()
+
+    def pending_count(self) -> int:
+        return len(self._queued)
+
+    def running_count(self) -> int:
+        return sum(1 for item in self.items.values() if item['status'] == 'running')
+
+    def snapshot(self) -> list:
+        """UI/CLI 표시용 항목 목록 (대기 항목은 처리 순서대로)"""
+        queued = sorted(
+            (self.items[i] for i in self._queued),
+            key=lambda item: (self._key(item), self._versions[item['id']])
+        )
+        others = [item for item in self.items.values() if item['status'] != 'queued']
+        return [dict(item) for item in others + queued]
+
+    # ------------------------------------------------------------------
+    # 프로세스 간 제어 (CLI)
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def send_command(cls, folder: str, op: str, **fields):
+        """실행 중인 배치에 명령 전달 (inbox 파일에 한 줄 추가)
+
+        Args:
+            folder: 다운로드 폴더
+            op: add / pin / cancel / cancel_batch / pause / resume
+            **fields: add는 doc(title/url)와 pinned, pin/cancel은 id 또는 url, cancel_batch는 batch
+        """
+        inbox = Path(folder) / cls.INBOX_NAME
+        with open(inbox, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'op': op, **fields}, ensure_ascii=False) + '\n')
+
+    def _resolve_id(self, command: dict) -> int:
+        if command.get('id') is not None:
+            return int(command['id'])
+        for item in self.items.values():
+            if item['url'] == command.get('url') and item['status'] in ('queued', 'running'):
+                return item['id']
+        return None
+
+    def apply_command(self, command: dict):
+        """inbox 명령 하나 적용"""
+        op = command.get('op')
+        if op == 'add':
+            item_id = self.add(command['doc'], batch=command.get('batch'),
+                               pinned=command.get('pinned', False))
+            print(f"  [QUEUE] 추가됨 #{item_id}: {command['doc'].get('title') or command['doc']['url']}")
+        elif op == 'pin':
+            self.pin(self._resolve_id(command))
+        elif op == 'cancel':
+            self.cancel(self._resolve_id(command))
+        elif op == 'cancel_batch':
+            print(f"  [QUEUE] {self.cancel_batch(command.get('batch'))}개 항목 취소")
+        elif op == 'pause':
+            self.pause()
+            print("  [QUEUE] 일시정지")
+        elif op == 'resume':
+            self.resume()
+            print("  [QUEUE] 재개")
+        else:
+            print(f"  [WARN] 알 수 없는 큐 명령: {command}")
+
+    def poll_inbox(self, folder: str):
+        """inbox 파일의 명령을 모두 적용하고 파일을 비움 (닫힌 큐면 다음 배치가 읽도록 남겨 둠)"""
+        inbox = Path(folder) / self.INBOX_NAME
+        if self.closed or not inbox.exists():
+            return
+        processing = inbox.with_suffix('.processing')
+        try:
+            # 이름을 바꾼 뒤 읽어서, 읽는 동안 추가되는 명령은 새 inbox 파일로 가게 함
+            os.replace(inbox, processing)
+            with open(processing, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            processing.unlink()
+        except OSError as e:
+            print(f"  [WARN] 큐 inbox 읽기 실패: {e}")
+            return
+
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                self.apply_command(json.loads(line))
+            except Exception as e:
+                print(f"  [WARN] 큐 명령 처리 실패 ({line[:80]}): {e}")
+
+    def save_state(self, folder: str):
+        """큐 상태를 파일로 저장 (CLI queue status용)"""
+        path = Path(folder) / self.STATE_NAME
+        tmp_path = path.with_suffix('.json.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'updated_at': datetime.now().isoformat(),
+                    'paused': self.paused,
+                    'items': self.snapshot(),
+                }, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  [WARN] 큐 상태 저장 실패: {e}")
@@ -0,0 +1,199 @@
+"""
+다운로드 실패 분류 / 재시도 / 서킷 브레이커
+- 실패를 일시적(transient), 인증 만료(auth), 영구(permanent)로 분류
+- 일시적 실패만 지수 백오프 + 지터로 재시도
+- 호스트별 최근 실패율이 높아지면 서킷을 열어 일정 시간 요청 중단
+"""
+
+import random
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+
+# 실패 분류
+TRANSIENT = 'transient'  # 타임아웃, 연결 끊김, 5xx/429 - 재시도
+AUTH = 'auth'            # 로그인 페이지로 리다이렉트 - 재로그인 후 재시도
+PERMANENT = 'permanent'  # 404/410 등 - 재시도하지 않음
+
+# 일시적 실패로 보는 오류 메시지 조각 (Playwright/Chromium 네트워크 오류)
+TRANSIENT_MARKERS = [
+    'timeout',
+    'timed out',
+    'net::err_connection',
+    'net::err_timed_out',
+    'net::err_network_changed',
+    'net::err_internet_disconnected',
+    'net::err_empty_response',
+    'net::err_http2',
+    'connection reset',
+    'temporarily unavailable',
+]
+
+# 영구 실패로 보는 오류 메시지 조각
+PERMANENT_MARKERS = [
+    'net::err_name_not_resolved',
+    'net::err_invalid_url',
+    'net::err_unknown_url_scheme',
+    'net::err_aborted',
+]
+
+
+class DownloadFailure(Exception):
+    """분류된 다운로드 실패"""
+
+    def __init__(self, message: str, kind: str, status: int = None):
+        """
+        Args:
+            message: 오류 메시지
+            kind: TRANSIENT / AUTH / PERMANENT
+            status: HTTP 상태 코드 (있으면)
+        """
+        super().__init__(message)
+        self.kind = kind
+        self.status = status
+
+
+def classify_status(status: int) -> str:
+    """HTTP 상태 코드 분류 (성공이면 None)"""
+    if status is None or status < 400:
+        return None
+    if status == 401:
+        return AUTH
+    if status in (408, 425, 429) or status >= 500:
+        return TRANSIENT
+    return PERMANENT
+
+
+def classify_failure(error: Exception) -> str:
+    """예외를 TRANSIENT / AUTH / PERMANENT 중 하나로 분류
+
+    분류할 수 없는 오류는 일시적 실패로 보고 재시도 한도 안에서 다시 시도합니다.
+    """
+    if isinstance(error, DownloadFailure):
+        return error.kind
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+
+    message = str(error).lower()
+    if any(marker in message for marker in PERMANENT_MARKERS):
+        return PERMANENT
+    if any(marker in message for marker in TRANSIENT_MARKERS):
+        return TRANSIENT
+    return TRANSIENT
+
+
+class RetryPolicy:
+    """지수 백오프 + 지터 재시도 정책"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.5
+    ):
+        """
+        Args:
+            max_attempts: 최대 시도 횟수 (첫 시도 포함)
+            base_delay: 첫 재시도 전 대기 시간 (초)
+            max_delay: 대기 시간 상한 (초)
+            jitter: 대기 시간에 곱할 무작위 비율 범위 (0.5면 ±50%)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 실패 후 대기 시간 (1부터 시작)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def should_retry(self, kind: str, attempt: int) -> bool:
+        return kind != PERMANENT and attempt < self.max_attempts
+
+
+class CircuitBreaker:
+    """호스트별 서킷 브레이커
+
+    closed: 정상 / open: cooldown 동안 즉시 실패 / half_open: 시험 요청 하나만 허용
+    최근 window개 결과 중 실패가 min_failures개 이상이고 실패율이 failure_ratio 이상이면 열림
+    """
+
+    def __init__(
+        self,
+        window: int = 10,
+        min_failures: int = 4,
+        failure_ratio: float = 0.5,
+        cooldown: float = 60.0
+    ):
+        """
+        Args:
+            window: 실패율을 계산할 최근 결과 수
+            min_failures: 서킷을 열기 위한 최소 실패 수
+            failure_ratio: 서킷을 여는 실패율
+            cooldown: 열린 뒤 시험 요청을 허용하기까지 대기 시간 (초)
+        """
+        self.window = window
+        self.min_failures = min_failures
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self._outcomes = {}   # host -> deque[bool]
+        self._opened_at = {}  # host -> monotonic
+        self._probing = set()
+        self.trips = 0
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc
+
+    def state(self, url: str) -> str:
+        host = self._host(url)
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return 'closed'
+        if time.monotonic() - opened_at < self.cooldown:
+            return 'open'
+        return 'half_open'
+
+    def allow(self, url: str) -> bool:
+        """url의 호스트로 요청해도 되는지 (half_open이면 시험 요청 하나만 허용)"""
+        state = self.state(url)
+        if state == 'closed':
+            return True
+        if state == 'open':
+            return False
+        host = self._host(url)
+        if host in self._probing:
+            return False
+        self._probing.add(host)
+        return True
+
+    def release(self, url: str):
+        """결과를 기록하지 않고 끝난 시험 요청(인증 만료, 취소 등) 해제 - 다음 요청이 다시 시험할 수 있음"""
+        self._probing.discard(self._host(url))
+
+    def record(self, url: str, success: bool):
+        """요청 결과 기록"""
+        host = self._host(url)
+        self._probing.discard(host)
+
+        if host in self._opened_at:
+            if success:
+                # 시험 요청 성공 - 서킷 닫고 기록 초기화
+                del self._opened_at[host]
+                self._outcomes.pop(host, None)
+                print(f"  [CIRCUIT] {host} 복구됨")
+            else:
+                self._opened_at[host] = time.monotonic()
+            return
+
+        outcomes = self._outcomes.setdefault(host, deque(maxlen=self.window))
+        outcomes.append(success)
+        failures = outcomes.count(False)
+        if failures >= self.min_failures and failures / len(outcomes) >= self.failure_ratio:
+            self._opened_at[host] = time.monotonic()
+            self.trips += 1
+            print(f"  [CIRCUIT] {host} 실패율 {failures}/{len(outcomes)} - "
+                  f"{self.cooldown:.0f}초 동안 요청 중단")
@@ -0,0 +1,311 @@
+"""
+콘텐츠 주소 기반 다운로드 저장소
+- 파일을 SHA-256으로 식별하여 같은 내용은 한 번만 저장
+- 사람이 읽을 수 있는 파일명은 blob에 대한 하드링크 (불가능하면 인덱스 항목)
+- 같은 PDF가 다른 제목으로 다시 받아지면 기존 파일을 재사용
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+class ContentStore:
+    """다운로드 폴더를 뒷받침하는 SHA-256 콘텐츠 주소 저장소
+
+    구조:
+        <download_folder>/<사람이 읽는 파일명>      - blob 하드링크 (대표 이름)
+        <download_folder>/.store/blobs/ab/<sha256>.pdf - 실제 내용
+        <download_folder>/.store/index.json           - 해시 ↔ 파일명 인덱스
+    """
+
+    STORE_DIR = '.store'
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: 다운로드 폴더
+        """
+        self.root = Path(root)
+        self.store_dir = self.root / self.STORE_DIR
+        self.blob_dir = self.store_dir / 'blobs'
+        self.index_path = self.store_dir / 'index.json'
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+        # sha256 -> {'size', 'ext', 'path'(대표 파일명), 'aliases': [...], 'added_at'}
+        self.blobs = {}
+        # 파일명 -> sha256
+        self.names = {}
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self.blobs = index.get('blobs', {})
+            self.names = index.get('names', {})
+        except Exception as e:
+            print(f"[WARN] 저장소 인덱스 로드 실패: {e}")
+
+    def _save_index(self):
+        tmp_path = self.index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'blobs': self.blobs, 'names': self.names}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    @classmethod
+    def hash_file(cls, path: str) -> str:
+        """파일 SHA-256 계산"""
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def blob_path(self, sha256: str, ext: str = '') -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}{ext}"
+
+    def _link_or_keep(self, blob: Path, name_path: Path):
+        """blob을 사람이 읽는 파일명으로 하드링크 (실패 시 복사)"""
+        try:
+            os.link(blob, name_path)
+        except OSError:
+            shutil.copy2(blob, name_path)
+
+    def _make_blob(self, filepath: Path, sha256: str) -> Path:
+        """파일을 blob으로 하드링크 (지원하지 않는 파일시스템이면 None - 인덱스 항목만 유지)"""
+        blob = self.blob_path(sha256, filepath.suffix)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        if not blob.exists():
+            try:
+                os.link(filepath, blob)
+            except OSError:
+                return None
+        return blob
+
+    def add(self, filepath: str, sha256: str = None) -> str:
+        """
+        새로 받은 파일을 저장소에 등록
+
+        같은 내용이 이미 있으면 새 파일을 지우고 기존 대표 파일 경로를 반환합니다.
+        (대표 파일과 blob이 모두 지워졌으면 새 파일을 지우지 않고 대표 파일로 삼음)
+
+        Args:
+            filepath: 방금 저장된 파일 경로 (다운로드 폴더 안)
+            sha256: 스트리밍 중 계산된 해시 (없으면 여기서 계산)
+
+        Returns:
+            사용할 파일 경로 (중복이면 기존 파일)
+        """
+        filepath = Path(filepath)
+        sha256 = sha256 or self.hash_file(filepath)
+        name = filepath.name
+
+        with self._lock:
+            entry = self.blobs.get(sha256)
+
+            if entry:
+                existing = self.root / entry['path']
+                blob = self.blob_path(sha256, entry.get('ext', ''))
+                if existing.resolve() != filepath.resolve():
+                    # 대표 파일이 지워졌으면 blob에서 복원
+                    if not existing.exists() and blob.exists():
+                        self._link_or_keep(blob, existing)
+                    if existing.exists():
+                        filepath.unlink()
+                        if name != entry['path'] and name not in entry['aliases']:
+                            entry['aliases'].append(name)
+                    else:
+                        # 대표 파일도 blob도 없음 - 새 파일이 유일한 사본이므로 대표로 삼음
+                        print(f"  [WARN] 저장소 대표 파일 없음, 새 파일로 교체: {entry['path']} -> {name}")
+                        if entry['path'] not in entry['aliases']:
+                            entry['aliases'].append(entry['path'])
+                        if name in entry['aliases']:
+                            entry['aliases'].remove(name)
+                        entry['path'] = name
+                        blob = self._make_blob(filepath, sha256)
+                        entry['blob'] = str(blob.relative_to(self.root)) if blob else None
+                        existing = filepath
+                self.names[name] = sha256
+                self._save_index()
+                print(f"  [DEDUP] 동일 내용 파일 재사용: {entry['path']}")
+                return str(existing)
+
+            blob = self._make_blob(filepath, sha256)
+
+            self.blobs[sha256] = {
+                'size': filepath.stat().st_size,
+                'ext': filepath.suffix,
+                'path': name,
+                'aliases': [],
+                'blob': str(blob.relative_to(self.root)) if blob else None,
+                'added_at': datetime.now().isoformat(),
+            }
+            self.names[name] = sha256
+            self._save_index()
+
+        return str(filepath)
+
+    def lookup_name(self, name: str) -> str:
+        """파일명(별칭 포함)으로 실제 파일 경로 조회"""
+        sha256 = self.names.get(name)
+        if not sha256 or sha256 not in self.blobs:
+            return None
+        return str(self.root / self.blobs[sha256]['path'])
+
+    def stats(self) -> dict:
+        """고유 blob 수, 별칭 수, 실제 사용 바이트"""
+        return {
+            'unique_files': len(self.blobs),
+            'names': len(self.names),
+            'aliases': sum(len(e['aliases']) for e in self.blobs.values()),
+            'bytes': sum(e['size'] for e in self.blobs.values()),
+        }
+
+
+class DownloadManifest:
+    """URL별 다운로드 기록 - 재실행 시 이미 받은 문서는 건너뛰기
+
+    항목: url -> {'filepath', 'size', 'sha256', 'downloaded_at', 'method',
+                  'file_url', 'etag', 'last_modified'}
+    """
+
+    MODES = ('skip', 'revalidate', 'force')
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 매니페스트 JSON 경로
+        """
+        self.path = Path(path)
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('documents', {})
+        except Exception as e:
+            print(f"[WARN] 다운로드 매니페스트 로드 실패: {e}")
+
+    def _save(self):
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': datetime.now().isoformat(),
+                'total_documents': len(self.entries),
+                'documents': self.entries
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url: str) -> dict:
+        return self.entries.get(url)
+
+    def record(self, url: str, filepath: str, sha256: str, method: str, **extra):
+        """다운로드 완료 기록
+
+        Args:
+            url: 문서(랜딩 페이지) URL
+            filepath: 저장된 파일 경로
+            sha256: 파일 해시
+            method: 파일 확보 방식 (direct / click / pdf_link / page_capture)
+            **extra: file_url, etag, last_modified 등 재검증용 정보
+        """
+        filepath = Path(filepath)
+        with self._lock:
+            self.entries[url] = {
+                'filepath': filepath.name,
+                'size': filepath.stat().st_size,
+                'sha256': sha256,
+                'downloaded_at': datetime.now().isoformat(),
+                'method': method,
+                **{k: v for k, v in extra.items() if v},
+            }
+            self._save()
+
+    def forget(self, url: str):
+        with self._lock:
+            if self.entries.pop(url, None) is not None:
+                self._save()
+
+    def local_path(self, url: str, root: str) -> Path:
+        """기록된 파일이 크기까지 일치하게 남아 있으면 경로 반환"""
+        entry = self.get(url)
+        if not entry:
+            return None
+        path = Path(root) / entry['filepath']
+        if not path.exists() or path.stat().st_size != entry['size']:
+            return None
+        return path
+
+
+class ResolutionCache:
+    """문서 랜딩 페이지 URL -> 실제 파일 URL 해석 결과 캐시
+
+    file_url이 None인 항목은 "파일 링크 없음, 페이지 캡처로 폴백" 표시입니다.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, negative_ttl: float = 24 * 3600):
+        """
+        Args:
+            path: 캐시 JSON 경로
+            ttl: 파일 URL 항목 유효 시간 (초)
+            negative_ttl: "파일 없음" 항목 유효 시간 (초)
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            print(f"[WARN] 링크 해석 캐시 로드 실패: {e}")
+
+    def _save(self):
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url: str) -> dict:
+        """유효한 항목 반환 ({'file_url', 'method', 'resolved_at'}), 없거나 만료되면 None"""
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        ttl = self.ttl if entry.get('file_url') else self.negative_ttl
+        if datetime.now().timestamp() - entry.get('resolved_at', 0) > ttl:
+            return None
+        return entry
+
+    def set(self, url: str, file_url: str, method: str):
+        """해석 결과 저장 (file_url=None이면 페이지 캡처 폴백 표시)"""
+        with self._lock:
+            self.entries[url] = {
+                'file_url': file_url,
+                'method': method,
+                'resolved_at': datetime.now().timestamp(),
+            }
+            self._save()
+
+    def forget(self, url: str):
+        with self._lock:
+            if self.entries.pop(url, None) is not None:
+                self._save()
@@ -0,0 +1,31 @@
+"""
+호스트별 요청 간격 제한
+- 크롤러/다운로더가 같은 호스트에 동시에 몰려 요청하지 않도록 최소 간격 유지
+"""
+
+import asyncio
+import time
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """같은 호스트에 대한 요청 시작 시각 사이에 최소 간격(초)을 보장"""
+
+    def __init__(self, min_interval: float = 1.0):
+        """
+        Args:
+            min_interval: 같은 호스트에 대한 요청 간 최소 간격 (초)
+        """
+        self.min_interval = min_interval
+        self._locks = {}
+        self._last_request = {}
+
+    async def wait(self, url: str):
+        """url의 호스트에 요청해도 될 때까지 대기"""
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self._last_request.get(host, 0)
+            if elapsed < self.min_interval:
+                await asyncio.sleep(self.min_interval - elapsed)
+            self._last_request[host] = time.monotonic()
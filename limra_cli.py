@@ -5,8 +5,15 @@ LIMRA 문서 검색 CLI 인터페이스
 
 import asyncio
 import argparse
+import json
 import sys
+from pathlib import Path
+from download_events import JsonlSink
+from download_queue import DownloadQueue
+from download_store import DownloadManifest
 from limra_search_agent import LimraSearchAgent
+from zip_export import select_batch, select_manifest, write_zip
+from research_watch import ResearchWatcher
 
 
 async def run_search(args):
@@ -38,8 +45,13 @@ async def run_search(args):
 
             # 다운로드
             if args.download and results:
+                agent.capture_mode = args.capture
+                if args.events:
+                    agent.events.add_sink(JsonlSink(args.events, include_bytes=True))
                 print(f"\n📥 {len(results)}개 파일 다운로드 시작...")
-                downloaded = await agent.download_all_results()
+                downloaded = await agent.download_all_results(
+                    concurrency=args.jobs, mode=args.mode, prefer_small=args.small_first
+                )
                 print(f"\n✅ {len(downloaded)}개 파일 다운로드 완료")
 
             # 리포트 저장
@@ -81,6 +93,137 @@ async def run_browse(args):
         await agent.close()
 
 
+async def run_crawl(args):
+    """Research 라이브러리 전체 크롤링"""
+    agent = LimraSearchAgent(
+        email=args.email,
+        password=args.password,
+        download_folder=args.output,
+        headless=args.headless
+    )
+
+    try:
+        await agent.initialize()
+
+        if await agent.login():
+            docs = await agent.crawl_research_library(
+                max_pages=args.max_pages,
+                max_seconds=args.max_time,
+                max_depth=args.depth,
+                concurrency=args.concurrency,
+                resume=not args.fresh
+            )
+
+            print(f"\n📚 발견된 문서: {len(docs)}개")
+            for i, doc in enumerate(docs[:50], 1):
+                print(f"{i}. [{doc['type']}] {doc['title'][:60]}")
+
+            agent.search_results = docs
+            await agent.save_results_report()
+        else:
+            print("❌ 로그인 실패")
+            sys.exit(1)
+
+    finally:
+        await agent.close()
+
+
+def _load_watch_queries(args) -> list:
+    """--query 및 --queries-file에서 저장된 검색어 목록 구성"""
+    queries = list(args.query or [])
+    if args.queries_file:
+        with open(args.queries_file, 'r', encoding='utf-8') as f:
+            queries.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    return queries
+
+
+async def run_watch(args):
+    """연구 목록/저장된 검색어 감시 - 신규 문서만 출력/다운로드"""
+    agent = LimraSearchAgent(
+        email=args.email,
+        password=args.password,
+        download_folder=args.output,
+        headless=args.headless
+    )
+
+    try:
+        await agent.initialize()
+
+        if await agent.login():
+            watcher = ResearchWatcher(
+                agent,
+                queries=_load_watch_queries(args),
+                max_results=args.max,
+                auto_download=args.download
+            )
+            await watcher.run(
+                interval=args.interval,
+                max_cycles=args.cycles,
+                emit_initial=args.emit_initial
+            )
+        else:
+            print("❌ 로그인 실패")
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        print("\n⏹ 감시 중단")
+
+    finally:
+        await agent.close()
+
+
+def run_export(args):
+    """다운로드 묶음을 ZIP으로 내보내기 (스트리밍 기록, 임시 아카이브 없음)"""
+    if args.batch:
+        files = select_batch(args.output, args.batch)
+    else:
+        manifest = DownloadManifest(Path(args.output) / "download_manifest.json")
+        files = select_manifest(manifest, args.output, urls=args.url, since=args.since)
+
+    if not files:
+        print("❌ 내보낼 파일이 없습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.zip_path == '-':
+        written = write_zip(files, sys.stdout.buffer)
+    else:
+        written = write_zip(files, args.zip_path)
+    print(f"✅ {len(files)}개 파일 → {args.zip_path} ({written:,}바이트)", file=sys.stderr)
+
+
+def run_queue(args):
+    """실행 중인 다운로드 배치 제어 (다운로드 폴더의 inbox 파일로 명령 전달)"""
+    if args.action == 'status':
+        state_path = Path(args.output) / DownloadQueue.STATE_NAME
+        if not state_path.exists():
+            print("실행 중이거나 기록된 다운로드 큐가 없습니다.")
+            return
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        print(f"큐 상태 ({state['updated_at']}){' - 일시정지' if state['paused'] else ''}")
+        for item in state['items']:
+            pin = '📌' if item['pinned'] else '  '
+            print(f"{pin} #{item['id']:<4} {item['status']:<9} [{item['batch'] or '-'}] "
+                  f"{item['title'][:50] or item['url']}")
+        return
+
+    if args.action in ('add', 'pin', 'cancel') and not args.target:
+        print(f"❌ {args.action}: 대상(URL 또는 항목 번호)을 지정하세요.")
+        sys.exit(1)
+
+    if args.action == 'add':
+        doc = {'title': args.title or '', 'url': args.target}
+        DownloadQueue.send_command(args.output, 'add', doc=doc, pinned=args.pin)
+    elif args.action in ('pin', 'cancel'):
+        key = 'id' if args.target.isdigit() else 'url'
+        DownloadQueue.send_command(args.output, args.action, **{key: args.target})
+    elif args.action == 'cancel-batch':
+        DownloadQueue.send_command(args.output, 'cancel_batch', batch=args.target)
+    else:
+        DownloadQueue.send_command(args.output, args.action)
+    print(f"✅ 명령 전달됨: {args.action} (실행 중인 배치가 1초 안에 반영)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='LIMRA 문서 검색 및 다운로드 에이전트',
@@ -95,6 +238,20 @@ def main():
 
   # 연구 섹션 탐색
   python limra_cli.py browse -e your@email.com -p password
+
+  # 연구 라이브러리 전체 크롤링 (중단 후 재실행 시 이어서 진행)
+  python limra_cli.py crawl --max-pages 300 --max-time 1800
+
+  # 1시간마다 신규 문서 감시 후 다운로드
+  python limra_cli.py watch -q "retention" -q "annuity sales" --interval 3600 --download
+
+  # 실행 중인 다운로드 배치에 문서 추가(맨 앞) / 취소 / 상태 확인
+  python limra_cli.py queue add https://www.limra.com/... --pin
+  python limra_cli.py queue cancel 12
+  python limra_cli.py queue status
+
+  # 다운로드 묶음 ZIP 내보내기 (배치 / 특정 시각 이후 / 전체)
+  python limra_cli.py export reports.zip --since 2025-01-01
         """
     )
 
@@ -117,16 +274,81 @@ def main():
                                help='최대 결과 수 (기본: 20)')
     search_parser.add_argument('-d', '--download', action='store_true',
                                help='검색 결과 자동 다운로드')
+    search_parser.add_argument('-j', '--jobs', type=int, default=3,
+                               help='동시 다운로드 수 (기본: 3)')
+    search_parser.add_argument('--mode', choices=['skip', 'revalidate', 'force'], default='skip',
+                               help='이미 받은 문서 처리: skip(건너뜀), revalidate(재검증), force(다시 받기)')
+    search_parser.add_argument('--capture', choices=['text', 'mhtml', 'pdf'], default='pdf',
+                               help='파일 링크가 없는 문서 저장 방식: text(.md, 가장 빠름), mhtml, pdf (기본: pdf)')
+    search_parser.add_argument('--events', metavar='PATH',
+                               help='다운로드 진행 이벤트를 JSONL 파일로 기록 (queued/navigating/resolved/bytes/saved/failed)')
+    search_parser.add_argument('--small-first', action='store_true',
+                               help='예상 크기가 작은 문서부터 다운로드 (이전 기록 기준)')
 
     # browse 명령어
     browse_parser = subparsers.add_parser('browse', help='연구 섹션 탐색')
 
+    # crawl 명령어
+    crawl_parser = subparsers.add_parser('crawl', help='연구 라이브러리 전체 크롤링')
+    crawl_parser.add_argument('--max-pages', type=int, default=200,
+                              help='이번 실행에서 방문할 최대 페이지 수 (기본: 200)')
+    crawl_parser.add_argument('--max-time', type=float, default=None,
+                              help='최대 크롤링 시간(초)')
+    crawl_parser.add_argument('--depth', type=int, default=3,
+                              help='최대 링크 깊이 (기본: 3)')
+    crawl_parser.add_argument('--concurrency', type=int, default=2,
+                              help='호스트당 동시 페이지 수 (기본: 2)')
+    crawl_parser.add_argument('--fresh', action='store_true',
+                              help='저장된 체크포인트를 무시하고 처음부터 크롤링')
+
+    # watch 명령어
+    watch_parser = subparsers.add_parser('watch', help='신규 문서 감시')
+    watch_parser.add_argument('-q', '--query', action='append',
+                              help='매 주기 확인할 검색어 (여러 번 지정 가능)')
+    watch_parser.add_argument('--queries-file',
+                              help='저장된 검색어 파일 (한 줄에 하나)')
+    watch_parser.add_argument('-i', '--interval', type=float, default=3600,
+                              help='확인 주기(초) (기본: 3600)')
+    watch_parser.add_argument('--cycles', type=int, default=None,
+                              help='실행할 주기 수 (기본: 무한)')
+    watch_parser.add_argument('-m', '--max', type=int, default=20,
+                              help='검색어당 최대 결과 수 (기본: 20)')
+    watch_parser.add_argument('-d', '--download', action='store_true',
+                              help='신규 문서 자동 다운로드')
+    watch_parser.add_argument('--emit-initial', action='store_true',
+                              help='첫 실행에서도 모든 문서를 신규로 처리')
+
+    # queue 명령어
+    queue_parser = subparsers.add_parser('queue', help='실행 중인 다운로드 큐 제어')
+    queue_parser.add_argument('action',
+                              choices=['status', 'add', 'pin', 'cancel', 'cancel-batch', 'pause', 'resume'],
+                              help='큐 명령')
+    queue_parser.add_argument('target', nargs='?',
+                              help='add: 문서 URL / pin, cancel: 항목 번호 또는 URL / cancel-batch: 배치 이름 (없으면 전체)')
+    queue_parser.add_argument('--title', help='add: 문서 제목 (저장 파일명)')
+    queue_parser.add_argument('--pin', action='store_true', help='add: 맨 앞으로 고정')
+
+    # export 명령어
+    export_parser = subparsers.add_parser('export', help='다운로드 파일 ZIP 내보내기')
+    export_parser.add_argument('zip_path', help='저장할 ZIP 경로 (- 이면 표준 출력)')
+    export_parser.add_argument('--batch', help='다운로드 큐 배치 이름 (queue status로 확인)')
+    export_parser.add_argument('--since', help='이 시각(ISO 형식) 이후 다운로드된 파일만')
+    export_parser.add_argument('--url', action='append', help='포함할 문서 URL (여러 번 지정 가능)')
+
     args = parser.parse_args()
 
     if args.command == 'search':
         asyncio.run(run_search(args))
     elif args.command == 'browse':
         asyncio.run(run_browse(args))
+    elif args.command == 'crawl':
+        asyncio.run(run_crawl(args))
+    elif args.command == 'watch':
+        asyncio.run(run_watch(args))
+    elif args.command == 'queue':
+        run_queue(args)
+    elif args.command == 'export':
+        run_export(args)
     else:
         parser.print_help()
 
@@ -8,12 +8,26 @@ import asyncio
 import os
 import re
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urljoin, urlparse, quote_plus
 
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
+from direct_download import StreamingDownloader, DirectDownloadError
+from download_events import (
+    DownloadEvents, QUEUED, NAVIGATING, RESOLVED, SAVED, SKIPPED, RETRYING, FAILED
+)
+from download_queue import DownloadQueue
+from download_retry import (
+    AUTH, PERMANENT, TRANSIENT,
+    CircuitBreaker, DownloadFailure, RetryPolicy, classify_failure, classify_status
+)
+from download_store import ContentStore, DownloadManifest, ResolutionCache
+from host_limiter import HostRateLimiter
+from research_crawler import ResearchCrawler
+
 
 class LimraSearchAgent:
     """LIMRA 웹사이트 검색 및 다운로드 에이전트"""
@@ -21,6 +35,7 @@ class LimraSearchAgent:
     BASE_URL = "https://www.limra.com"
     LOGIN_URL = "https://www.limra.com/login/"
     SEARCH_URL = "https://www.limra.com/en/search/"
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     RESEARCH_URLS = [
         "https://www.limra.com/en/research/",
         "https://www.limra.com/en/research/insurance/",
@@ -29,17 +44,41 @@ class LimraSearchAgent:
         "https://www.limra.com/en/research/workplace-benefits/",
     ]
 
+    # 문서가 아닌 링크 패턴 (언어 설정, 로그인, 검색, 앵커 등)
+    SKIP_PATTERNS = [
+        '?epslanguage=',
+        '/login',
+        '/search',
+        '#',
+        'javascript:',
+    ]
+
+    # 연구 목록 카드에서 추가로 제외할 패턴 (섹션 목록 자체의 필터/정렬 링크)
+    LISTING_SKIP_PATTERNS = SKIP_PATTERNS + [
+        '/en/research/?',
+        '/en/research/insurance/?',
+        '/en/research/retirement/?',
+        '/en/research/annuities/?',
+        '/en/research/workplace-benefits/?',
+    ]
+
     def __init__(
         self,
         email: str,
         password: str,
         download_folder: str = "./downloads",
-        headless: bool = False  # 디버깅을 위해 기본값 False
+        headless: bool = False,  # 디버깅을 위해 기본값 False
+        suppress_overlays: bool = True,
+        capture_mode: str = 'pdf'
     ):
         self.email = email
         self.password = password
         self.download_folder = Path(download_folder)
         self.headless = headless
+        # True: 컨텍스트 init script로 쿠키 배너/모달을 자동 억제 (False면 페이지마다 직접 제거)
+        self.suppress_overlays = suppress_overlays
+        # 파일 링크가 없는 문서의 폴백 저장 방식: text(.md, 요약용으로 가장 빠름) / mhtml / pdf
+        self.capture_mode = capture_mode
         self.browser: Browser = None
         self.context: BrowserContext = None
         self.page: Page = None
@@ -54,6 +93,35 @@ class LimraSearchAgent:
         # 세션 쿠키 파일 경로
         self.cookies_path = self.download_folder / "session_cookies.json"
 
+        # 동시 다운로드 시 같은 파일명을 두 작업이 동시에 쓰지 않도록 예약
+        self._reserved_paths = set()
+
+        # 콘텐츠 주소 저장소 (같은 내용의 파일은 한 번만 저장)
+        self.store = ContentStore(self.download_folder)
+
+        # URL별 다운로드 기록 (skip: 기록이 있으면 건너뜀 / revalidate: 파일·서버 재검증 / force: 항상 다시 받음)
+        self.manifest = DownloadManifest(self.download_folder / "download_manifest.json")
+        self.download_mode = 'skip'
+
+        # 랜딩 페이지 -> 실제 파일 URL 해석 캐시 (다시 받을 때 페이지 렌더링 생략)
+        self.resolution_cache = ResolutionCache(self.download_folder / "link_resolution_cache.json")
+
+        # 우선순위 다운로드 큐 (고정 > 순위, 취소/일시정지, 실행 중 추가 가능)
+        self.download_queue = DownloadQueue()
+        self.download_queue.on_add = self._emit_queued
+        self.download_queue.on_cancel = self._emit_cancelled
+
+        # 구조화된 다운로드 진행 이벤트 (events.add_sink로 콜백/JSONL/웹 스트림 연결)
+        self.events = DownloadEvents()
+
+        # 실패 분류별 재시도 (일시적: 백오프 재시도 / 인증 만료: 재로그인 / 영구: 중단)
+        self.retry_policy = RetryPolicy()
+        # 호스트 실패율이 높으면 일정 시간 요청을 멈추는 서킷 브레이커
+        self.circuit_breaker = CircuitBreaker()
+        # 재로그인은 동시 작업자 중 하나만 수행 (세대 번호로 중복 로그인 방지)
+        self._auth_lock = asyncio.Lock()
+        self._auth_generation = 0
+
     async def initialize(self):
         """브라우저 초기화"""
         print("[*] 브라우저 초기화 중...")
@@ -75,10 +143,21 @@ class LimraSearchAgent:
         # PDF 자동 다운로드 설정
         self.context = await self.browser.new_context(
             viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            user_agent=self.USER_AGENT,
             accept_downloads=True,
         )
 
+        # 자동화 감지 우회 (컨텍스트의 모든 페이지에 적용)
+        await self.context.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+        """)
+
+        # 쿠키 배너/모달 억제 (컨텍스트의 모든 페이지와 이동에 한 번에 적용)
+        if self.suppress_overlays:
+            await self.context.add_init_script(self.OVERLAY_SUPPRESSION_JS)
+
         # 메인 페이지 생성
         self.page = await self.context.new_page()
 
@@ -96,13 +175,6 @@ class LimraSearchAgent:
             'eventsEnabled': True
         })
 
-        # 자동화 감지 우회
-        await self.page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
-
         # 저장된 쿠키 로드 시도
         await self._load_cookies()
 
@@ -620,8 +692,108 @@ class LimraSearchAgent:
         else:
             return 'Article'
 
-    async def _dismiss_cookie_banner(self):
+    # 쿠키 배너/모달 억제 스크립트 - 컨텍스트 init script로 한 번 설치하면 모든 페이지/이동에 적용
+    # CSS로 즉시 숨기고, MutationObserver로 나중에 삽입되는 배너·모달도 나타나는 즉시 숨김
+    # 숨긴 요소 수는 window.__limraSuppression 에 기록 (get_suppression_stats로 조회)
+    # 로그인/검색 페이지는 로그인 폼·검색 필터가 dialog/overlay 안에 있을 수 있어 쿠키 배너만 숨김
+    OVERLAY_SUPPRESSION_JS = """
+        (() => {
+            if (window.__limraSuppression) return;
+            const MODAL_EXEMPT = /(^|\\/)(login|signin|sign-in|search|account)(\\/|$)/i;
+            const exempt = MODAL_EXEMPT.test(location.pathname) ||
+                /(^|\\.)(login|auth|sso)\\./i.test(location.hostname);
+            const stats = window.__limraSuppression = {hidden: 0, by_rule: {}, modal: !exempt};
+
+            const COOKIE_SELECTORS = [
+                '[id*="cookie"]', '[class*="cookie"]', '[id*="Cookie"]', '[class*="Cookie"]',
+                '[id*="consent"]', '[class*="consent"]', '[id*="onetrust"]', '[class*="onetrust"]',
+                '[id*="gdpr"]', '[class*="gdpr"]', '.cc-banner', '.cookie-notice',
+                '.cookie-popup', '#cookie-law-info-bar',
+            ];
+            const MODAL_SELECTORS = [
+                '#LimraModal', '.modal', '[class*="modal"]', '.mod-wrapper',
+                '.autofill__panel', '[role="dialog"]', '.popup', '.overlay',
+            ];
+            // html/body에 modal-open 같은 클래스가 붙어도 페이지 전체가 숨겨지지 않도록 제외
+            const guard = sel => sel + ':not(html):not(body)';
+            const COOKIE = COOKIE_SELECTORS.map(guard).join(',');
+            const MODAL = exempt ? '' : MODAL_SELECTORS.map(guard).join(',');
+            const HIDDEN = MODAL ? COOKIE + ',' + MODAL : COOKIE;
+            const BANNER_TEXT = /cookie|consent|accept|privacy/i;
+            const seen = new WeakSet();
+
+            const hide = (el, rule) => {
+                if (seen.has(el)) return;
+                seen.add(el);
+                el.style.setProperty('display', 'none', 'important');
+                el.style.setProperty('pointer-events', 'none', 'important');
+                stats.hidden += 1;
+                stats.by_rule[rule] = (stats.by_rule[rule] || 0) + 1;
+            };
+
+            const scan = root => {
+                if (root.nodeType !== 1) return;
+                if (root.matches(COOKIE)) hide(root, 'cookie');
+                else if (MODAL && root.matches(MODAL)) hide(root, 'modal');
+                root.querySelectorAll(COOKIE).forEach(el => hide(el, 'cookie'));
+                if (MODAL) root.querySelectorAll(MODAL).forEach(el => hide(el, 'modal'));
+
+                // 선택자에 안 걸리는 하단 고정 동의 배너 (새로 추가된 요소만 검사)
+                if (root === document.documentElement || root === document.body) return;
+                const text = root.textContent || '';
+                if (text.length < 2000 && BANNER_TEXT.test(text)) {
+                    const style = getComputedStyle(root);
+                    if (style.position === 'fixed' && parseInt(style.bottom) < 100) {
+                        hide(root, 'fixed_banner');
+                    }
+                }
+            };
+
+            const installStyle = () => {
+                const style = document.createElement('style');
+                style.textContent = HIDDEN +
+                    ' { display: none !important; pointer-events: none !important; }' +
+                    ' html, body { overflow: auto !important; }';
+                (document.head || document.documentElement).appendChild(style);
+            };
+
+            new MutationObserver(mutations => {
+                for (const m of mutations) m.addedNodes.forEach(scan);
+            }).observe(document, {childList: true, subtree: true});
+
+            if (document.documentElement) installStyle();
+            else document.addEventListener('readystatechange', installStyle, {once: true});
+            document.addEventListener('DOMContentLoaded', () => scan(document.documentElement));
+        })();
+    """
+
+    async def get_suppression_stats(self, page: Page = None) -> dict:
+        """현재 페이지에서 억제 스크립트가 숨긴 배너/모달 수
+
+        Returns:
+            {'hidden': 총 개수, 'by_rule': {'cookie': n, 'modal': n, 'fixed_banner': n},
+             'modal': 이 페이지에서 모달도 숨기는지 (로그인/검색 페이지는 False)}
+            (스크립트가 설치되지 않았으면 None)
+        """
+        page = page or self.page
+        try:
+            return await page.evaluate("() => window.__limraSuppression || null")
+        except Exception:
+            return None
+
+    async def _clear_overlays(self, page: Page = None):
+        """배너/모달 처리 - 억제 스크립트가 이 페이지의 모달까지 숨기고 있으면 생략 (아니면 직접 제거)"""
+        page = page or self.page
+        if self.suppress_overlays:
+            stats = await self.get_suppression_stats(page)
+            if stats and stats.get('modal'):
+                return
+        await self._dismiss_cookie_banner(page)
+        await self._dismiss_modal_popup(page)
+
+    async def _dismiss_cookie_banner(self, page: Page = None):
         """쿠키 동의 배너 제거/숨기기"""
+        page = page or self.page
         try:
             # 쿠키 배너 닫기 버튼 클릭 시도
             cookie_button_selectors = [
@@ -639,7 +811,7 @@ class LimraSearchAgent:
 
             for selector in cookie_button_selectors:
                 try:
-                    button = await self.page.query_selector(selector)
+                    button = await page.query_selector(selector)
                     if button and await button.is_visible():
                         await button.click()
                         await asyncio.sleep(1)
@@ -648,7 +820,7 @@ class LimraSearchAgent:
                     continue
 
             # 버튼을 못 찾으면 JavaScript로 쿠키 배너 요소 숨기기
-            await self.page.evaluate("""
+            await page.evaluate("""
                 () => {
                     // 쿠키 관련 요소 숨기기
                     const selectors = [
@@ -695,11 +867,12 @@ class LimraSearchAgent:
             # 쿠키 배너 제거 실패해도 계속 진행
             pass
 
-    async def _dismiss_modal_popup(self):
+    async def _dismiss_modal_popup(self, page: Page = None):
         """모달 팝업 닫기 (LimraModal 등)"""
+        page = page or self.page
         try:
             # LIMRA 사이트의 모달 팝업 닫기
-            await self.page.evaluate("""
+            await page.evaluate("""
                 () => {
                     // LimraModal 및 일반 모달 닫기
                     const modalSelectors = [
@@ -931,384 +1104,964 @@ class LimraSearchAgent:
                 await self.page.goto(research_url, wait_until='networkidle', timeout=30000)
                 await asyncio.sleep(2)
 
-                # 실제 문서/보고서 카드/아이템 찾기
-                # LIMRA 사이트의 연구 목록 구조에 맞게 셀렉터 지정
-                article_selectors = [
-                    '.research-item',
-                    '.article-item',
-                    '.card',
-                    '.list-item',
-                    'article',
-                    '[class*="research"]',
-                    '[class*="article"]',
-                    '[class*="report"]',
-                    '.content-item',
-                    '.publication-item',
-                ]
-
-                found_articles = []
-                for selector in article_selectors:
-                    items = await self.page.query_selector_all(selector)
-                    if items and len(items) > 0:
-                        found_articles = items
-                        print(f"    [LIST] {len(items)}개 항목 발견 ({selector})")
-                        break
+                all_documents.extend(await self._extract_listing_documents(self.page))
 
-                # 각 아티클에서 링크와 제목 추출
-                for item in found_articles:
-                    try:
-                        # 제목 링크 찾기
-                        title_link = await item.query_selector('a[href]')
-                        if not title_link:
-                            continue
+            except Exception as e:
+                print(f"  [WARN] 오류: {e}")
+                continue
 
-                        href = await title_link.get_attribute('href')
-                        text = await title_link.inner_text()
+        unique_docs = self._dedupe_documents(all_documents)
 
-                        if not href or not text.strip():
-                            continue
+        print(f"[OK] 총 {len(unique_docs)}개 실제 문서 발견")
+        return unique_docs
 
-                        full_url = urljoin(self.BASE_URL, href)
-
-                        # 제외할 링크 패턴 (일반 페이지, 언어 설정 등)
-                        skip_patterns = [
-                            '?epslanguage=',
-                            '/en/research/?',
-                            '/login',
-                            '/search',
-                            '#',
-                            'javascript:',
-                            '/en/research/insurance/?',
-                            '/en/research/retirement/?',
-                            '/en/research/annuities/?',
-                            '/en/research/workplace-benefits/?',
-                        ]
-
-                        if any(pattern in full_url for pattern in skip_patterns):
-                            continue
+    async def _extract_listing_documents(self, page: Page) -> list:
+        """현재 로드된 연구 목록 페이지에서 문서/보고서 항목 추출"""
+        documents = []
 
-                        # 너무 짧은 제목 제외 (네비게이션 링크일 가능성)
-                        if len(text.strip()) < 10:
-                            continue
+        # 실제 문서/보고서 카드/아이템 찾기
+        # LIMRA 사이트의 연구 목록 구조에 맞게 셀렉터 지정
+        article_selectors = [
+            '.research-item',
+            '.article-item',
+            '.card',
+            '.list-item',
+            'article',
+            '[class*="research"]',
+            '[class*="article"]',
+            '[class*="report"]',
+            '.content-item',
+            '.publication-item',
+        ]
 
-                        all_documents.append({
-                            'title': text.strip(),
+        found_articles = []
+        for selector in article_selectors:
+            items = await page.query_selector_all(selector)
+            if items and len(items) > 0:
+                found_articles = items
+                print(f"    [LIST] {len(items)}개 항목 발견 ({selector})")
+                break
+
+        # 각 아티클에서 링크와 제목 추출
+        for item in found_articles:
+            try:
+                # 제목 링크 찾기
+                title_link = await item.query_selector('a[href]')
+                if not title_link:
+                    continue
+
+                href = await title_link.get_attribute('href')
+                text = await title_link.inner_text()
+
+                if not href or not text.strip():
+                    continue
+
+                full_url = urljoin(self.BASE_URL, href)
+
+                # 제외할 링크 패턴 (일반 페이지, 언어 설정 등)
+                if any(pattern in full_url for pattern in self.LISTING_SKIP_PATTERNS):
+                    continue
+
+                # 너무 짧은 제목 제외 (네비게이션 링크일 가능성)
+                if len(text.strip()) < 10:
+                    continue
+
+                documents.append({
+                    'title': text.strip(),
+                    'url': full_url,
+                    'type': self._get_document_type(href),
+                    'description': ''
+                })
+            except:
+                continue
+
+        # 카드/아이템이 없으면 일반 링크에서 추출 (더 엄격한 필터링)
+        if not found_articles:
+            links = await page.query_selector_all('a[href]')
+            for link in links:
+                try:
+                    href = await link.get_attribute('href')
+                    text = await link.inner_text()
+
+                    if not href or not text.strip():
+                        continue
+
+                    full_url = urljoin(self.BASE_URL, href)
+
+                    # 실제 문서 페이지인지 확인 (더 구체적인 URL 패턴)
+                    # 예: /en/research/research-reports/report-name/
+                    url_lower = full_url.lower()
+
+                    # PDF 직접 링크
+                    if '.pdf' in url_lower:
+                        documents.append({
+                            'title': text.strip() or 'PDF Document',
                             'url': full_url,
-                            'type': self._get_document_type(href),
+                            'type': 'PDF',
                             'description': ''
                         })
-                    except:
                         continue
 
-                # 카드/아이템이 없으면 일반 링크에서 추출 (더 엄격한 필터링)
-                if not found_articles:
-                    links = await self.page.query_selector_all('a[href]')
-                    for link in links:
-                        try:
-                            href = await link.get_attribute('href')
-                            text = await link.inner_text()
-
-                            if not href or not text.strip():
-                                continue
-
-                            full_url = urljoin(self.BASE_URL, href)
-
-                            # 실제 문서 페이지인지 확인 (더 구체적인 URL 패턴)
-                            # 예: /en/research/research-reports/report-name/
-                            url_lower = full_url.lower()
-
-                            # PDF 직접 링크
-                            if '.pdf' in url_lower:
-                                all_documents.append({
-                                    'title': text.strip() or 'PDF Document',
-                                    'url': full_url,
-                                    'type': 'PDF',
-                                    'description': ''
-                                })
-                                continue
-
-                            # 구체적인 문서 페이지 패턴 (URL에 여러 경로 세그먼트가 있어야 함)
-                            path_segments = [s for s in urlparse(full_url).path.split('/') if s]
-                            if len(path_segments) >= 3:  # 예: /en/research/report-title/
-                                # 제외 패턴 확인
-                                skip_patterns = [
-                                    '?epslanguage=',
-                                    '/login',
-                                    '/search',
-                                    '#',
-                                    'javascript:',
-                                ]
-                                if any(pattern in full_url for pattern in skip_patterns):
-                                    continue
-
-                                # 짧은 제목 제외
-                                if len(text.strip()) < 15:
-                                    continue
-
-                                all_documents.append({
-                                    'title': text.strip(),
-                                    'url': full_url,
-                                    'type': 'Article',
-                                    'description': ''
-                                })
-                        except:
+                    # 구체적인 문서 페이지 패턴 (URL에 여러 경로 세그먼트가 있어야 함)
+                    path_segments = [s for s in urlparse(full_url).path.split('/') if s]
+                    if len(path_segments) >= 3:  # 예: /en/research/report-title/
+                        # 제외 패턴 확인
+                        if any(pattern in full_url for pattern in self.SKIP_PATTERNS):
                             continue
 
-            except Exception as e:
-                print(f"  [WARN] 오류: {e}")
-                continue
+                        # 짧은 제목 제외
+                        if len(text.strip()) < 15:
+                            continue
 
-        # 중복 제거
+                        documents.append({
+                            'title': text.strip(),
+                            'url': full_url,
+                            'type': 'Article',
+                            'description': ''
+                        })
+                except:
+                    continue
+
+        return documents
+
+    def _dedupe_documents(self, documents: list) -> list:
+        """URL/제목 기준 중복 제거 (먼저 나온 항목 유지)"""
         seen = set()
         unique_docs = []
-        for doc in all_documents:
+        for doc in documents:
             if doc['url'] not in seen and doc['title'] not in seen:
                 seen.add(doc['url'])
                 seen.add(doc['title'])
                 unique_docs.append(doc)
-
-        print(f"[OK] 총 {len(unique_docs)}개 실제 문서 발견")
         return unique_docs
 
-    async def download_document(self, url: str, filename: str = None) -> str:
-        """문서 다운로드 - 실제 파일 다운로드 우선"""
+    async def _goto_light(self, url: str):
+        """가벼운 페이지 이동 (DOM 로드 후 짧게만 네트워크 안정 대기)"""
+        await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
         try:
-            print(f"[DL] 다운로드 중: {url}")
-
-            # 파일명 생성
-            if not filename:
-                parsed = urlparse(url)
-                filename = os.path.basename(parsed.path) or 'document'
-                # 파일명 정리
-                filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-
-            # 확장자가 없으면 추가
-            if '.' not in filename:
-                filename += '.pdf'
-
-            filepath = self.download_folder / filename
-
-            # 중복 파일명 처리
-            counter = 1
-            original_filepath = filepath
-            while filepath.exists():
-                stem = original_filepath.stem
-                suffix = original_filepath.suffix
-                filepath = self.download_folder / f"{stem}_{counter}{suffix}"
-                counter += 1
-
-            # 페이지 방문
-            await self.page.goto(url, wait_until='networkidle', timeout=60000)
-            await asyncio.sleep(2)
+            await self.page.wait_for_load_state('networkidle', timeout=5000)
+        except:
+            pass  # 타임아웃 무시
 
-            # 쿠키 배너 및 모달 팝업 제거
-            await self._dismiss_cookie_banner()
-            await self._dismiss_modal_popup()
+    async def fetch_listing_documents(self, url: str) -> list:
+        """연구 목록 페이지 하나만 가볍게 확인 (watch 모드용)"""
+        try:
+            await self._goto_light(url)
+            return await self._extract_listing_documents(self.page)
+        except Exception as e:
+            print(f"  [WARN] {url} 확인 중 오류: {e}")
+            return []
 
-            # 페이지에서 다운로드 가능한 파일 링크/버튼 찾기
-            download_element = await self._find_download_element()
+    async def quick_search(self, query: str, max_results: int = 20) -> list:
+        """검색 페이지 한 번만 조회하는 가벼운 검색 (연구 섹션 재검색 생략)"""
+        try:
+            search_url = f"{self.SEARCH_URL}?q={quote_plus(query)}"
+            await self._goto_light(search_url)
+            results = await self._parse_search_results(max_results)
+        except Exception as e:
+            print(f"[WARN] '{query}' 검색 중 오류: {e}")
+            return []
 
-            if download_element:
-                # 실제 파일 다운로드 - 클릭 방식
-                try:
-                    print(f"  [LINK] 다운로드 링크 발견, 클릭 중...")
+        return self._dedupe_documents(results)[:max_results]
 
-                    # 모달 다시 확인 후 닫기
-                    await self._dismiss_modal_popup()
+    async def crawl_research_library(
+        self,
+        max_pages: int = 200,
+        max_seconds: float = None,
+        max_depth: int = 3,
+        concurrency: int = 2,
+        resume: bool = True
+    ) -> list:
+        """
+        Research 라이브러리 전체를 BFS로 크롤링하여 문서 목록 수집
 
-                    # force 옵션으로 클릭 시도
-                    async with self.page.expect_download(timeout=60000) as download_info:
-                        await download_element.click(force=True)
+        RESEARCH_URLS를 시드로 하위 섹션/주제 페이지까지 따라가며,
+        진행 상태는 다운로드 폴더에 체크포인트로 저장되어 중단 후 재개할 수 있습니다.
 
-                    download = await download_info.value
+        Args:
+            max_pages: 이번 실행에서 방문할 최대 페이지 수
+            max_seconds: 이번 실행의 최대 소요 시간 (None이면 제한 없음)
+            max_depth: 시드 기준 최대 링크 깊이
+            concurrency: 호스트당 동시 페이지 수
+            resume: True이면 저장된 체크포인트에서 이어서 크롤링
 
-                    # 다운로드 완료 대기
-                    await download.path()
+        Returns:
+            browse_research_section과 동일한 형식의 문서 목록
+        """
+        crawler = ResearchCrawler(
+            self,
+            state_path=self.download_folder / "crawler_state.json",
+            max_depth=max_depth,
+            per_host_concurrency=concurrency,
+        )
+        if not resume:
+            crawler.reset()
 
-                    # 원본 파일명 사용
-                    suggested_filename = download.suggested_filename
-                    if suggested_filename:
-                        # 확장자 유지
-                        ext = Path(suggested_filename).suffix
-                        if ext:
-                            filepath = filepath.with_suffix(ext)
+        return await crawler.crawl(max_pages=max_pages, max_seconds=max_seconds)
 
-                    await download.save_as(str(filepath))
-                    print(f"[OK] 실제 파일 저장됨: {filepath}")
-                    return str(filepath)
+    async def download_document(
+        self,
+        url: str,
+        filename: str = None,
+        page: Page = None,
+        mode: str = None,
+        capture_mode: str = None
+    ) -> str:
+        """문서 다운로드 - 실제 파일 다운로드 우선
+
+        일시적 실패(타임아웃, 5xx 등)는 지수 백오프로 재시도하고, 로그인 페이지로
+        리다이렉트되면 재로그인 후 다시 시도합니다. 404 같은 영구 실패는 재시도하지 않으며,
+        호스트 실패율이 높아 서킷이 열려 있으면 요청하지 않고 바로 실패합니다.
 
-                except Exception as e:
-                    print(f"[WARN] 클릭 다운로드 실패: {e}")
+        Args:
+            url: 문서 URL
+            filename: 저장할 파일명 (없으면 URL에서 생성)
+            page: 사용할 페이지 (동시 다운로드용, 기본: self.page)
+            mode: 매니페스트 처리 방식 skip / revalidate / force (기본: self.download_mode)
+            capture_mode: 파일 링크가 없는 문서의 저장 방식 text / mhtml / pdf (기본: self.capture_mode)
+        """
+        page = page or self.page
+        mode = mode or self.download_mode
+
+        # 이미 받은 문서면 페이지 이동 없이 기존 파일 반환
+        if mode != 'force':
+            cached = await self._check_manifest(url, mode)
+            if cached:
+                print(f"[SKIP] 이미 다운로드됨: {cached}")
+                self.events.emit(SKIPPED, url, filepath=cached)
+                return cached
+
+        print(f"[DL] 다운로드 중: {url}")
+        filepath = self._reserve_filepath(url, filename)
+        try:
+            return await self._download_with_retry(url, filepath, page, capture_mode)
+        finally:
+            # 저장된 파일은 exists()로 보호되므로 성공/실패/취소 모두 예약 해제
+            self._reserved_paths.discard(filepath)
+
+    async def _download_with_retry(self, url: str, filepath: Path, page: Page, capture_mode: str = None) -> str:
+        """실패 분류에 따라 재시도하며 다운로드 (서킷이 열렸거나 재시도 한도를 넘으면 None)"""
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = self.circuit_breaker.state(url) == 'half_open'
+            if not self.circuit_breaker.allow(url):
+                print(f"[ERROR] 다운로드 건너뜀 (서킷 열림): {url}")
+                self.events.emit(FAILED, url, kind='circuit_open', attempts=attempt - 1)
+                return None
 
-            # 직접 PDF 링크로 다운로드 시도
-            pdf_link = await self._find_pdf_url()
-            if pdf_link:
+            auth_generation = self._auth_generation
+            try:
+                saved = await self._download_attempt(url, filepath, page, capture_mode)
+                self.circuit_breaker.record(url, True)
+                return saved
+            except Exception as e:
+                error = e
+                kind = classify_failure(e)
+            finally:
+                # 결과를 기록하지 않는 경우(인증 만료, 취소)에도 시험 요청 자리를 비워 둠
+                if probe:
+                    self.circuit_breaker.release(url)
+
+            # 영구 실패는 호스트 장애가 아니므로 서킷 실패로 세지 않음
+            if kind == TRANSIENT:
+                self.circuit_breaker.record(url, False)
+            elif kind == PERMANENT:
+                self.circuit_breaker.record(url, True)
+
+            if not self.retry_policy.should_retry(kind, attempt):
+                print(f"[ERROR] 다운로드 실패 ({kind}, {attempt}회 시도): {error}")
+                self.events.emit(FAILED, url, kind=kind, attempts=attempt, error=str(error)[:300])
+                return None
+
+            if kind == AUTH:
+                print(f"  [AUTH] 세션 만료 감지, 재로그인 후 재시도...")
+                self.events.emit(RETRYING, url, kind=kind, attempt=attempt)
+                if not await self._reauthenticate(page, auth_generation):
+                    print(f"[ERROR] 재로그인 실패: {url}")
+                    self.events.emit(FAILED, url, kind=AUTH, attempts=attempt, error='재로그인 실패')
+                    return None
+                continue
+
+            delay = self.retry_policy.backoff(attempt)
+            print(f"  [RETRY] {attempt}회 실패 ({error}), {delay:.1f}초 후 재시도...")
+            self.events.emit(RETRYING, url, kind=kind, attempt=attempt,
+                             delay=round(delay, 2), error=str(error)[:300])
+            await asyncio.sleep(delay)
+
+    def _reserve_filepath(self, url: str, filename: str = None) -> Path:
+        """저장 경로 결정 및 예약 (동시 다운로드/재시도 간 같은 경로 유지)"""
+        # 파일명 생성
+        if not filename:
+            parsed = urlparse(url)
+            filename = os.path.basename(parsed.path) or 'document'
+            # 파일명 정리
+            filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+
+        # 확장자가 없으면 추가
+        if '.' not in filename:
+            filename += '.pdf'
+
+        filepath = self.download_folder / filename
+
+        # 중복 파일명 처리
+        counter = 1
+        original_filepath = filepath
+        while filepath.exists() or filepath in self._reserved_paths:
+            stem = original_filepath.stem
+            suffix = original_filepath.suffix
+            filepath = self.download_folder / f"{stem}_{counter}{suffix}"
+            counter += 1
+        self._reserved_paths.add(filepath)
+        return filepath
+
+    async def _reauthenticate(self, page: Page, auth_generation: int) -> bool:
+        """세션 만료 시 재로그인 (동시 작업자 중 한 번만 수행)
+
+        Args:
+            page: 로그인에 사용할 페이지 (실패한 작업자의 페이지)
+            auth_generation: 실패한 시도를 시작할 때의 인증 세대
+        """
+        async with self._auth_lock:
+            # 기다리는 동안 다른 작업자가 이미 재로그인했으면 그대로 재시도
+            if self._auth_generation != auth_generation:
+                return True
+
+            main_page = self.page
+            self.page = page
+            try:
+                self.is_logged_in = False
+                if self.cookies_path.exists():
+                    self.cookies_path.unlink()
+                ok = await self.login()
+            finally:
+                self.page = main_page
+
+            if ok:
+                self._auth_generation += 1
+            return ok
+
+    async def _download_attempt(self, url: str, filepath: Path, page: Page, capture_mode: str = None) -> str:
+        """다운로드 1회 시도
+
+        Raises:
+            DownloadFailure: 로그인 리다이렉트(AUTH), HTTP 오류 상태
+            Exception: 타임아웃 등 Playwright 오류 (classify_failure로 분류)
+        """
+        # 이전에 해석한 파일 URL이 있으면 (또는 URL 자체가 파일이면) 페이지 렌더링 없이 바로 받기
+        resolved = self.resolution_cache.get(url)
+        file_url = resolved['file_url'] if resolved else (url if self._is_document_link(url) else None)
+        if file_url:
+            saved = await self._stream_direct(file_url, filepath, url)
+            if saved:
+                return saved
+            self.resolution_cache.forget(url)
+            resolved = None
+
+        # 페이지 방문
+        self.events.emit(NAVIGATING, url)
+        response = await page.goto(url, wait_until='networkidle', timeout=60000)
+        self._raise_for_navigation(page, response, url)
+        await asyncio.sleep(2)
+
+        # 쿠키 배너 및 모달 팝업 제거 (억제 스크립트가 설치돼 있으면 생략)
+        await self._clear_overlays(page)
+
+        # 파일 링크가 없던 페이지로 기억되어 있으면 탐색 생략하고 바로 캡처
+        if resolved and not resolved['file_url']:
+            return await self._capture_page(page, url, filepath, capture_mode)
+
+        # 페이지의 다운로드 후보를 한 번에 점수화 (링크/버튼/iframe/embed)
+        candidates = await self._rank_download_candidates(page)
+
+        # 페이지에서 다운로드 가능한 파일 링크/버튼 찾기
+        download_element = await self._find_download_element(page, candidates)
+
+        if download_element:
+            # 링크가 파일을 직접 가리키면 브라우저를 거치지 않고 스트리밍
+            best = self._best_clickable(candidates)
+            if best and best['url'] and self._is_document_link(best['url']):
+                saved = await self._stream_direct(best['url'], filepath, url)
+                if saved:
+                    return saved
+
+            # 실제 파일 다운로드 - 클릭 방식
+            try:
+                print(f"  [LINK] 다운로드 링크 발견, 클릭 중...")
+                self.events.emit(RESOLVED, url, method='click', file_url=best['url'] if best else None)
+
+                # 모달 다시 확인 후 닫기
+                await self._clear_overlays(page)
+
+                # force 옵션으로 클릭 시도
+                timeout = (self.BUTTON_DOWNLOAD_TIMEOUT if best and best['tag'] == 'button'
+                           else self.LINK_DOWNLOAD_TIMEOUT)
+                async with page.expect_download(timeout=timeout) as download_info:
+                    await download_element.click(force=True)
+
+                download = await download_info.value
+
+                # 다운로드 완료 대기
+                await download.path()
+
+                # 원본 파일명의 확장자 유지 (바뀌면 그 이름으로 새로 예약)
+                target = self._retarget(filepath, Path(download.suggested_filename or '').suffix)
                 try:
-                    print(f"  [LINK] PDF URL 발견: {pdf_link[:50]}...")
-
-                    async with self.page.expect_download(timeout=60000) as download_info:
-                        # JavaScript로 다운로드 트리거
-                        await self.page.evaluate(f'''
-                            () => {{
-                                const a = document.createElement('a');
-                                a.href = "{pdf_link}";
-                                a.download = "";
-                                a.style.display = "none";
-                                document.body.appendChild(a);
-                                a.click();
-                                document.body.removeChild(a);
-                            }}
-                        ''')
-
-                    download = await download_info.value
-                    suggested_filename = download.suggested_filename
-                    if suggested_filename:
-                        ext = Path(suggested_filename).suffix
-                        if ext:
-                            filepath = filepath.with_suffix(ext)
-
-                    await download.save_as(str(filepath))
-                    print(f"[OK] 실제 파일 저장됨: {filepath}")
-                    return str(filepath)
+                    await download.save_as(str(target))
+                    print(f"[OK] 실제 파일 저장됨: {target}")
+                    if download.url.startswith('http'):
+                        self.resolution_cache.set(url, download.url, 'click')
+                    return await self._finalize_download(target, url, 'click')
+                finally:
+                    if target != filepath:
+                        self._reserved_paths.discard(target)
 
-                except Exception as e:
-                    print(f"[WARN] PDF URL 다운로드 실패: {e}")
+            except Exception as e:
+                print(f"[WARN] 클릭 다운로드 실패: {e}")
+
+        # 직접 PDF 링크로 다운로드 시도
+        pdf_link = await self._find_pdf_url(page, candidates)
+        if pdf_link:
+            try:
+                print(f"  [LINK] PDF URL 발견: {pdf_link[:50]}...")
+
+                saved = await self._stream_direct(pdf_link, filepath, url)
+                if saved:
+                    return saved
+
+                self.events.emit(RESOLVED, url, method='pdf_link', file_url=pdf_link)
+                async with page.expect_download(timeout=60000) as download_info:
+                    # JavaScript로 다운로드 트리거
+                    await page.evaluate(f'''
+                        () => {{
+                            const a = document.createElement('a');
+                            a.href = "{pdf_link}";
+                            a.download = "";
+                            a.style.display = "none";
+                            document.body.appendChild(a);
+                            a.click();
+                            document.body.removeChild(a);
+                        }}
+                    ''')
+
+                download = await download_info.value
+                target = self._retarget(filepath, Path(download.suggested_filename or '').suffix)
+                try:
+                    await download.save_as(str(target))
+                    print(f"[OK] 실제 파일 저장됨: {target}")
+                    self.resolution_cache.set(url, pdf_link, 'pdf_link')
+                    return await self._finalize_download(target, url, 'pdf_link', file_url=pdf_link)
+                finally:
+                    if target != filepath:
+                        self._reserved_paths.discard(target)
 
-            # 다운로드 링크를 찾지 못한 경우 - 페이지 PDF로 저장 (폴백)
-            print(f"[WARN] 다운로드 링크 없음, 페이지 PDF로 저장")
-            if filepath.suffix != '.pdf':
-                filepath = filepath.with_suffix('.pdf')
+            except Exception as e:
+                print(f"[WARN] PDF URL 다운로드 실패: {e}")
 
-            await self._dismiss_cookie_banner()
-            await self.page.pdf(path=str(filepath))
+        # 다운로드 링크를 찾지 못한 경우 - 페이지 PDF로 저장 (폴백)
+        print(f"[WARN] 다운로드 링크 없음, 페이지 PDF로 저장")
+        self.resolution_cache.set(url, None, 'page_capture')
+        return await self._capture_page(page, url, filepath, capture_mode)
 
-            print(f"[OK] 페이지 캡처 저장됨: {filepath}")
-            return str(filepath)
+    def _raise_for_navigation(self, page: Page, response, url: str):
+        """페이지 이동 결과가 로그인 리다이렉트나 HTTP 오류면 분류된 예외 발생
+
+        오류 페이지를 그대로 캡처해 문서로 저장하지 않도록 탐색 전에 확인합니다.
+        """
+        if 'login' in (page.url or '').lower() and 'login' not in url.lower():
+            raise DownloadFailure(f"로그인 페이지로 리다이렉트됨: {page.url}", AUTH)
+        status = response.status if response else None
+        kind = classify_status(status)
+        if kind:
+            raise DownloadFailure(f"HTTP {status}: {url}", kind, status)
+
+    # 폴백 캡처 방식별 저장 확장자
+    CAPTURE_MODES = {
+        'text': '.md',     # 본문 텍스트만 Markdown으로 추출 (in-page 호출 1회, 요약 파이프라인용)
+        'mhtml': '.mhtml', # 페이지 전체 스냅샷 (CDP Page.captureSnapshot)
+        'pdf': '.pdf',     # 인쇄 렌더링 (가장 느리고 메모리 사용 많음)
+    }
+
+    # 읽을 수 있는 본문을 Markdown으로 변환하는 스크립트 - 한 번의 evaluate로 처리
+    READABLE_TEXT_JS = """
+        () => {
+            const ROOTS = ['article', 'main', '[role="main"]', '.article-body',
+                           '.article-content', '.content-body', '#content'];
+            let root = null;
+            for (const sel of ROOTS) {
+                const el = document.querySelector(sel);
+                if (el && el.innerText.trim().length > 200) { root = el; break; }
+            }
+            root = root || document.body;
+
+            const SKIP = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'NAV', 'HEADER', 'FOOTER',
+                                  'ASIDE', 'FORM', 'BUTTON', 'SVG', 'IFRAME', 'TEMPLATE']);
+            const BLOCK = new Set(['P', 'DIV', 'SECTION', 'ARTICLE', 'BLOCKQUOTE', 'FIGCAPTION',
+                                   'TR', 'DD', 'DT', 'PRE']);
+            const lines = [];
+            let inline = '';
+            const flush = (prefix = '') => {
+                const text = inline.replace(/\\s+/g, ' ').trim();
+                if (text) lines.push(prefix + text);
+                inline = '';
+            };
+
+            const walk = node => {
+                if (node.nodeType === Node.TEXT_NODE) { inline += node.textContent; return; }
+                if (node.nodeType !== Node.ELEMENT_NODE || SKIP.has(node.tagName)) return;
+                if (node.getAttribute('aria-hidden') === 'true') return;
+                const style = node.style || {};
+                if (style.display === 'none') return;
+
+                const tag = node.tagName;
+                const heading = /^H([1-6])$/.exec(tag);
+                if (heading || tag === 'LI' || BLOCK.has(tag)) flush();
+                if (tag === 'BR') { flush(); return; }
+                node.childNodes.forEach(walk);
+                if (heading) flush('#'.repeat(+heading[1]) + ' ');
+                else if (tag === 'LI') flush('- ');
+                else if (tag === 'TD' || tag === 'TH') inline += ' | ';
+                else if (BLOCK.has(tag)) flush();
+            };
+            walk(root);
+            flush();
+
+            // 연속 중복 줄 제거
+            const body = lines.filter((line, i) => line !== lines[i - 1]).join('\\n\\n');
+            const meta = name => (document.querySelector(`meta[name="${name}"], meta[property="${name}"]`) || {}).content || '';
+            return {
+                title: (document.querySelector('h1') || {}).innerText || document.title,
+                description: meta('description') || meta('og:description'),
+                published: meta('article:published_time') || meta('date'),
+                markdown: body,
+            };
+        }
+    """
 
+    async def _capture_page(self, page: Page, url: str, filepath: Path, mode: str = None) -> str:
+        """현재 페이지를 저장 (파일 링크가 없는 문서용 폴백)
+
+        Args:
+            mode: text(.md) / mhtml / pdf (기본: self.capture_mode)
+        """
+        mode = mode or self.capture_mode
+        if mode not in self.CAPTURE_MODES:
+            mode = 'pdf'
+        target = self._retarget(filepath, self.CAPTURE_MODES[mode])
+        try:
+            return await self._write_capture(page, url, target, mode)
+        finally:
+            if target != filepath:
+                self._reserved_paths.discard(target)
+
+    async def _write_capture(self, page: Page, url: str, filepath: Path, mode: str) -> str:
+        """예약된 filepath에 mode 형식으로 페이지를 저장하고 저장소/매니페스트에 등록"""
+        self.events.emit(RESOLVED, url, method='page_capture', capture_mode=mode)
+        started = time.monotonic()
+        if mode == 'text':
+            article = await page.evaluate(self.READABLE_TEXT_JS)
+            header = [f"# {article['title'].strip()}", '', f"Source: {url}"]
+            if article.get('published'):
+                header.append(f"Published: {article['published']}")
+            if article.get('description'):
+                header += ['', f"> {article['description'].strip()}"]
+            content = '\n'.join(header) + '\n\n' + article['markdown'] + '\n'
+            await asyncio.to_thread(filepath.write_text, content, 'utf-8')
+        elif mode == 'mhtml':
+            cdp = await self.context.new_cdp_session(page)
+            try:
+                snapshot = await cdp.send('Page.captureSnapshot', {'format': 'mhtml'})
+            finally:
+                await cdp.detach()
+            await asyncio.to_thread(filepath.write_text, snapshot['data'], 'utf-8')
+        else:
+            await self._clear_overlays(page)
+            await page.pdf(path=str(filepath))
+        elapsed = time.monotonic() - started
+
+        print(f"[OK] 페이지 캡처 저장됨 ({mode}, {elapsed:.2f}초): {filepath}")
+        return await self._finalize_download(
+            filepath, url, 'page_capture',
+            capture_mode=mode, capture_seconds=round(elapsed, 3)
+        )
+
+    def _retarget(self, filepath: Path, suffix: str) -> Path:
+        """확장자가 바뀌면 바뀐 이름으로 새 경로 예약 (같거나 없으면 예약된 filepath 그대로)
+
+        새로 예약한 경로는 파일을 쓴 뒤 호출한 쪽에서 해제합니다.
+        """
+        if not suffix or suffix.lower() == filepath.suffix.lower():
+            return filepath
+        return self._unique_path(filepath.with_suffix(suffix))
+
+    def _unique_path(self, filepath: Path) -> Path:
+        """캡처 확장자로 바꾼 경로가 이미 있으면 번호를 붙여 새 경로 예약"""
+        if not filepath.exists() and filepath not in self._reserved_paths:
+            self._reserved_paths.add(filepath)
+            return filepath
+        counter = 1
+        while True:
+            candidate = filepath.with_name(f"{filepath.stem}_{counter}{filepath.suffix}")
+            if not candidate.exists() and candidate not in self._reserved_paths:
+                self._reserved_paths.add(candidate)
+                return candidate
+            counter += 1
+
+    async def _finalize_download(
+        self,
+        filepath,
+        url: str,
+        method: str,
+        sha256: str = None,
+        **extra
+    ) -> str:
+        """저장된 파일을 콘텐츠 저장소와 매니페스트에 등록
+
+        Returns:
+            사용할 파일 경로 (같은 내용이 이미 있으면 기존 파일)
+        """
+        size = Path(filepath).stat().st_size
+        try:
+            sha256 = sha256 or await asyncio.to_thread(ContentStore.hash_file, filepath)
+            filepath = await asyncio.to_thread(self.store.add, filepath, sha256)
         except Exception as e:
-            print(f"[ERROR] 다운로드 실패: {e}")
-            return None
+            print(f"  [WARN] 저장소 등록 실패: {e}")
+            self.events.emit(SAVED, url, filepath=str(filepath), size=size, method=method)
+            return str(filepath)
+
+        self.events.emit(SAVED, url, filepath=str(filepath), size=size, method=method)
 
-    async def _find_download_element(self):
-        """페이지에서 클릭 가능한 다운로드 요소 찾기"""
         try:
-            # 다운로드 버튼/링크 셀렉터들 (클릭용)
-            download_selectors = [
-                # PDF 직접 링크
-                'a[href$=".pdf"]',
-                'a[href*=".pdf?"]',
-                'a[href*="/pdf/"]',
-                # 다운로드 속성이 있는 링크
-                'a[download]',
-                # 텍스트 기반
-                'a:has-text("Download PDF")',
-                'a:has-text("Download Report")',
-                'a:has-text("Download")',
-                'a:has-text("다운로드")',
-                'a:has-text("PDF")',
-                # 클래스 기반
-                'a[class*="download"]',
-                'a[class*="Download"]',
-                '.download-link',
-                '.download-btn',
-                '.pdf-download',
-                # 버튼 형태
-                'button:has-text("Download")',
-                'button:has-text("다운로드")',
-                # 아이콘이 있는 링크 (LIMRA 스타일)
-                'a[href*="download"]',
-                'a[href*="Download"]',
-            ]
+            self.manifest.record(url, filepath, sha256, method, **extra)
+        except Exception as e:
+            print(f"  [WARN] 매니페스트 기록 실패: {e}")
+        return str(filepath)
 
-            for selector in download_selectors:
-                try:
-                    elements = await self.page.query_selector_all(selector)
-                    for element in elements:
-                        if await element.is_visible():
-                            href = await element.get_attribute('href')
-                            # PDF 링크인지 확인
-                            if href and ('.pdf' in href.lower() or 'download' in href.lower()):
-                                return element
-                except:
-                    continue
+    async def _check_manifest(self, url: str, mode: str) -> str:
+        """매니페스트 기준으로 다시 받을 필요가 없으면 기존 파일 경로 반환
 
+        skip: 기록된 파일이 같은 크기로 남아 있으면 재사용
+        revalidate: 파일 해시를 확인하고, 직접 파일 URL이 있으면 서버 헤더(ETag/크기)도 비교
+        """
+        path = self.manifest.local_path(url, self.download_folder)
+        if not path:
             return None
+        if mode == 'skip':
+            return str(path)
+
+        entry = self.manifest.get(url)
+        try:
+            if await asyncio.to_thread(ContentStore.hash_file, path) != entry['sha256']:
+                print(f"  [REVALIDATE] 로컬 파일 내용 변경됨: {path.name}")
+                return None
 
+            file_url = entry.get('file_url')
+            if file_url:
+                downloader = StreamingDownloader(
+                    cookies=await self.context.cookies(file_url),
+                    user_agent=self.USER_AGENT,
+                )
+                remote = await downloader.head_async(file_url, referer=url)
+                if entry.get('etag') and remote['etag'] and remote['etag'] != entry['etag']:
+                    print(f"  [REVALIDATE] 서버 파일 변경됨 (ETag): {path.name}")
+                    return None
+                if remote['content_length'] and remote['content_length'] != entry['size']:
+                    print(f"  [REVALIDATE] 서버 파일 크기 변경됨: {path.name}")
+                    return None
         except Exception as e:
+            print(f"  [WARN] 재검증 실패, 다시 다운로드: {e}")
             return None
 
-    async def _find_pdf_url(self) -> str:
-        """페이지에서 PDF URL 찾기"""
+        return str(path)
+
+    async def _stream_direct(self, file_url: str, filepath: Path, url: str) -> str:
+        """세션 쿠키로 파일을 직접 스트리밍 다운로드 (.part 이어받기 지원)
+
+        Args:
+            file_url: 실제 파일 URL
+            filepath: 저장 경로
+            url: 문서 랜딩 페이지 URL (Referer 및 매니페스트 키)
+
+        Returns:
+            저장된 파일 경로 (실패 시 None - 브라우저 다운로드로 폴백)
+        """
         try:
-            # JavaScript로 모든 PDF 링크 수집
-            pdf_urls = await self.page.evaluate("""
-                () => {
-                    const urls = [];
-                    // 모든 a 태그에서 PDF 링크 찾기
-                    document.querySelectorAll('a[href]').forEach(a => {
-                        const href = a.href || '';
-                        if (href.toLowerCase().includes('.pdf')) {
-                            urls.push(href);
-                        }
-                    });
-                    // iframe 내부도 확인
-                    document.querySelectorAll('iframe').forEach(iframe => {
-                        try {
-                            const src = iframe.src || '';
-                            if (src.toLowerCase().includes('.pdf')) {
-                                urls.push(src);
-                            }
-                        } catch(e) {}
-                    });
-                    // embed/object 태그 확인
-                    document.querySelectorAll('embed[src], object[data]').forEach(el => {
-                        const src = el.src || el.data || '';
-                        if (src.toLowerCase().includes('.pdf')) {
-                            urls.push(src);
-                        }
-                    });
-                    return urls;
-                }
-            """)
+            downloader = StreamingDownloader(
+                cookies=await self.context.cookies(file_url),
+                user_agent=self.USER_AGENT,
+            )
+            self.events.emit(RESOLVED, url, method='direct', file_url=file_url)
+            info = await downloader.download_async(
+                file_url, filepath, referer=url, progress=self.events.progress_callback(url)
+            )
+
+            resumed = f", {info['resumed_from']}바이트부터 이어받음" if info['resumed_from'] else ""
+            print(f"[OK] 직접 다운로드 저장됨: {filepath} ({info['size']:,}바이트{resumed})")
+            self.resolution_cache.set(url, file_url, 'direct')
+            return await self._finalize_download(
+                info['filepath'], url, 'direct', info['sha256'],
+                file_url=file_url, etag=info['etag'], last_modified=info['last_modified']
+            )
+
+        except DirectDownloadError as e:
+            print(f"  [WARN] 직접 다운로드 실패, 브라우저 다운로드로 전환: {e}")
+        except Exception as e:
+            print(f"  [WARN] 직접 다운로드 오류: {e}")
+        return None
+
+    # 클릭 후 다운로드 시작을 기다리는 시간 (ms) - href 없는 버튼은 다운로드를 시작하지 않는 경우가 많아
+    # 짧게 기다리고 PDF 링크/페이지 캡처 폴백으로 넘어감
+    LINK_DOWNLOAD_TIMEOUT = 60000
+    BUTTON_DOWNLOAD_TIMEOUT = 8000
+
+    # 다운로드 후보 점수화 스크립트 - 한 번의 evaluate로 모든 링크/버튼/iframe/embed를 평가
+    # 상위 후보에는 data-limra-candidate="<순위>" 속성을 붙여 Python에서 바로 선택할 수 있게 함
+    DOWNLOAD_CANDIDATES_JS = """
+        (maxCandidates) => {
+            document.querySelectorAll('[data-limra-candidate]').forEach(
+                el => el.removeAttribute('data-limra-candidate'));
+
+            const nodes = document.querySelectorAll(
+                'a[href], button, iframe[src], embed[src], object[data]');
+            const scored = [];
+
+            nodes.forEach(el => {
+                const tag = el.tagName.toLowerCase();
+                const url = tag === 'a' ? el.href
+                          : tag === 'object' ? el.data
+                          : (el.src || '');
+                const href = (url || '').toLowerCase();
+                const text = (el.innerText || el.getAttribute('aria-label') || el.title || '')
+                    .trim().toLowerCase().slice(0, 200);
+                const cls = (typeof el.className === 'string' ? el.className : '').toLowerCase();
+                const isPdf = href.includes('.pdf');
+
+                let score = 0;
+                if (/\\.pdf($|[?#])/.test(href)) score += 100;
+                else if (isPdf) score += 80;
+                if (href.includes('/pdf/')) score += 60;
+                if (href.includes('download')) score += 30;
+                if (el.hasAttribute('download')) score += 50;
+                if (text.includes('download pdf') || text.includes('download report')) score += 40;
+                else if (text.includes('download') || text.includes('다운로드')) score += 30;
+                else if (text.includes('pdf')) score += 20;
+                if (cls.includes('download') || cls.includes('pdf')) score += 20;
+                if (score <= 0) return;
+
+                // 클릭 대상: 파일/다운로드를 가리키는 링크, 다운로드 텍스트가 있는 버튼
+                const clickable = (tag === 'a' && (isPdf || href.includes('download')))
+                    || (tag === 'button' && (text.includes('download') || text.includes('다운로드')));
+
+                // 점수가 있는 요소만 레이아웃 확인
+                const rect = el.getBoundingClientRect();
+                const visible = el.checkVisibility
+                    ? el.checkVisibility() && rect.width > 0 && rect.height > 0
+                    : rect.width > 0 && rect.height > 0;
+
+                scored.push({el, tag, url: url || null, text: text.slice(0, 80),
+                             score, is_pdf: isPdf, clickable, visible});
+            });
+
+            scored.sort((a, b) => b.score - a.score);
+            return scored.slice(0, maxCandidates).map((c, rank) => {
+                c.el.setAttribute('data-limra-candidate', String(rank));
+                const {el, ...info} = c;
+                return {rank, ...info};
+            });
+        }
+    """
+
+    async def _rank_download_candidates(self, page: Page = None, max_candidates: int = 20) -> list:
+        """페이지의 다운로드 후보를 점수순으로 반환 (한 번의 in-page 호출)
 
-            # 첫 번째 유효한 PDF URL 반환
-            for url in pdf_urls:
-                if url and '.pdf' in url.lower():
-                    return url
+        Returns:
+            [{'rank', 'tag', 'url', 'text', 'score', 'is_pdf', 'clickable', 'visible'}, ...]
+        """
+        page = page or self.page
+        try:
+            return await page.evaluate(self.DOWNLOAD_CANDIDATES_JS, max_candidates)
+        except Exception as e:
+            return []
+
+    def _best_clickable(self, candidates: list) -> dict:
+        """보이는 클릭 후보 중 최고 점수 항목"""
+        return next((c for c in candidates if c['clickable'] and c['visible']), None)
+
+    async def _find_download_element(self, page: Page = None, candidates: list = None):
+        """페이지에서 클릭 가능한 다운로드 요소 찾기"""
+        page = page or self.page
+        if candidates is None:
+            candidates = await self._rank_download_candidates(page)
 
+        best = self._best_clickable(candidates)
+        if not best:
             return None
 
+        try:
+            return await page.query_selector(f'[data-limra-candidate="{best["rank"]}"]')
         except Exception as e:
             return None
 
-    async def download_all_results(self) -> list:
-        """검색된 모든 결과 다운로드"""
-        print(f"\n[PKG] {len(self.search_results)}개 문서 다운로드 시작...")
+    async def _find_pdf_url(self, page: Page = None, candidates: list = None) -> str:
+        """페이지에서 PDF URL 찾기 (링크, iframe, embed/object 포함)"""
+        page = page or self.page
+        if candidates is None:
+            candidates = await self._rank_download_candidates(page)
 
-        downloaded_files = []
+        # 점수 순으로 첫 번째 유효한 PDF URL 반환
+        for candidate in candidates:
+            if candidate['is_pdf'] and candidate['url']:
+                return candidate['url']
 
-        for i, result in enumerate(self.search_results, 1):
-            print(f"\n[{i}/{len(self.search_results)}] {result['title'][:50]}...")
+        return None
 
-            # 파일명 생성
-            safe_title = re.sub(r'[<>:"/\\|?*]', '_', result['title'])[:100]
-            extension = '.pdf' if result['type'] == 'PDF' else '.pdf'
-            filename = f"{safe_title}{extension}"
+    def _result_filename(self, result: dict) -> str:
+        """검색 결과 항목의 저장 파일명 생성 (제목이 없으면 None - URL에서 생성)"""
+        if not result.get('title'):
+            return None
+        safe_title = re.sub(r'[<>:"/\\|?*]', '_', result['title'])[:100]
+        extension = '.pdf' if result.get('type') == 'PDF' else '.pdf'
+        return f"{safe_title}{extension}"
 
-            filepath = await self.download_document(result['url'], filename)
-            if filepath:
-                downloaded_files.append({
-                    'title': result['title'],
-                    'url': result['url'],
-                    'filepath': filepath
-                })
+    async def download_all_results(
+        self,
+        concurrency: int = 3,
+        min_interval: float = 2.0,
+        mode: str = None,
+        prefer_small: bool = None,
+        batch: str = None,
+        capture_mode: str = None
+    ) -> list:
+        """검색된 모든 결과 다운로드 (우선순위 큐, 여러 페이지에서 동시 진행)
 
-            # 요청 간 딜레이
-            await asyncio.sleep(2)
+        search_results를 배치로 큐에 넣고, 큐가 빌 때까지 처리합니다.
+        실행 중에도 download_queue에 항목을 추가/고정/취소하거나 일시정지할 수 있고,
+        다른 프로세스(CLI)는 다운로드 폴더의 inbox 파일로 명령을 보낼 수 있습니다.
+
+        Args:
+            concurrency: 동시에 진행할 다운로드 수 (페이지 수)
+            min_interval: 같은 호스트에 대한 요청 시작 간 최소 간격 (초)
+            mode: 매니페스트 처리 방식 skip / revalidate / force (기본: self.download_mode)
+            prefer_small: True면 예상 크기가 작은 문서부터 (기본: 큐 설정)
+            batch: 배치 이름 (배치 단위 취소용, 기본: 시작 시각)
+            capture_mode: 파일 링크가 없는 문서의 저장 방식 text / mhtml / pdf
+                          (이번 호출에만 적용, 기본: self.capture_mode)
+
+        Returns:
+            다운로드 성공 항목 목록 (큐 추가 순서, 항목별 소요 시간 포함)
+        """
+        queue = self.download_queue
+        if prefer_small is not None:
+            queue.prefer_small = prefer_small
+
+        batch = batch or datetime.now().strftime('batch_%H%M%S')
+        queue.open(batch)
+        first_id = len(queue.items) + 1
+        base_rank = queue.next_rank()
+        for index, result in enumerate(self.search_results):
+            queue.add(
+                result,
+                batch=batch,
+                rank=base_rank + result.get('rank', index),
+                size=self._estimate_size(result['url']),
+                filename=self._result_filename(result),
+            )
+
+        total = queue.pending_count()
+        concurrency = max(1, min(concurrency, total or 1))
+        print(f"\n[PKG] {total}개 문서 다운로드 시작... (동시 {concurrency}개)")
+
+        mode = mode or self.download_mode
+        limiter = HostRateLimiter(min_interval)
+        processed = []
+        started = time.monotonic()
+
+        async def worker(page: Page):
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+
+                # 매니페스트로 건너뛸 문서는 서버에 요청하지 않으므로 간격 제한 불필요
+                skipping = mode == 'skip' and self.manifest.local_path(item['url'], self.download_folder)
+                if not skipping:
+                    await limiter.wait(item['url'])
+                    # 간격 대기 중 취소되었을 수 있음
+                    if item['status'] == 'cancelled':
+                        continue
+
+                finished = await queue.run_item(item, self.download_document(
+                    item['url'], item['filename'] or self._result_filename(item),
+                    page=page, mode=mode, capture_mode=capture_mode
+                ))
+                processed.append(item)
+                if not finished:
+                    continue
 
-        print(f"\n[OK] 총 {len(downloaded_files)}개 파일 다운로드 완료")
+                status = "OK" if item['filepath'] else "FAIL"
+                print(f"[#{item['id']}] [{status}] {item['title'][:50]} ({item['elapsed']:.1f}초, "
+                      f"대기 {queue.pending_count()}개)")
+
+        async def control_loop():
+            # CLI 등 다른 프로세스의 명령을 반영하고 상태 파일 갱신
+            while True:
+                queue.poll_inbox(self.download_folder)
+                queue.save_state(self.download_folder)
+                await asyncio.sleep(1)
+
+        # 첫 작업자는 메인 페이지, 나머지는 전용 페이지 사용
+        pages = [self.page]
+        for _ in range(concurrency - 1):
+            pages.append(await self.context.new_page())
+
+        control = asyncio.create_task(control_loop())
+        try:
+            await asyncio.gather(*(worker(page) for page in pages))
+        finally:
+            queue.close()
+            control.cancel()
+            queue.save_state(self.download_folder)
+            for page in pages[1:]:
+                try:
+                    await page.close()
+                except:
+                    pass
+
+        processed.sort(key=lambda item: item['id'])
+        downloaded_files = [
+            {
+                'title': item['title'],
+                'url': item['url'],
+                'filepath': item['filepath'],
+                'elapsed': item['elapsed']
+            }
+            for item in processed if item['status'] == 'done'
+        ]
+        cancelled = sum(
+            1 for item in queue.items.values()
+            if item['id'] >= first_id and item['status'] == 'cancelled'
+        )
+
+        print(f"\n[OK] 총 {len(downloaded_files)}개 파일 다운로드 완료 "
+              f"({time.monotonic() - started:.1f}초"
+              f"{f', 취소 {cancelled}개' if cancelled else ''})")
+        if self.circuit_breaker.trips:
+            print(f"[WARN] 서킷 브레이커 {self.circuit_breaker.trips}회 작동 - 일부 문서는 요청하지 않음")
         return downloaded_files
 
+    def _emit_queued(self, item: dict):
+        """다운로드 큐에 항목이 추가되면 queued 이벤트 발행"""
+        self.events.emit(QUEUED, item['url'], id=item['id'], title=item['title'],
+                         rank=item['rank'], batch=item['batch'], pinned=item['pinned'] or None)
+
+    def _emit_cancelled(self, item: dict):
+        self.events.emit(FAILED, item['url'], id=item['id'], kind='cancelled')
+
+    def _estimate_size(self, url: str) -> int:
+        """이전 다운로드 기록으로 예상 크기 추정 (모르면 None)"""
+        entry = self.manifest.get(url)
+        return entry.get('size') if entry else None
+
     async def save_results_report(self):
         """검색 결과 리포트 저장"""
         report_path = self.download_folder / f"search_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
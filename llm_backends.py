@@ -0,0 +1,337 @@
+"""
+모델 호출 백엔드
+- gemini: 실제 Gemini API (google.generativeai는 이 백엔드를 만들 때만 import)
+- record: 다른 백엔드 호출을 그대로 하면서 프롬프트/응답/지연 시간을 JSONL로 기록
+- replay: 기록한 JSONL 응답을 재생하거나 스텁 응답 반환 (네트워크/API 키 불필요)
+          지연 시간, 일반 오류, 할당량 초과(429) 오류를 흉내 낼 수 있음
+
+모든 백엔드는 google.generativeai.GenerativeModel과 같은 모양입니다:
+    backend.model_name
+    backend.generate_content(prompt) -> .text를 가진 응답
+    await backend.generate_content_async(prompt, stream=False)
+        -> .text를 가진 응답 (stream=True면 .text를 가진 조각의 async iterable)
+
+환경변수:
+    LIMRA_LLM_BACKEND: gemini(기본) / record / replay
+    LIMRA_LLM_LOG: record가 기록하고 replay가 읽을 JSONL 경로
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+DEFAULT_MODEL = 'gemini-2.0-flash'
+
+BACKEND_ENV = 'LIMRA_LLM_BACKEND'
+LOG_ENV = 'LIMRA_LLM_LOG'
+
+BACKENDS = ('gemini', 'record', 'replay')
+
+# 실제 API를 호출하는 (API 키가 필요한) 백엔드
+API_KEY_BACKENDS = {'gemini', 'record'}
+
+DEFAULT_LOG_NAME = 'llm_log.jsonl'
+
+
+class ModelResponse:
+    """generate_content 응답 흉내 (text만 가짐)"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ResourceExhausted(Exception):
+    """할당량 초과 흉내 (google.api_core.exceptions.ResourceExhausted와 같은 이름)"""
+
+
+class SimulatedBackendError(Exception):
+    """replay 백엔드가 흉내 내는 일반 오류"""
+
+
+class ReplayMissError(LookupError):
+    """replay 기록에 없는 프롬프트"""
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+def selected_backend() -> str:
+    """환경변수로 고른 백엔드 이름 (기본: gemini)"""
+    return (os.environ.get(BACKEND_ENV) or 'gemini').strip().lower()
+
+
+def requires_api_key(name: str) -> bool:
+    return name in API_KEY_BACKENDS
+
+
+class GeminiBackend:
+    """실제 Gemini API"""
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_MODEL):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt: str):
+        return self.model.generate_content(prompt)
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        return await self.model.generate_content_async(prompt, stream=stream)
+
+
+class _RecordedStream:
+    """스트리밍 응답을 그대로 흘려보내면서 끝까지 받으면 기록"""
+
+    def __init__(self, backend, prompt: str, response, started: float):
+        self.backend = backend
+        self.prompt = prompt
+        self.response = response
+        self.started = started
+
+    async def __aiter__(self):
+        parts = []
+        try:
+            async for chunk in self.response:
+                if chunk.text:
+                    parts.append(chunk.text)
+                yield chunk
+        except Exception as e:
+            self.backend._write(self.prompt, None, self.started, error=e)
+            raise
+        self.backend._write(self.prompt, ''.join(parts), self.started)
+
+
+class RecordingBackend:
+    """다른 백엔드를 감싸 프롬프트/응답을 JSONL로 기록 (replay로 재생 가능)
+
+    한 줄: {'time', 'model', 'prompt_hash', 'prompt', 'response', 'latency', 'error'}
+    """
+
+    def __init__(self, inner, path: str):
+        """
+        Args:
+            inner: 실제 호출할 백엔드
+            path: 기록할 JSONL 경로 (이어 쓰기)
+        """
+        self.inner = inner
+        self.model_name = inner.model_name
+        self.path = Path(path)
+        self.records = 0
+        self._lock = threading.Lock()
+
+    def _write(self, prompt: str, response, started: float, error: Exception = None):
+        record = {
+            'time': datetime.now().isoformat(),
+            'model': self.model_name,
+            'prompt_hash': prompt_hash(prompt),
+            'prompt': prompt,
+            'response': response,
+            'latency': round(time.perf_counter() - started, 3),
+            'error': f"{type(error).__name__}: {error}" if error else None,
+        }
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                self.records += 1
+            except OSError as e:
+                print(f"[WARN] 모델 호출 기록 실패: {e}")
+
+    def generate_content(self, prompt: str):
+        started = time.perf_counter()
+        try:
+            response = self.inner.generate_content(prompt)
+        except Exception as e:
+            self._write(prompt, None, started, error=e)
+            raise
+        self._write(prompt, response.text, started)
+        return response
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        started = time.perf_counter()
+        try:
+            response = await self.inner.generate_content_async(prompt, stream=stream)
+        except Exception as e:
+            self._write(prompt, None, started, error=e)
+            raise
+        if stream:
+            return _RecordedStream(self, prompt, response, started)
+        self._write(prompt, response.text, started)
+        return response
+
+
+def stub_response(prompt: str) -> str:
+    """replay 기록이 없을 때 쓰는 기본 스텁 응답"""
+    return f"**제목**: stub\n**핵심 주제**: {len(prompt)}자 문서"
+
+
+class _ReplayStream:
+    """응답을 몇 조각으로 나눠 지연 시간을 나누어 전달"""
+
+    def __init__(self, text: str, delay: float, pieces: int):
+        self.text = text
+        self.delay = delay
+        self.pieces = max(1, pieces)
+
+    async def __aiter__(self):
+        size = max(1, len(self.text) // self.pieces + 1)
+        for i in range(0, len(self.text), size):
+            await asyncio.sleep(self.delay / self.pieces)
+            yield ModelResponse(self.text[i:i + size])
+
+
+class ReplayBackend:
+    """기록 재생 / 스텁 백엔드 (오프라인 벤치마크/회귀 확인용)
+
+    기록에 같은 프롬프트가 여러 번 있으면 마지막 성공 응답을 씁니다.
+    """
+
+    model_name = 'replay'
+
+    def __init__(
+        self,
+        path: str = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        quota_error_rate: float = 0.0,
+        recorded_latency: bool = False,
+        fallback=None,
+        stream_pieces: int = 5,
+        seed: int = None
+    ):
+        """
+        Args:
+            path: record 백엔드가 남긴 JSONL (None이면 모든 프롬프트에 fallback 응답)
+            latency: 요청마다 흉내 낼 지연 시간 (초)
+            jitter: 지연 시간 흔들림 비율 (0.3이면 ±30%)
+            failure_rate: 일반 오류(SimulatedBackendError) 비율 (0~1)
+            quota_error_rate: 할당량 초과(429) 오류 비율 (0~1)
+            recorded_latency: 기록된 지연 시간이 있으면 latency 대신 사용
+            fallback: 기록에 없는 프롬프트의 응답 - 문자열 또는 prompt -> 문자열 함수
+                      (None이면 path가 없을 때만 stub_response, 있을 때는 ReplayMissError)
+            stream_pieces: 스트리밍 응답을 나눌 조각 수
+            seed: 지연/오류 난수 시드 (같은 시드면 같은 순서로 재현)
+        """
+        self.path = Path(path) if path else None
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.quota_error_rate = quota_error_rate
+        self.recorded_latency = recorded_latency
+        self.fallback = fallback if fallback is not None or self.path else stub_response
+        self.stream_pieces = stream_pieces
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.failures = 0
+        self.misses = 0
+        self.records = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    if record.get('error') or record.get('response') is None:
+                        continue
+                    key = record.get('prompt_hash') or prompt_hash(record['prompt'])
+                    self.records[key] = record
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARN] 모델 호출 기록 로드 실패: {e}")
+        print(f"[OK] 모델 응답 기록 {len(self.records)}개 로드: {self.path}")
+
+    def _next(self, prompt: str) -> tuple:
+        """(응답 텍스트, 지연 시간) - 흉내 낸 오류는 지연 시간과 함께 반환"""
+        with self._lock:
+            self.calls += 1
+            roll = self.random.random()
+            delay = self.latency * self.random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        record = self.records.get(prompt_hash(prompt))
+        if record and self.recorded_latency and record.get('latency') is not None:
+            delay = record['latency']
+
+        if roll < self.quota_error_rate:
+            self.failures += 1
+            return ResourceExhausted(
+                "429 Resource has been exhausted (simulated). Please retry in 0.5s"), delay
+        if roll < self.quota_error_rate + self.failure_rate:
+            self.failures += 1
+            return SimulatedBackendError("500 Internal error (simulated)"), delay
+
+        if record:
+            return record['response'], delay
+        if self.fallback is None:
+            self.misses += 1
+            return ReplayMissError(f"기록에 없는 프롬프트: {prompt_hash(prompt)[:12]}"), 0.0
+        text = self.fallback(prompt) if callable(self.fallback) else self.fallback
+        return text, delay
+
+    def generate_content(self, prompt: str):
+        result, delay = self._next(prompt)
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return ModelResponse(result)
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        result, delay = self._next(prompt)
+        if stream and not isinstance(result, Exception):
+            # 첫 조각까지는 짧게, 나머지 지연은 조각마다 나누어 흘려보냄
+            return _ReplayStream(result, delay, self.stream_pieces)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return ModelResponse(result)
+
+
+def create_backend(
+    name: str = None,
+    api_key: str = None,
+    model_name: str = DEFAULT_MODEL,
+    log_path: str = None,
+    **replay_options
+):
+    """
+    이름으로 백엔드 생성
+
+    Args:
+        name: gemini / record / replay (None이면 환경변수 LIMRA_LLM_BACKEND, 기본 gemini)
+        api_key: Google AI API 키 (gemini/record)
+        model_name: Gemini 모델 이름
+        log_path: record/replay JSONL 경로 (None이면 환경변수 LIMRA_LLM_LOG,
+                  record는 기본 llm_log.jsonl)
+        **replay_options: ReplayBackend 옵션 (latency, failure_rate 등)
+
+    Returns:
+        백엔드 객체
+    """
+    name = (name or selected_backend()).lower()
+    log_path = log_path or os.environ.get(LOG_ENV)
+
+    if name == 'gemini':
+        return GeminiBackend(api_key, model_name)
+    if name == 'record':
+        return RecordingBackend(GeminiBackend(api_key, model_name), log_path or DEFAULT_LOG_NAME)
+    if name == 'replay':
+        return ReplayBackend(log_path, **replay_options)
+    raise ValueError(f"알 수 없는 모델 백엔드: {name} (가능: {', '.join(BACKENDS)})")
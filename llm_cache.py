@@ -0,0 +1,187 @@
+"""
+모델 응답 캐시
+- 키: 모델 이름 + 작업 종류 + 프롬프트 템플릿 버전 + 언어 + 입력 해시
+- 항목별 유효 시간(TTL), 최대 항목 수를 넘으면 가장 오래 안 쓴 항목부터 제거(LRU)
+- 적중/실패 카운터
+- 경로를 주면 JSON 파일로 저장하여 재실행 시 재사용
+  (변경마다 바로 쓰지 않고 save_delay초 동안 모아 백그라운드 스레드에서 한 번에 저장,
+   종료 시 남은 변경 저장)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+
+class ResponseCache:
+    """모델 응답 캐시
+
+    항목: key -> {'value', 'created_at', 'expires_at'} (timestamp, expires_at=None이면 만료 없음)
+    저장/삭제/적중(LRU 순서 변경)은 모두 변경으로 표시되어 다음 저장 때 함께 기록됩니다.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_entries: int = 2000,
+        default_ttl: float = 30 * 24 * 3600,
+        readable: bool = True,
+        save_delay: float = 2.0
+    ):
+        """
+        Args:
+            path: 캐시 JSON 경로 (None이면 메모리에만 보관)
+            max_entries: 최대 항목 수 (넘으면 LRU 제거)
+            default_ttl: 기본 유효 시간 (초, None이면 만료 없음)
+            readable: False면 조회는 항상 실패하고 저장만 함
+                      (record 모드 - 모든 프롬프트가 실제로 호출되어 기록되도록)
+            save_delay: 변경 후 파일에 저장하기까지 모으는 시간 (초)
+        """
+        self.path = Path(path) if path else None
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self.readable = readable
+        self.save_delay = save_delay
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saves = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._timer = None
+        self._load()
+        if self.path:
+            atexit.register(self.flush)
+
+    @staticmethod
+    def make_key(model: str, kind: str, version: int, language: str, payload: str) -> str:
+        """캐시 키 생성 (입력은 SHA-256으로 줄임)
+
+        Args:
+            model: 모델 이름
+            kind: 작업 종류 (summary / expand / report ...)
+            version: 프롬프트 템플릿 버전 (템플릿을 바꾸면 올려서 이전 응답 무효화)
+            language: 출력 언어
+            payload: 모델에 보내는 입력 (보통 완성된 프롬프트)
+        """
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return f"{model}|{kind}|v{version}|{language}|{digest}"
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = OrderedDict(json.load(f).get('entries', {}))
+        except Exception as e:
+            print(f"[WARN] 모델 응답 캐시 로드 실패: {e}")
+
+    def _mark_dirty(self):
+        """변경 표시 후 저장 예약 (self._lock 안에서 호출)"""
+        if not self.path:
+            return
+        self._dirty = True
+        if self._timer is None:
+            # 이벤트 루프를 막지 않도록 파일 쓰기는 타이머 스레드에서
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """저장하지 않은 변경이 있으면 지금 파일에 저장"""
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                snapshot = dict(self.entries)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'updated_at': datetime.now().isoformat(),
+                        'entries': snapshot,
+                    }, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self.saves += 1
+            except OSError as e:
+                print(f"[WARN] 모델 응답 캐시 저장 실패: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def get(self, key: str) -> str:
+        """캐시된 응답 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self.entries.get(key) if self.readable else None
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at = entry.get('expires_at')
+            if expires_at is not None and datetime.now().timestamp() > expires_at:
+                del self.entries[key]
+                self._mark_dirty()
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self._mark_dirty()
+            return entry['value']
+
+    def has(self, key: str) -> bool:
+        """만료되지 않은 항목이 있는지 (적중/실패 횟수, LRU 순서는 바꾸지 않음)"""
+        if not self.readable:
+            return False
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            return False
+        expires_at = entry.get('expires_at')
+        return expires_at is None or datetime.now().timestamp() <= expires_at
+
+    def set(self, key: str, value: str, ttl: float = None):
+        """응답 저장
+
+        Args:
+            key: make_key()로 만든 키
+            value: 응답 텍스트
+            ttl: 유효 시간 (초, 기본: default_ttl)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        now = datetime.now().timestamp()
+        with self._lock:
+            self.entries[key] = {
+                'value': value,
+                'created_at': now,
+                'expires_at': now + ttl if ttl is not None else None,
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            self._mark_dirty()
+
+    def forget(self, key: str):
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self._mark_dirty()
+
+    def stats(self) -> dict:
+        """항목 수, 적중/실패/제거/파일 저장 횟수"""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'saves': self.saves,
+        }
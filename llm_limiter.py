@@ -0,0 +1,143 @@
+"""
+모델 호출 동시성 / 분당 요청 수 제한
+- 동시에 진행 중인 요청 수 제한 (세마포어)
+- 최근 1분(window) 동안 시작한 요청 수 제한 (슬라이딩 윈도우)
+- 할당량 초과(429 / ResourceExhausted) 오류 판별 및 서버가 알려준 재시도 대기 시간 추출
+"""
+
+import asyncio
+import contextlib
+import re
+import threading
+import time
+from collections import deque
+
+
+# 할당량 초과로 보는 예외 클래스 이름 (google.api_core.exceptions)
+QUOTA_ERROR_NAMES = {'ResourceExhausted', 'TooManyRequests'}
+
+# 할당량 초과로 보는 오류 메시지 조각
+QUOTA_MARKERS = [
+    '429',
+    'quota',
+    'rate limit',
+    'resource has been exhausted',
+    'resource_exhausted',
+]
+
+RETRY_AFTER_PATTERN = re.compile(r'retry in ([\d.]+)\s*s', re.IGNORECASE)
+
+
+def is_quota_error(error: Exception) -> bool:
+    """모델 호출 할당량 초과 오류인지"""
+    if type(error).__name__ in QUOTA_ERROR_NAMES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in QUOTA_MARKERS)
+
+
+def retry_after(error: Exception) -> float:
+    """오류 메시지의 'Please retry in 12.3s' 대기 시간 (없으면 None)"""
+    match = RETRY_AFTER_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+class ModelRateLimiter:
+    """모델 요청 동시성 + 분당 요청 수 제한
+
+    한도와 요청 기록은 threading.Lock으로 보호하고, 대기는 각 호출자의 이벤트 루프에서
+    future로 하므로 여러 스레드의 이벤트 루프(asyncio.run을 따로 호출하는 요청 등)가
+    같은 인스턴스를 동시에 써도 동시성/분당 요청 수 한도가 함께 적용됩니다.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 5,
+        requests_per_minute: int = 30,
+        window: float = 60.0
+    ):
+        """
+        Args:
+            max_concurrency: 동시에 진행할 최대 요청 수
+            requests_per_minute: window 동안 시작할 수 있는 최대 요청 수 (0/None이면 제한 없음)
+            window: 요청 수를 셀 기간 (초)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.window = window
+        self._starts = deque()
+        self._active = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        future = waiter[1]
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    handed = False
+                except ValueError:
+                    handed = True
+            # 슬롯을 넘겨받은 뒤 취소됨 - future가 취소됐으면 _wake가 반납
+            if handed and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        """슬롯 반납 - 기다리는 요청이 있으면 그 요청의 루프에서 깨워 슬롯을 넘김"""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._wake, future)
+                    return
+                except RuntimeError:
+                    # 닫힌 루프의 대기자는 건너뜀
+                    continue
+            self._active -= 1
+
+    def _wake(self, future):
+        if future.cancelled():
+            self._release()
+        elif not future.done():
+            future.set_result(None)
+
+    async def _wait_rate(self):
+        if not self.requests_per_minute:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= self.window:
+                    self._starts.popleft()
+                if len(self._starts) < self.requests_per_minute:
+                    self._starts.append(now)
+                    return
+                delay = self.window - (now - self._starts[0])
+            await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """요청 하나를 보낼 수 있을 때까지 대기
+
+        사용 예:
+            async with limiter.slot():
+                response = await model.generate_content_async(prompt)
+        """
+        await self._acquire()
+        try:
+            await self._wait_rate()
+            yield
+        finally:
+            self._release()
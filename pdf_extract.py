@@ -0,0 +1,366 @@
+"""
+병렬 PDF 텍스트 추출 엔진
+- 여러 파일과 큰 파일의 페이지 구간을 ProcessPoolExecutor로 분산 (CPU 코어 활용)
+- 페이지 순서 유지, 파일별 오류 반환
+- 배치 API(extract_many)와 비동기 API(extract_many_async)
+- 추출 결과는 파일 내용 해시 기준으로 캐시 (TextCache) - 새로 받은 PDF만 파싱
+- 토큰 예산이 차면 이후 페이지는 추출하지 않음
+
+작업 함수는 모듈 최상위에 있어야 프로세스로 전달(pickle)할 수 있으므로
+이 모듈은 무거운 의존성(google.generativeai 등)을 import하지 않습니다.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from download_store import ContentStore
+from text_compact import estimate_tokens
+
+# PDF 텍스트 추출
+try:
+    import PyPDF2
+    PDF_SUPPORT = True
+except ImportError:
+    PDF_SUPPORT = False
+
+# 추출 결과 형식(페이지 구분, 텍스트 처리)이 바뀌면 올림 - 이전 캐시 항목은 자동 무시
+EXTRACTOR_VERSION = 1
+
+# 토큰 예산 대비 추출할 원문 비율 (머리글/바닥글 등은 압축 단계에서 빠지므로 여유를 둠)
+EXTRACT_SLACK = 1.25
+
+
+def _page_count(path: str) -> int:
+    """PDF 페이지 수 (작업 프로세스에서 실행)"""
+    with open(path, 'rb') as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def _extract_range(path: str, start: int, end: int) -> list:
+    """페이지 구간 [start, end) 텍스트 추출 (작업 프로세스에서 실행)
+
+    Returns:
+        [(페이지 번호(0부터), 텍스트), ...]
+    """
+    pages = []
+    with open(path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        for i in range(start, min(end, len(reader.pages))):
+            pages.append((i, reader.pages[i].extract_text() or ''))
+    return pages
+
+
+def within_budget(pages: list, token_budget: int = None) -> tuple:
+    """앞 페이지부터 추정 토큰이 token_budget * EXTRACT_SLACK에 닿는 페이지까지만 남김
+
+    Args:
+        pages: [(페이지 번호, 텍스트), ...] (페이지 순)
+        token_budget: 토큰 예산 (None이면 모두 남김)
+
+    Returns:
+        (남긴 페이지 목록, 잘렸는지)
+    """
+    if not token_budget:
+        return pages, False
+    limit = token_budget * EXTRACT_SLACK
+    tokens = 0
+    for n, (_, text) in enumerate(pages, 1):
+        tokens += estimate_tokens(text)
+        if tokens >= limit:
+            return pages[:n], n < len(pages)
+    return pages, False
+
+
+def format_pages(pages: list) -> str:
+    """[(페이지 번호, 텍스트)] -> '--- Page N ---' 구분 텍스트 (빈 페이지 제외)"""
+    return "\n\n".join(
+        f"--- Page {i + 1} ---\n{text}" for i, text in sorted(pages) if text
+    )
+
+
+class TextCache:
+    """추출 텍스트 캐시 (파일 내용 해시 + 페이지 범위 + 추출기 버전 키)
+
+    구조:
+        <PDF 폴더>/.store/text/ab/<sha256>-p0-20-v1.json.gz - 압축된 추출 결과
+        <PDF 폴더>/.store/text/hashes.json                  - 경로 -> 크기/수정 시각/해시
+
+    파일 내용이 바뀌면 해시가 달라지므로 따로 무효화할 필요가 없습니다.
+    크기와 수정 시각이 그대로인 파일은 해시를 다시 계산하지 않습니다.
+    """
+
+    CACHE_DIR = Path(ContentStore.STORE_DIR) / 'text'
+    HASH_INDEX_NAME = 'hashes.json'
+
+    def __init__(self):
+        self._hash_indexes = {}  # 캐시 폴더 -> {파일명: {'size', 'mtime_ns', 'sha256'}}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_dir(self, path: Path) -> Path:
+        return path.parent / self.CACHE_DIR
+
+    def _hash_index(self, cache_dir: Path) -> dict:
+        index = self._hash_indexes.get(cache_dir)
+        if index is None:
+            index = {}
+            index_path = cache_dir / self.HASH_INDEX_NAME
+            if index_path.exists():
+                try:
+                    with open(index_path, 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                except Exception as e:
+                    print(f"[WARN] 텍스트 캐시 해시 인덱스 로드 실패: {e}")
+            self._hash_indexes[cache_dir] = index
+        return index
+
+    def _save_hash_index(self, cache_dir: Path):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        index_path = cache_dir / self.HASH_INDEX_NAME
+        tmp_path = index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._hash_indexes[cache_dir], f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, index_path)
+
+    def file_hash(self, path: str) -> str:
+        """파일 SHA-256 (크기/수정 시각이 같으면 인덱스 값 재사용)"""
+        path = Path(path)
+        stat = path.stat()
+        cache_dir = self._cache_dir(path)
+        with self._lock:
+            entry = self._hash_index(cache_dir).get(path.name)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                return entry['sha256']
+
+        sha256 = ContentStore.hash_file(path)
+        with self._lock:
+            self._hash_index(cache_dir)[path.name] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': sha256,
+            }
+            try:
+                self._save_hash_index(cache_dir)
+            except OSError as e:
+                print(f"[WARN] 텍스트 캐시 해시 인덱스 저장 실패: {e}")
+        return sha256
+
+    def _entry_path(self, path: Path, sha256: str, max_pages: int, token_budget: int = None) -> Path:
+        pages = 'all' if max_pages is None else f"0-{max_pages}"
+        budget = f"-t{token_budget}" if token_budget else ''
+        name = f"{sha256}-p{pages}{budget}-v{EXTRACTOR_VERSION}.json.gz"
+        return self._cache_dir(path) / sha256[:2] / name
+
+    def get(self, path: str, max_pages: int = None, token_budget: int = None) -> dict:
+        """캐시된 추출 결과 ({'text', 'pages'}), 없으면 None
+
+        Args:
+            path: PDF 경로
+            max_pages: 추출한 최대 페이지 수 (None이면 전체)
+            token_budget: 추출 시 적용한 토큰 예산 (None이면 없음)
+        """
+        path = Path(path)
+        try:
+            entry_path = self._entry_path(path, self.file_hash(path), max_pages, token_budget)
+            if entry_path.exists():
+                with gzip.open(entry_path, 'rt', encoding='utf-8') as f:
+                    entry = json.load(f)
+                self.hits += 1
+                return entry
+        except Exception as e:
+            print(f"[WARN] 텍스트 캐시 읽기 실패 ({path.name}): {e}")
+        self.misses += 1
+        return None
+
+    def set(self, path: str, max_pages: int, text: str, pages: int, token_budget: int = None):
+        """추출 결과 저장 (실패한 추출은 저장하지 않음)"""
+        path = Path(path)
+        try:
+            entry_path = self._entry_path(path, self.file_hash(path), max_pages, token_budget)
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(entry_path.name + '.tmp')
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'text': text, 'pages': pages}, f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            print(f"[WARN] 텍스트 캐시 저장 실패 ({path.name}): {e}")
+
+
+class PdfExtractor:
+    """프로세스 풀 기반 PDF 텍스트 추출기
+
+    사용 예:
+        with PdfExtractor() as extractor:
+            results = extractor.extract_many(["a.pdf", "b.pdf"])
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        max_pages: int = 20,
+        pages_per_task: int = 8,
+        cache: TextCache = None,
+        token_budget: int = None
+    ):
+        """
+        Args:
+            max_workers: 작업 프로세스 수 (기본: CPU 코어 수)
+            max_pages: 파일당 최대 추출 페이지 수 (None이면 전체)
+            pages_per_task: 작업 하나가 맡을 페이지 수 (이보다 긴 파일은 구간으로 나눔)
+            cache: 추출 텍스트 캐시 (없으면 매번 파싱)
+            token_budget: 파일당 토큰 예산 - 앞 페이지부터 예산이 차면 남은 구간 작업 취소
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pages = max_pages
+        self.pages_per_task = max(1, pages_per_task)
+        self.cache = cache
+        self.token_budget = token_budget
+        self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _ranges(self, page_count: int) -> list:
+        limit = page_count if self.max_pages is None else min(page_count, self.max_pages)
+        return [
+            (start, min(start + self.pages_per_task, limit))
+            for start in range(0, limit, self.pages_per_task)
+        ]
+
+    def extract_many(self, paths: list) -> list:
+        """
+        여러 PDF를 병렬로 추출
+
+        1단계로 파일별 페이지 수를 구하고, 끝나는 파일부터 페이지 구간 작업을
+        풀에 넣으므로 파일 간/파일 내 작업이 함께 분산됩니다.
+        token_budget이 있으면 앞 구간들만으로 예산이 찬 파일은 뒤 구간 작업을 취소합니다.
+
+        Args:
+            paths: PDF 경로 목록
+
+        Returns:
+            입력 순서대로 [{'path', 'text', 'pages', 'error'}, ...]
+            ('pages'는 추출한 페이지 수, 실패한 파일은 text='' / error=메시지,
+             캐시에서 가져온 항목은 'cached': True, 예산 때문에 뒤 페이지를 버렸으면 'truncated': True)
+        """
+        results = [
+            {'path': str(path), 'text': '', 'pages': 0, 'error': None}
+            for path in paths
+        ]
+        if not results:
+            return results
+
+        if not PDF_SUPPORT:
+            for result in results:
+                result['error'] = "PyPDF2가 설치되지 않았습니다."
+            return results
+
+        collected = [[] for _ in results]
+        pending = []
+        for index, result in enumerate(results):
+            if not Path(result['path']).is_file():
+                result['error'] = f"파일 없음: {result['path']}"
+                continue
+            cached = (self.cache.get(result['path'], self.max_pages, self.token_budget)
+                      if self.cache else None)
+            if cached:
+                result['text'] = cached['text']
+                result['pages'] = cached['pages']
+                result['cached'] = True
+                continue
+            pending.append(index)
+
+        if not pending:
+            return results
+
+        pool = self._get_pool()
+        count_futures = {}
+        for index in pending:
+            count_futures[pool.submit(_page_count, results[index]['path'])] = index
+
+        file_ranges = {}   # 파일 index -> 구간 작업 목록 (페이지 순)
+        range_futures = {}
+        for future in as_completed(count_futures):
+            index = count_futures[future]
+            try:
+                page_count = future.result()
+            except Exception as e:
+                results[index]['error'] = f"PDF 읽기 실패: {e}"
+                continue
+            file_ranges[index] = []
+            for start, end in self._ranges(page_count):
+                range_future = pool.submit(_extract_range, results[index]['path'], start, end)
+                file_ranges[index].append(range_future)
+                range_futures[range_future] = index
+
+        budget = self.token_budget * EXTRACT_SLACK if self.token_budget else None
+        kept_ranges = {}   # 파일 index -> 예산이 찬 구간까지의 구간 수
+        for future in as_completed(range_futures):
+            index = range_futures[future]
+            if budget is None or index in kept_ranges:
+                continue
+            # 앞에서부터 끝난 구간들의 토큰 합이 예산에 닿으면 뒤 구간 작업 취소
+            tokens = 0
+            for n, range_future in enumerate(file_ranges[index], 1):
+                if not range_future.done() or range_future.cancelled() or range_future.exception():
+                    break
+                tokens += sum(estimate_tokens(text) for _, text in range_future.result())
+                if tokens >= budget:
+                    kept_ranges[index] = n
+                    for later in file_ranges[index][n:]:
+                        later.cancel()
+                    break
+
+        for index in pending:
+            result = results[index]
+            if result['error']:
+                continue
+            ranges = file_ranges[index][:kept_ranges.get(index, len(file_ranges[index]))]
+            for range_future in ranges:
+                error = range_future.exception()
+                if error:
+                    # 한 구간이라도 실패하면 파일 전체를 오류로 표시 (부분 텍스트는 순서가 어긋날 수 있음)
+                    result['error'] = f"PDF 읽기 실패: {error}"
+                    break
+                collected[index].extend(range_future.result())
+            if result['error']:
+                continue
+
+            pages, truncated = within_budget(sorted(collected[index]), self.token_budget)
+            result['text'] = format_pages(pages)
+            result['pages'] = len(pages)
+            result['truncated'] = truncated or kept_ranges.get(index, len(file_ranges[index])) < len(file_ranges[index])
+            if self.cache:
+                self.cache.set(result['path'], self.max_pages, result['text'], result['pages'],
+                               self.token_budget)
+        return results
+
+    def extract(self, path: str) -> dict:
+        """PDF 하나 추출 (큰 파일은 페이지 구간을 병렬 처리)"""
+        return self.extract_many([path])[0]
+
+    async def extract_many_async(self, paths: list) -> list:
+        """extract_many를 스레드에서 실행 (이벤트 루프 차단 방지)"""
+        return await asyncio.to_thread(self.extract_many, paths)
+
+    async def extract_async(self, path: str) -> dict:
+        return (await self.extract_many_async([path]))[0]
@@ -0,0 +1,285 @@
+"""
+LIMRA Research 라이브러리 크롤러
+- 영속 URL frontier / seen-set 기반 BFS 탐색
+- 깊이 제한, 포함/제외 규칙, 호스트별 동시성 제한
+- 체크포인트 저장 후 재개 가능
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from urllib.parse import urljoin, urlparse, urldefrag
+
+from host_limiter import HostRateLimiter
+
+
+class ResearchCrawler:
+    """Research 섹션 하위 페이지를 예의 바르게(polite) 순회하는 BFS 크롤러
+
+    목록 페이지에서 문서를 추출하는 로직은 에이전트의
+    `_extract_listing_documents`를 그대로 사용하므로, 결과는
+    `browse_research_section`과 같은 형식의 문서 목록입니다.
+    """
+
+    # 크롤링 대상 경로 (이 경로 아래의 페이지만 frontier에 추가)
+    INCLUDE_PATTERNS = [
+        '/en/research/',
+    ]
+
+    # 따라가지 않을 경로 (정적 리소스, 계정/장바구니 등)
+    EXCLUDE_PATTERNS = [
+        '/login',
+        '/logout',
+        '/account',
+        '/cart',
+        '/globalassets/',
+        '.jpg', '.jpeg', '.png', '.gif', '.svg',
+        '.zip', '.mp4', '.mp3',
+    ]
+
+    def __init__(
+        self,
+        agent,
+        state_path: str,
+        max_depth: int = 3,
+        per_host_concurrency: int = 2,
+        delay: float = 1.0,
+        include_patterns: list = None,
+        exclude_patterns: list = None,
+        checkpoint_every: int = 10
+    ):
+        """
+        Args:
+            agent: 로그인된 LimraSearchAgent (context 및 추출 로직 사용)
+            state_path: 체크포인트 JSON 파일 경로
+            max_depth: 시드 기준 최대 링크 깊이
+            per_host_concurrency: 호스트당 동시에 열어둘 페이지 수
+            delay: 같은 호스트에 대한 요청 간 최소 간격 (초)
+            include_patterns: 포함 규칙 (기본: INCLUDE_PATTERNS)
+            exclude_patterns: 추가 제외 규칙 (에이전트 SKIP_PATTERNS에 더해짐)
+            checkpoint_every: 몇 페이지마다 체크포인트를 저장할지
+        """
+        self.agent = agent
+        self.state_path = Path(state_path)
+        self.max_depth = max_depth
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.include_patterns = include_patterns or self.INCLUDE_PATTERNS
+        self.exclude_patterns = (
+            list(agent.SKIP_PATTERNS) + (exclude_patterns or self.EXCLUDE_PATTERNS)
+        )
+        self.checkpoint_every = max(1, checkpoint_every)
+
+        # 크롤링 상태
+        self.frontier = deque()  # (url, depth)
+        self.seen = set()
+        self.documents = []
+        self.pages_crawled = 0
+
+        # 실행 중 상태 (체크포인트 대상 아님)
+        self._in_progress = set()
+        self._host_semaphores = {}
+        self._rate_limiter = HostRateLimiter(delay)
+
+        self._load_state()
+
+    # ------------------------------------------------------------------
+    # 상태 저장/복원
+    # ------------------------------------------------------------------
+
+    def _load_state(self):
+        """체크포인트 파일에서 frontier/seen/문서 목록 복원"""
+        if not self.state_path.exists():
+            return
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+            self.frontier = deque((url, depth) for url, depth in state.get('frontier', []))
+            self.seen = set(state.get('seen', []))
+            self.documents = state.get('documents', [])
+            self.pages_crawled = state.get('pages_crawled', 0)
+            print(f"[CRAWL] 체크포인트 로드됨: 방문 {self.pages_crawled}페이지, "
+                  f"대기 {len(self.frontier)}개, 문서 {len(self.documents)}개")
+        except Exception as e:
+            print(f"[WARN] 크롤러 체크포인트 로드 실패: {e}")
+
+    def save_checkpoint(self):
+        """현재 상태를 체크포인트 파일에 원자적으로 저장"""
+        # 처리 중이던 URL은 다음 실행에서 다시 방문하도록 frontier 앞에 복원
+        frontier = [[url, depth] for url, depth in self._in_progress_items()]
+        frontier += [[url, depth] for url, depth in self.frontier]
+
+        # 같은 문서가 여러 목록 페이지에서 추출되므로 저장 전에 중복 제거
+        self.documents = self.agent._dedupe_documents(self.documents)
+
+        state = {
+            'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'pages_crawled': self.pages_crawled,
+            'frontier': frontier,
+            'seen': sorted(self.seen),
+            'documents': self.documents,
+        }
+
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"[WARN] 크롤러 체크포인트 저장 실패: {e}")
+
+    def reset(self):
+        """저장된 상태를 버리고 처음부터 크롤링"""
+        self.frontier.clear()
+        self.seen.clear()
+        self.documents = []
+        self.pages_crawled = 0
+        if self.state_path.exists():
+            self.state_path.unlink()
+
+    def _in_progress_items(self) -> list:
+        return sorted(self._in_progress)
+
+    # ------------------------------------------------------------------
+    # URL 규칙
+    # ------------------------------------------------------------------
+
+    def normalize_url(self, url: str) -> str:
+        """절대 URL로 변환하고 프래그먼트 제거"""
+        url = urljoin(self.agent.BASE_URL, url.strip())
+        url, _ = urldefrag(url)
+        return url
+
+    def should_follow(self, url: str) -> bool:
+        """frontier에 추가할 수 있는 URL인지 확인 (포함/제외 규칙)"""
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return False
+        if parsed.netloc != urlparse(self.agent.BASE_URL).netloc:
+            return False
+        if self.agent._is_document_link(url):
+            return False
+        if any(pattern in url for pattern in self.exclude_patterns):
+            return False
+        return any(pattern in parsed.path for pattern in self.include_patterns)
+
+    def _enqueue(self, url: str, depth: int):
+        if depth > self.max_depth or url in self.seen:
+            return
+        self.seen.add(url)
+        self.frontier.append((url, depth))
+
+    # ------------------------------------------------------------------
+    # 호스트별 동시성 / 요청 간격
+    # ------------------------------------------------------------------
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_semaphores[host]
+
+    # ------------------------------------------------------------------
+    # 크롤링
+    # ------------------------------------------------------------------
+
+    async def crawl(self, max_pages: int = 200, max_seconds: float = None, seeds: list = None) -> list:
+        """
+        페이지/시간 예산 안에서 BFS 크롤링
+
+        Args:
+            max_pages: 이번 실행에서 방문할 최대 페이지 수
+            max_seconds: 이번 실행의 최대 소요 시간 (None이면 제한 없음)
+            seeds: 시작 URL 목록 (기본: agent.RESEARCH_URLS)
+
+        Returns:
+            중복 제거된 문서 목록 (이전 실행 결과 포함)
+        """
+        print("\n[CRAWL] Research 라이브러리 크롤링 시작...")
+
+        for seed in seeds or self.agent.RESEARCH_URLS:
+            self._enqueue(self.normalize_url(seed), 0)
+
+        started = time.monotonic()
+        budget = {'pages': 0}
+
+        def budget_left() -> bool:
+            if budget['pages'] >= max_pages:
+                return False
+            if max_seconds is not None and time.monotonic() - started >= max_seconds:
+                return False
+            return True
+
+        workers = [
+            asyncio.create_task(self._worker(budget, budget_left))
+            for _ in range(self.per_host_concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            self.save_checkpoint()
+
+        # save_checkpoint()에서 중복 제거됨
+        documents = self.documents
+        print(f"[OK] 크롤링 완료: 이번 실행 {budget['pages']}페이지 방문, "
+              f"남은 frontier {len(self.frontier)}개, 총 {len(documents)}개 문서")
+        return documents
+
+    async def _worker(self, budget: dict, budget_left):
+        """frontier에서 URL을 꺼내 방문하는 작업자 (전용 페이지 사용)"""
+        page = await self.agent.context.new_page()
+        try:
+            while budget_left():
+                if not self.frontier:
+                    # 다른 작업자가 링크를 추가할 수 있으므로 잠시 대기
+                    if not self._in_progress:
+                        return
+                    await asyncio.sleep(0.2)
+                    continue
+
+                url, depth = self.frontier.popleft()
+                self._in_progress.add((url, depth))
+                budget['pages'] += 1
+                try:
+                    await self._visit(page, url, depth)
+                except BaseException:
+                    # 취소 등으로 방문을 끝내지 못한 URL은 체크포인트에 남도록 frontier 앞에 복원
+                    self.frontier.appendleft((url, depth))
+                    raise
+                finally:
+                    self._in_progress.discard((url, depth))
+
+                self.pages_crawled += 1
+                if self.pages_crawled % self.checkpoint_every == 0:
+                    self.save_checkpoint()
+        finally:
+            await page.close()
+
+    async def _visit(self, page, url: str, depth: int):
+        """페이지 하나를 방문하여 문서 추출 및 하위 링크 수집"""
+        host = urlparse(url).netloc
+
+        async with self._host_semaphore(host):
+            await self._rate_limiter.wait(url)
+            try:
+                print(f"  → [d{depth}] {url}")
+                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+
+                self.documents.extend(await self.agent._extract_listing_documents(page))
+
+                hrefs = await page.evaluate(
+                    "() => Array.from(document.querySelectorAll('a[href]'), a => a.href)"
+                )
+            except Exception as e:
+                print(f"  [WARN] 크롤링 오류 ({url}): {e}")
+                return
+
+        for href in hrefs:
+            if not href:
+                continue
+            link = self.normalize_url(href)
+            if self.should_follow(link):
+                self._enqueue(link, depth + 1)
@@ -0,0 +1,176 @@
+"""
+LIMRA 신규 문서 감시 (watch 모드)
+- 로그인된 에이전트 하나를 유지하며 연구 목록/저장된 검색어를 주기적으로 확인
+- 이전 스냅샷과 비교하여 처음 보는 문서만 출력/다운로드
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+class ResearchWatcher:
+    """연구 목록과 저장된 검색어를 주기적으로 확인하는 감시자"""
+
+    def __init__(
+        self,
+        agent,
+        queries: list = None,
+        listing_urls: list = None,
+        snapshot_path: str = None,
+        max_results: int = 20,
+        auto_download: bool = False
+    ):
+        """
+        Args:
+            agent: LimraSearchAgent (initialize 완료 상태)
+            queries: 매 주기마다 확인할 저장된 검색어 목록
+            listing_urls: 확인할 연구 목록 페이지 (기본: agent.RESEARCH_URLS)
+            snapshot_path: 스냅샷 JSON 경로 (기본: 다운로드 폴더/watch_snapshot.json)
+            max_results: 검색어당 확인할 최대 결과 수
+            auto_download: True이면 신규 문서를 바로 다운로드
+        """
+        self.agent = agent
+        self.queries = queries or []
+        self.listing_urls = listing_urls or agent.RESEARCH_URLS
+        self.snapshot_path = Path(snapshot_path or agent.download_folder / "watch_snapshot.json")
+        self.max_results = max_results
+        self.auto_download = auto_download
+
+        # url -> {'title', 'type', 'source', 'first_seen'}
+        self.snapshot = {}
+        self._load_snapshot()
+
+    def _load_snapshot(self):
+        """이전 스냅샷 로드"""
+        if not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                self.snapshot = json.load(f).get('documents', {})
+            print(f"[WATCH] 스냅샷 로드됨: {len(self.snapshot)}개 문서")
+        except Exception as e:
+            print(f"[WARN] 스냅샷 로드 실패: {e}")
+
+    def _save_snapshot(self):
+        """스냅샷을 원자적으로 저장"""
+        tmp_path = self.snapshot_path.with_suffix(self.snapshot_path.suffix + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'updated_at': datetime.now().isoformat(),
+                    'total_documents': len(self.snapshot),
+                    'documents': self.snapshot
+                }, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"[WARN] 스냅샷 저장 실패: {e}")
+
+    async def _fetch_current(self) -> list:
+        """연구 목록 + 저장된 검색어 결과를 가볍게 수집 (페이지당 1회 이동)"""
+        documents = []
+
+        for url in self.listing_urls:
+            for doc in await self.agent.fetch_listing_documents(url):
+                doc['source'] = url
+                documents.append(doc)
+
+        for query in self.queries:
+            for doc in await self.agent.quick_search(query, max_results=self.max_results):
+                doc['source'] = f"query:{query}"
+                documents.append(doc)
+
+        return self.agent._dedupe_documents(documents)
+
+    async def check_once(self, emit_initial: bool = False) -> list:
+        """
+        한 주기 확인: 현재 목록을 가져와 스냅샷에 없는 문서만 반환
+
+        Args:
+            emit_initial: 스냅샷이 비어있는 첫 실행에서도 전체를 신규로 취급할지 여부
+                          (False이면 첫 실행은 기준선만 기록)
+
+        Returns:
+            신규 문서 목록
+        """
+        is_baseline = not self.snapshot and not emit_initial
+
+        current = await self._fetch_current()
+
+        # 세션 만료로 로그인 페이지로 이동된 경우 재로그인 후 한 번 더 시도
+        if 'login' in (self.agent.page.url or '').lower():
+            print("[WATCH] 세션 만료 감지, 재로그인 중...")
+            if await self.agent.login():
+                current = await self._fetch_current()
+
+        now = datetime.now().isoformat()
+        new_docs = []
+        for doc in current:
+            if doc['url'] in self.snapshot:
+                continue
+            self.snapshot[doc['url']] = {
+                'title': doc['title'],
+                'type': doc['type'],
+                'source': doc.get('source', ''),
+                'first_seen': now,
+            }
+            new_docs.append(doc)
+
+        self._save_snapshot()
+
+        if is_baseline:
+            print(f"[WATCH] 기준 스냅샷 기록: {len(new_docs)}개 문서")
+            return []
+
+        return new_docs
+
+    def _emit(self, new_docs: list):
+        """신규 문서 출력 및 JSONL 로그 추가"""
+        if not new_docs:
+            print(f"[WATCH] {datetime.now().strftime('%H:%M:%S')} 신규 문서 없음")
+            return
+
+        print(f"\n[NEW] 신규 문서 {len(new_docs)}개 발견")
+        for i, doc in enumerate(new_docs, 1):
+            print(f"{i}. [{doc['type']}] {doc['title'][:60]}")
+            print(f"   {doc['url']}")
+
+        log_path = self.agent.download_folder / "watch_new_documents.jsonl"
+        with open(log_path, 'a', encoding='utf-8') as f:
+            for doc in new_docs:
+                f.write(json.dumps({'detected_at': datetime.now().isoformat(), **doc},
+                                   ensure_ascii=False) + "\n")
+
+    async def run(self, interval: float = 3600, max_cycles: int = None, emit_initial: bool = False):
+        """
+        interval초 간격으로 계속 확인 (max_cycles가 주어지면 그만큼만 실행)
+
+        Returns:
+            전체 실행 동안 발견된 신규 문서 목록
+        """
+        print(f"[WATCH] 감시 시작: 목록 {len(self.listing_urls)}개, 검색어 {len(self.queries)}개, "
+              f"간격 {interval}초")
+
+        all_new = []
+        cycle = 0
+        while max_cycles is None or cycle < max_cycles:
+            cycle += 1
+            try:
+                new_docs = await self.check_once(emit_initial=emit_initial and cycle == 1)
+                self._emit(new_docs)
+                all_new.extend(new_docs)
+
+                if self.auto_download and new_docs:
+                    self.agent.search_results = new_docs
+                    await self.agent.download_all_results()
+
+            except Exception as e:
+                print(f"[WARN] 감시 주기 {cycle} 오류: {e}")
+
+            if max_cycles is not None and cycle >= max_cycles:
+                break
+            await asyncio.sleep(interval)
+
+        return all_new
@@ -0,0 +1,144 @@
+"""
+다운로드와 요약 겹쳐 진행
+- 다운로드 이벤트 싱크로 연결하여 문서가 저장(saved)되거나 기존 파일로 확인(skipped)되는 즉시
+  텍스트 추출과 요약을 시작
+- 동시에 처리하는 묶음 수를 제한하여, 앞 묶음을 요약하는 동안 도착한 문서는 모아서
+  다음 묶음으로 처리 (작은 문서는 묶음 요약 대상)
+- 다운로드가 끝나면 finish()로 남은 요약을 기다림
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+from ai_helper import PACK_MAX_DOCS
+from download_events import SAVED, SKIPPED
+
+
+class SummaryPipeline:
+    """다운로드 이벤트를 받아 바로 추출/요약하는 소비자
+
+    사용 예:
+        pipeline = SummaryPipeline(ai, language='ko')
+        pipeline.start()
+        agent.events.add_sink(pipeline)
+        await agent.download_all_results()
+        summaries = await pipeline.finish()
+
+    이벤트는 다른 스레드에서도 발행될 수 있으므로 접수는 이벤트 루프로 넘겨 처리합니다.
+    """
+
+    SUFFIXES = ('.pdf', '.md', '.txt')
+
+    def __init__(
+        self,
+        ai,
+        language: str = "ko",
+        max_documents: int = None,
+        max_batch: int = PACK_MAX_DOCS,
+        max_in_flight: int = 1
+    ):
+        """
+        Args:
+            ai: LimraAIHelper
+            language: 요약 출력 언어
+            max_documents: 요약할 최대 문서 수 (None이면 제한 없음)
+            max_batch: 한 번에 모아 요약할 최대 문서 수
+            max_in_flight: 동시에 요약할 최대 묶음 수 (작을수록 문서가 많이 모임)
+        """
+        self.ai = ai
+        self.language = language
+        self.max_documents = max_documents
+        self.max_batch = max(1, max_batch)
+        self.max_in_flight = max(1, max_in_flight)
+        self.batch_sizes = []
+        self.paths = []
+        self.results = {}
+        self.first_summary_after = None
+        self._seen = set()
+        self._loop = None
+        self._queue = None
+        self._consumer = None
+        self._slots = None
+        self._tasks = []
+        self._started = None
+
+    def start(self):
+        """소비자 시작 (이벤트 루프 안에서 호출)"""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._started = time.monotonic()
+        self._consumer = asyncio.create_task(self._consume())
+
+    def __call__(self, event: dict):
+        """다운로드 이벤트 싱크 - saved/skipped 파일을 요약 대기열에 추가"""
+        if event.get('type') not in (SAVED, SKIPPED) or not event.get('filepath'):
+            return
+        self._loop.call_soon_threadsafe(self.submit, event['filepath'])
+
+    def submit(self, filepath: str) -> bool:
+        """문서를 요약 대기열에 추가 (중복, 지원하지 않는 형식, 최대 개수 초과면 무시)
+
+        Returns:
+            추가 여부
+        """
+        path = str(Path(filepath).resolve())
+        if path in self._seen or Path(path).suffix.lower() not in self.SUFFIXES:
+            return False
+        if self.max_documents is not None and len(self.paths) >= self.max_documents:
+            return False
+        self._seen.add(path)
+        self.paths.append(path)
+        self._queue.put_nowait(path)
+        return True
+
+    async def _consume(self):
+        done = False
+        while not done:
+            batch = [await self._queue.get()]
+            # 앞 묶음이 끝나기를 기다리는 동안 도착한 문서는 이번 묶음에 함께 넣음
+            await self._slots.acquire()
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            done = None in batch
+            batch = [path for path in batch if path is not None]
+            if not batch:
+                self._slots.release()
+                continue
+            self.batch_sizes.append(len(batch))
+            task = asyncio.create_task(self._process(batch))
+            task.add_done_callback(lambda _: self._slots.release())
+            self._tasks.append(task)
+
+    async def _process(self, batch: list):
+        try:
+            texts = await self.ai.extract_texts_async(batch)
+            results = await self.ai.summarize_many_async(batch, self.language, texts=texts)
+        except Exception as e:
+            print(f"[ERROR] 요약 실패: {e}")
+            results = [{"error": str(e), "summary": None}] * len(batch)
+
+        if self.first_summary_after is None:
+            self.first_summary_after = time.monotonic() - self._started
+
+        for path, result in zip(batch, results):
+            self.results[path] = result
+            print(f"\n[*] {Path(path).name}")
+            if result.get("summary"):
+                # 요약 내용 일부 출력
+                summary = result["summary"]
+                print(f"    {summary[:200] + '...' if len(summary) > 200 else summary}")
+            else:
+                print(f"[WARN] 요약 실패: {result.get('error')}")
+
+    async def finish(self) -> list:
+        """더 들어올 문서가 없음을 알리고 남은 요약을 기다림
+
+        Returns:
+            접수 순서대로 요약 결과
+        """
+        self._queue.put_nowait(None)
+        await self._consumer
+        await asyncio.gather(*self._tasks)
+        return [self.results[path] for path in self.paths]
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 테스트에서 최상위 모듈(download_retry, limra_search_agent 등)을 import할 수 있도록
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
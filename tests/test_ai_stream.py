@@ -0,0 +1,38 @@
+import asyncio
+
+from ai_helper import LimraAIHelper
+from llm_backends import ReplayBackend
+
+
+def make_helper():
+    model = ReplayBackend(latency=0.05, jitter=0, fallback="요약 결과 텍스트")
+    return LimraAIHelper(model=model, cache_text=False, max_concurrency=1, requests_per_minute=0)
+
+
+def test_slow_stream_consumer_releases_limiter_slot():
+    ai = make_helper()
+
+    async def scenario():
+        stream = ai._generate_stream_async('summary', 'prompt A', 'ko')
+        first = await stream.__anext__()
+        # 첫 조각만 읽고 멈춘 느린 소비자가 있어도 다른 요청이 슬롯을 얻어야 함
+        other = await asyncio.wait_for(ai._generate_async('summary', 'prompt B', 'ko'), timeout=2)
+        rest = [piece async for piece in stream]
+        return first + "".join(rest), other
+
+    streamed, other = asyncio.run(scenario())
+    assert streamed == "요약 결과 텍스트"
+    assert other == "요약 결과 텍스트"
+    assert ai.response_cache.get(ai._response_key('summary', 'prompt A', 'ko')) == streamed
+
+
+def test_abandoned_stream_is_not_cached():
+    ai = make_helper()
+
+    async def scenario():
+        stream = ai._generate_stream_async('summary', 'prompt C', 'ko')
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    assert ai.response_cache.get(ai._response_key('summary', 'prompt C', 'ko')) is None
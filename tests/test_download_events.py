@@ -0,0 +1,39 @@
+import http.server
+import threading
+
+from direct_download import StreamingDownloader
+from download_events import BYTES, QUEUED, DownloadEvents
+
+
+class _FileHandler(http.server.BaseHTTPRequestHandler):
+    body = b'x' * 4096
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_first_chunk_counts_toward_throughput(tmp_path):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _FileHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/doc.pdf'
+    events = DownloadEvents(bytes_interval=0)
+    seen = []
+    events.add_sink(lambda e: seen.append(e['bytes']) if e['type'] == BYTES else None)
+    try:
+        events.emit(QUEUED, url)
+        # 청크 하나로 끝나는 다운로드: 기준점이 0이어야 첫 청크가 처리량에 포함됨
+        StreamingDownloader(chunk_size=len(_FileHandler.body)).download(
+            url, str(tmp_path / 'doc.pdf'), progress=events.progress_callback(url))
+    finally:
+        server.shutdown()
+
+    assert seen == [0, len(_FileHandler.body)]
+    trace = events._traces[url]
+    assert trace['bytes'] - trace['bytes_base'] == len(_FileHandler.body)
@@ -0,0 +1,56 @@
+"""저장 경로 예약/해제 테스트"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('playwright')
+
+from limra_search_agent import LimraSearchAgent  # noqa: E402
+
+
+URL = 'https://www.limra.com/en/research/report.pdf'
+
+
+@pytest.fixture
+def agent(tmp_path):
+    return LimraSearchAgent('user@example.com', 'password', download_folder=str(tmp_path))
+
+
+def test_successful_download_releases_reservation(agent):
+    async def save(url, filepath, page, capture_mode=None):
+        filepath.write_bytes(b'%PDF-1.4')
+        return str(filepath)
+
+    agent._download_attempt = save
+
+    first = asyncio.run(agent.download_document(URL, 'report.pdf', mode='force'))
+    assert not agent._reserved_paths
+    # 같은 이름의 다음 다운로드는 기존 파일만 피해 _1을 받음 (새어 나간 예약 때문에 _2가 되지 않음)
+    (agent.download_folder / 'report.pdf').unlink()
+    second = asyncio.run(agent.download_document(URL, 'report.pdf', mode='force'))
+    assert first == second
+    assert not agent._reserved_paths
+
+
+def test_failed_download_releases_reservation(agent):
+    async def fail(*args, **kwargs):
+        raise RuntimeError('net::ERR_NAME_NOT_RESOLVED')
+
+    agent._download_attempt = fail
+
+    assert asyncio.run(agent.download_document(URL, 'report.pdf', mode='force')) is None
+    assert not agent._reserved_paths
+
+
+def test_retarget_reserves_changed_suffix(agent):
+    filepath = agent._reserve_filepath(URL, 'report.pdf')
+    (agent.download_folder / 'report.docx').write_bytes(b'old')
+
+    assert agent._retarget(filepath, '.pdf') == filepath
+    assert agent._retarget(filepath, '') == filepath
+    target = agent._retarget(filepath, '.docx')
+    # 기존 파일을 덮어쓰지 않고, 다른 작업자와 겹치지 않도록 예약
+    assert target.name == 'report_1.docx'
+    assert target in agent._reserved_paths
+    assert agent._retarget(filepath, '.docx').name == 'report_2.docx'
@@ -0,0 +1,82 @@
+"""다운로드 큐 - 실행 중 추가, 배치 종료, 순위 테스트"""
+
+import asyncio
+
+import pytest
+
+from download_queue import DownloadQueue, QueueClosedError
+
+
+def docs(prefix: str, count: int) -> list:
+    return [{'url': f'https://example.com/{prefix}{i}.pdf', 'title': f'{prefix}{i}'} for i in range(count)]
+
+
+async def run_batch(queue: DownloadQueue, workers: int, on_start=None, duration: float = 0.05) -> list:
+    """작업자 workers개로 큐를 비울 때까지 처리 - 처리 순서대로 URL 목록"""
+    processed = []
+
+    async def download(item):
+        if on_start:
+            on_start(item)
+        await asyncio.sleep(duration)
+        return item['url']
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            await queue.run_item(item, download(item))
+            processed.append(item['url'])
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return processed
+
+
+def test_items_added_while_running_are_processed():
+    async def scenario():
+        queue = DownloadQueue()
+        queue.open('batch_a')
+        queue.add_many(docs('a', 1))
+
+        added = []
+        peak = []
+
+        def on_start(item):
+            # 첫 항목이 실행 중일 때(다른 작업자는 대기 중) 항목 추가
+            if not added:
+                added.extend(queue.add_many(docs('b', 3)))
+            peak.append(queue.running_count())
+
+        processed = await run_batch(queue, workers=3, on_start=on_start)
+        return queue, processed, max(peak)
+
+    queue, processed, peak = asyncio.run(scenario())
+    assert len(processed) == 4
+    # 대기하던 작업자도 추가된 항목을 받아 동시에 진행
+    assert peak == 3
+    assert {item['batch'] for item in queue.items.values()} == {'batch_a'}
+    assert queue.closed
+
+
+def test_closed_queue_rejects_adds_until_reopened():
+    async def scenario():
+        queue = DownloadQueue()
+        queue.open('batch_a')
+        queue.add_many(docs('a', 2))
+        await run_batch(queue, workers=2)
+        return queue
+
+    queue = asyncio.run(scenario())
+    with pytest.raises(QueueClosedError):
+        queue.add_many(docs('b', 1))
+    queue.open('batch_b')
+    assert queue.add_many(docs('b', 1))
+
+
+def test_ranks_continue_from_current_max():
+    queue = DownloadQueue()
+    queue.add_many(docs('a', 3))
+    queue.add_many(docs('b', 2))
+    assert [item['rank'] for item in queue.items.values()] == [0, 1, 2, 3, 4]
+    assert queue.next_rank() == 5
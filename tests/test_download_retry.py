@@ -0,0 +1,69 @@
+"""서킷 브레이커 시험 요청(half-open) 해제 테스트"""
+
+import asyncio
+
+import pytest
+
+from download_retry import AUTH, CircuitBreaker, DownloadFailure
+
+
+URL = 'https://www.limra.com/en/research/report.pdf'
+
+
+def half_open_breaker() -> CircuitBreaker:
+    """실패로 열린 뒤 바로 half-open이 되는 서킷"""
+    breaker = CircuitBreaker(min_failures=2, cooldown=0)
+    for _ in range(2):
+        breaker.record(URL, False)
+    assert breaker.state(URL) == 'half_open'
+    return breaker
+
+
+def test_half_open_allows_single_probe_until_released():
+    breaker = half_open_breaker()
+    assert breaker.allow(URL)
+    assert not breaker.allow(URL)
+    breaker.release(URL)
+    assert breaker.allow(URL)
+
+
+def test_recorded_probe_failure_reopens():
+    breaker = half_open_breaker()
+    assert breaker.allow(URL)
+    breaker.record(URL, False)
+    assert breaker.allow(URL)  # cooldown=0 이므로 다시 half-open
+
+
+@pytest.fixture
+def agent(tmp_path):
+    pytest.importorskip('playwright')
+    from limra_search_agent import LimraSearchAgent
+
+    agent = LimraSearchAgent('user@example.com', 'password', download_folder=str(tmp_path))
+    agent.circuit_breaker = half_open_breaker()
+    return agent
+
+
+def test_auth_failure_releases_probe(agent):
+    async def auth_failure(*args, **kwargs):
+        raise DownloadFailure('로그인 페이지로 리다이렉트', AUTH)
+
+    async def reauthenticate(*args, **kwargs):
+        return False
+
+    agent._download_attempt = auth_failure
+    agent._reauthenticate = reauthenticate
+
+    assert asyncio.run(agent.download_document(URL, mode='force')) is None
+    assert agent.circuit_breaker.allow(URL)
+
+
+def test_cancelled_download_releases_probe(agent):
+    async def cancelled(*args, **kwargs):
+        raise asyncio.CancelledError()
+
+    agent._download_attempt = cancelled
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(agent.download_document(URL, mode='force'))
+    assert agent.circuit_breaker.allow(URL)
@@ -0,0 +1,70 @@
+"""
+긴 문서 텍스트 분할
+- 페이지 구분('--- Page N ---') 또는 마크다운 제목 경계로 구간을 나눔
+- 구간을 순서대로 묶어 최대 글자 수 이하의 청크 생성 (구간 하나가 너무 길면 문단 단위로 나눔)
+"""
+
+import re
+
+
+PAGE_MARKER = re.compile(r'^--- Page \d+ ---$', re.MULTILINE)
+HEADING = re.compile(r'^#{1,3} ', re.MULTILINE)
+
+
+def _split_at(text: str, pattern: re.Pattern) -> list:
+    starts = [m.start() for m in pattern.finditer(text)]
+    if not starts:
+        return [text]
+    if starts[0] != 0:
+        starts.insert(0, 0)
+    return [text[a:b] for a, b in zip(starts, starts[1:] + [len(text)])]
+
+
+def split_sections(text: str) -> list:
+    """페이지 구분(PDF 추출 텍스트) 또는 마크다운 제목(페이지 캡처) 단위 구간 목록"""
+    if PAGE_MARKER.search(text):
+        sections = _split_at(text, PAGE_MARKER)
+    else:
+        sections = _split_at(text, HEADING)
+    return [section.strip() for section in sections if section.strip()]
+
+
+def _split_long(section: str, max_chars: int) -> list:
+    """max_chars보다 긴 구간을 문단 -> 줄 -> 글자 단위 순으로 나눔"""
+    if len(section) <= max_chars:
+        return [section]
+    for separator in ('\n\n', '\n'):
+        parts = section.split(separator)
+        if len(parts) > 1:
+            return _pack([p for part in parts for p in _split_long(part, max_chars)],
+                         max_chars, separator)
+    return [section[i:i + max_chars] for i in range(0, len(section), max_chars)]
+
+
+def _pack(parts: list, max_chars: int, separator: str) -> list:
+    chunks = []
+    current = ''
+    for part in parts:
+        if current and len(current) + len(separator) + len(part) > max_chars:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current}{separator}{part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_text(text: str, max_chars: int = 20000) -> list:
+    """
+    텍스트를 구간 경계에 맞춰 max_chars 이하 청크로 묶음
+
+    Args:
+        text: 문서 텍스트
+        max_chars: 청크 최대 글자 수
+
+    Returns:
+        순서를 유지한 청크 목록
+    """
+    parts = [p for section in split_sections(text) for p in _split_long(section, max_chars)]
+    return _pack(parts, max_chars, '\n\n')
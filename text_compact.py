@@ -0,0 +1,161 @@
+"""
+프롬프트용 문서 텍스트 압축
+- 여러 페이지 위/아래에 반복되는 머리글/바닥글/법적 고지 줄 제거 (페이지 번호만 다른 줄 포함)
+- 줄 끝 하이픈 연결 복원, 공백/빈 줄 정리
+- 남은 페이지 앞에는 '--- Page N ---' 구분을 유지 (청크 분할이 페이지 경계를 쓸 수 있도록)
+- 토큰 수를 추정하여 예산이 차면 이후 페이지는 버림
+"""
+
+import math
+import re
+from collections import Counter
+
+from text_chunks import PAGE_MARKER
+
+
+# 반복 줄로 보는 최소 페이지 비율과 최소 페이지 수
+REPEAT_RATIO = 0.5
+REPEAT_MIN_PAGES = 3
+
+# 반복 줄 후보로 보는 최대 줄 길이 (긴 본문 문장은 제외)
+REPEAT_MAX_LINE = 160
+
+# 머리글/바닥글로 보는 페이지 위/아래 줄 수 (빈 줄 제외)
+EDGE_LINES = 2
+
+# 숫자만 다른 줄도 같은 줄로 볼 최대 길이 ('Page 3 of 40' 같은 쪽 번호 줄)
+NUMBERED_MAX_LINE = 40
+
+HYPHEN_BREAK = re.compile(r'(?<=[A-Za-z])-\n(?=[a-z])')
+SPACES = re.compile(r'[ \t ]+')
+BLANK_LINES = re.compile(r'\n{3,}')
+DIGITS = re.compile(r'\d+')
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (ASCII는 약 4자당 1토큰, 그 외 문자는 1자당 1토큰)"""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return math.ceil((len(text) - non_ascii) / 4) + non_ascii
+
+
+def _line_key(line: str) -> str:
+    """반복 판별용 키 - 짧은 줄은 페이지 번호 등 숫자만 달라도 같은 줄로 봄"""
+    key = SPACES.sub(' ', line).strip().lower()
+    if len(key) <= NUMBERED_MAX_LINE:
+        key = DIGITS.sub('#', key)
+    return key
+
+
+def split_marked_pages(text: str) -> list:
+    """'--- Page N ---' 구분 텍스트 -> [(구분 줄 또는 None, 페이지 본문)] (빈 페이지 제외)"""
+    markers = [None] + PAGE_MARKER.findall(text)
+    parts = PAGE_MARKER.split(text)
+    return [(marker, part.strip('\n')) for marker, part in zip(markers, parts) if part.strip()]
+
+
+def split_pages(text: str) -> list:
+    """'--- Page N ---' 구분 텍스트 -> 페이지 본문 목록 (구분이 없으면 전체가 한 페이지)"""
+    return [page for _, page in split_marked_pages(text)]
+
+
+def _edge_indices(lines: list) -> set:
+    """페이지 위/아래 EDGE_LINES개 (빈 줄 제외) 줄 번호
+
+    본문이 남지 않을 만큼 짧은 페이지는 머리글/바닥글이 없는 것으로 봄
+    """
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    if len(filled) <= EDGE_LINES * 2:
+        return set()
+    return set(filled[:EDGE_LINES] + filled[-EDGE_LINES:])
+
+
+def find_repeated_lines(pages: list) -> set:
+    """여러 페이지의 위/아래에 반복되는 짧은 줄의 키 집합 (머리글/바닥글/고지문)"""
+    if len(pages) < REPEAT_MIN_PAGES:
+        return set()
+    counts = Counter()
+    for page in pages:
+        lines = page.splitlines()
+        keys = {_line_key(lines[i]) for i in _edge_indices(lines)}
+        counts.update(key for key in keys if key and len(key) <= REPEAT_MAX_LINE)
+    threshold = max(REPEAT_MIN_PAGES, math.ceil(len(pages) * REPEAT_RATIO))
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def _clean(page: str, repeated: set) -> tuple:
+    lines = page.splitlines()
+    edges = _edge_indices(lines) if repeated else set()
+    kept = [line for i, line in enumerate(lines) if i not in edges or _line_key(line) not in repeated]
+    text = HYPHEN_BREAK.sub('', '\n'.join(kept))
+    text = '\n'.join(SPACES.sub(' ', line).strip() for line in text.split('\n'))
+    return BLANK_LINES.sub('\n\n', text).strip(), len(lines) - len(kept)
+
+
+def compact_pages(pages: list, token_budget: int = None, markers: list = None) -> tuple:
+    """
+    페이지 본문 목록을 압축하여 하나의 텍스트로 합침
+
+    Args:
+        pages: 페이지 본문 목록 (순서대로)
+        token_budget: 최대 토큰 수 (None이면 제한 없음, 구분 줄 포함)
+        markers: 페이지마다 앞에 붙일 구분 줄 ('--- Page N ---', 없으면 None)
+
+    Returns:
+        (압축된 텍스트, 통계 {'pages', 'pages_used', 'removed_lines', 'tokens', 'truncated'})
+    """
+    repeated = find_repeated_lines(pages)
+    parts = []
+    tokens = 0
+    removed = 0
+    truncated = False
+
+    for page, marker in zip(pages, markers or [None] * len(pages)):
+        text, removed_lines = _clean(page, repeated)
+        removed += removed_lines
+        if not text:
+            continue
+        header = f"{marker}\n" if marker else ''
+        page_tokens = estimate_tokens(header + text)
+        if token_budget is not None and tokens + page_tokens > token_budget:
+            truncated = True
+            if not parts:
+                # 첫 페이지부터 예산 초과 - 예산에 맞춰 문단 경계에서 자름
+                parts.append(header + _cut(text, max(1, token_budget - estimate_tokens(header))))
+                tokens = estimate_tokens(parts[0])
+            break
+        parts.append(header + text)
+        tokens += page_tokens
+
+    stats = {
+        'pages': len(pages),
+        'pages_used': len(parts),
+        'removed_lines': removed,
+        'tokens': tokens,
+        'truncated': truncated,
+    }
+    return '\n\n'.join(parts), stats
+
+
+def _cut(text: str, token_budget: int) -> str:
+    kept = []
+    tokens = 0
+    for paragraph in text.split('\n\n'):
+        paragraph_tokens = estimate_tokens(paragraph)
+        if tokens + paragraph_tokens > token_budget:
+            break
+        kept.append(paragraph)
+        tokens += paragraph_tokens
+    if kept:
+        return '\n\n'.join(kept)
+    # 문단 하나가 예산보다 큼 - 글자 수로 자름 (ASCII 기준 근사)
+    return text[:token_budget * 4]
+
+
+def compact_text(text: str, token_budget: int = None) -> tuple:
+    """추출 텍스트('--- Page N ---' 구분 또는 캡처 텍스트) 압축 - 페이지 구분 줄은 유지
+
+    Returns:
+        (압축된 텍스트, 통계)
+    """
+    marked = split_marked_pages(text)
+    return compact_pages([page for _, page in marked], token_budget, [marker for marker, _ in marked])
@@ -6,10 +6,15 @@ Flask 기반 웹 UI
 import asyncio
 import json
 import os
+import queue
 import threading
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory
+from download_events import JsonlSink, StreamSink
+from download_queue import QueueClosedError
+from download_store import DownloadManifest
+from zip_export import iter_zip, select_batch, select_manifest, select_names
 from limra_search_agent import LimraSearchAgent
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
@@ -22,13 +27,23 @@ agent_status = {
     'message': '',
     'progress': '',
     'results': [],
-    'is_running': False
+    'is_running': False,
+    'downloading': False
 }
 
 # 설정
 DOWNLOAD_FOLDER = "./limra_downloads"
 Path(DOWNLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
 
+# 다운로드 진행 이벤트: 웹 스트림(SSE) + JSONL 기록
+event_stream = StreamSink()
+event_log = JsonlSink(Path(DOWNLOAD_FOLDER) / "download_events.jsonl")
+
+# AI 요약/리포트 (처음 요청할 때 생성)
+ai_helper = None
+ai_helper_lock = threading.Lock()
+ai_loop = None  # AI 스트림 전용 이벤트 루프 (백그라운드 스레드에서 계속 실행)
+
 
 def get_or_create_loop():
     """에이전트 전용 이벤트 루프 가져오기 또는 생성"""
@@ -45,6 +60,86 @@ def run_async(coro):
     return loop.run_until_complete(coro)
 
 
+def call_on_agent_loop(func, *args, **kwargs):
+    """큐 조작 등 동기 함수를 에이전트 루프 스레드에서 실행
+
+    다운로드 배치가 진행 중이면 다른 요청 스레드에서 실행 중인 루프로 넘기고,
+    아니면 바로 호출합니다.
+    """
+    loop = agent_loop
+    if loop and loop.is_running():
+        async def call():
+            return func(*args, **kwargs)
+        return asyncio.run_coroutine_threadsafe(call(), loop).result(timeout=10)
+    return func(*args, **kwargs)
+
+
+def get_ai_helper():
+    """AI 도우미 (gemini 백엔드는 GOOGLE_API_KEY 필요, google.generativeai는 AI 기능을 쓸 때만 import)"""
+    global ai_helper
+    with ai_helper_lock:
+        if ai_helper is None:
+            from ai_helper import LimraAIHelper
+            ai_helper = LimraAIHelper(cache_dir=DOWNLOAD_FOLDER)
+        return ai_helper
+
+
+def get_ai_loop():
+    """AI 스트림 전용 이벤트 루프 - 모든 요청이 같은 루프에서 ai_helper(limiter 등)를 공유"""
+    global ai_loop
+    with ai_helper_lock:
+        if ai_loop is None or ai_loop.is_closed():
+            ai_loop = asyncio.new_event_loop()
+            threading.Thread(target=ai_loop.run_forever, name='ai-loop', daemon=True).start()
+        return ai_loop
+
+
+def stream_text(make_stream):
+    """비동기 텍스트 스트림을 AI 전용 이벤트 루프에서 실행하여 SSE로 전달
+
+    클라이언트 연결이 끊기면 스트림을 취소합니다.
+
+    이벤트: {'type': 'text', 'text'} 조각, 끝나면 {'type': 'done', 'text': 전체},
+            실패 시 {'type': 'error', 'message'}
+
+    Args:
+        make_stream: 텍스트 조각을 yield하는 async generator를 만드는 함수
+    """
+    events = queue.Queue()
+
+    async def consume():
+        parts = []
+        try:
+            async for piece in make_stream():
+                parts.append(piece)
+                events.put({'type': 'text', 'text': piece})
+            events.put({'type': 'done', 'text': ''.join(parts)})
+        except Exception as e:
+            events.put({'type': 'error', 'message': str(e)})
+        finally:
+            events.put(None)
+
+    future = asyncio.run_coroutine_threadsafe(consume(), get_ai_loop())
+
+    def generate():
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    return
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            future.cancel()
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def sse_error(message: str) -> Response:
+    return Response(f"data: {json.dumps({'type': 'error', 'message': message}, ensure_ascii=False)}\n\n",
+                    mimetype='text/event-stream')
+
+
 @app.route('/')
 def index():
     """메인 페이지"""
@@ -72,6 +167,8 @@ def api_login():
                 download_folder=DOWNLOAD_FOLDER,
                 headless=False  # 브라우저 표시 (CAPTCHA 대응)
             )
+            agent.events.add_sink(event_stream)
+            agent.events.add_sink(event_log)
             await agent.initialize()
             success = await agent.login()
             return success
@@ -161,6 +258,21 @@ def api_download():
 
     data = request.json
     documents = data.get('documents', [])
+    mode = data.get('mode', 'skip')  # skip / revalidate / force
+    if mode not in DownloadManifest.MODES:
+        return jsonify({
+            'success': False,
+            'message': f"잘못된 mode 값: {mode} (가능: {', '.join(DownloadManifest.MODES)})"
+        }), 400
+    pinned = bool(data.get('pinned', False))
+    prefer_small = data.get('prefer_small')
+    capture_mode = data.get('capture_mode')  # text / mhtml / pdf (파일 링크가 없는 문서)
+    if capture_mode is not None and capture_mode not in LimraSearchAgent.CAPTURE_MODES:
+        return jsonify({
+            'success': False,
+            'message': f"잘못된 capture_mode 값: {capture_mode} "
+                       f"(가능: {', '.join(LimraSearchAgent.CAPTURE_MODES)})"
+        }), 400
 
     if not documents:
         documents = agent_status['results']
@@ -168,13 +280,32 @@ def api_download():
     if not documents:
         return jsonify({'success': False, 'message': '다운로드할 문서가 없습니다.'})
 
+    # 이미 배치가 진행 중이면 새로 시작하지 않고 실행 중인 큐에 추가
+    if agent_status['downloading']:
+        # 진행 중인 배치 이름으로 추가해야 배치 ZIP에 포함됨
+        queue = agent.download_queue
+        try:
+            ids = call_on_agent_loop(queue.add_many, documents, batch=queue.batch, pinned=pinned)
+        except QueueClosedError as e:
+            return jsonify({'success': False, 'message': f'{e}. 잠시 후 다시 시도하세요.'}), 409
+        return jsonify({
+            'success': True,
+            'queued': True,
+            'message': f'{len(ids)}개 문서를 진행 중인 다운로드 큐에 추가했습니다.',
+            'ids': ids
+        })
+
+    batch = datetime.now().strftime('batch_%Y%m%d_%H%M%S')
     agent_status['is_running'] = True
+    agent_status['downloading'] = True
     agent_status['message'] = f'{len(documents)}개 문서 다운로드 중...'
 
     try:
         async def do_download():
             agent.search_results = documents
-            downloaded = await agent.download_all_results()
+            downloaded = await agent.download_all_results(
+                mode=mode, prefer_small=prefer_small, batch=batch, capture_mode=capture_mode
+            )
             return downloaded
 
         downloaded = run_async(do_download())
@@ -184,7 +315,9 @@ def api_download():
         return jsonify({
             'success': True,
             'message': f'{len(downloaded)}개 파일 다운로드 완료',
-            'downloaded': downloaded
+            'downloaded': downloaded,
+            'batch': batch,
+            'zip_url': f'/api/export.zip?batch={batch}'
         })
 
     except Exception as e:
@@ -192,9 +325,72 @@ def api_download():
         return jsonify({'success': False, 'message': str(e)})
 
     finally:
+        agent_status['downloading'] = False
         agent_status['is_running'] = False
 
 
+@app.route('/api/download/events')
+def api_download_events():
+    """다운로드 진행 이벤트 스트림 (Server-Sent Events)"""
+    subscriber = event_stream.subscribe()
+
+    def generate():
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=15)
+                except queue.Empty:
+                    # 연결 유지용 주석 (프록시 타임아웃 방지)
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            event_stream.unsubscribe(subscriber)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/queue')
+def api_queue():
+    """다운로드 큐 상태 API"""
+    if not agent:
+        return jsonify({'paused': False, 'items': []})
+
+    items = call_on_agent_loop(agent.download_queue.snapshot)
+    return jsonify({'paused': agent.download_queue.paused, 'items': items})
+
+
+@app.route('/api/queue/<action>', methods=['POST'])
+def api_queue_action(action):
+    """다운로드 큐 제어 API (pin / unpin / cancel / cancel_batch / pause / resume)"""
+    if not agent:
+        return jsonify({'success': False, 'message': '먼저 로그인하세요.'})
+
+    data = request.json or {}
+    queue = agent.download_queue
+
+    if action in ('pin', 'unpin', 'cancel'):
+        item_id = data.get('id')
+        if item_id is None:
+            return jsonify({'success': False, 'message': '항목 id가 필요합니다.'})
+        if action == 'cancel':
+            ok = call_on_agent_loop(queue.cancel, int(item_id))
+        else:
+            ok = call_on_agent_loop(queue.pin, int(item_id), action == 'pin')
+        return jsonify({'success': ok})
+
+    if action == 'cancel_batch':
+        count = call_on_agent_loop(queue.cancel_batch, data.get('batch'))
+        return jsonify({'success': True, 'message': f'{count}개 항목 취소'})
+
+    if action in ('pause', 'resume'):
+        call_on_agent_loop(getattr(queue, action))
+        return jsonify({'success': True, 'paused': queue.paused})
+
+    return jsonify({'success': False, 'message': f'알 수 없는 명령: {action}'}), 400
+
+
 @app.route('/api/status')
 def api_status():
     """상태 확인 API"""
@@ -232,6 +428,80 @@ def download_file(filename):
     return send_from_directory(DOWNLOAD_FOLDER, filename)
 
 
+@app.route('/api/export.zip', methods=['GET', 'POST'])
+def api_export_zip():
+    """다운로드 묶음을 ZIP으로 스트리밍 (임시 아카이브 없이 즉석 생성)
+
+    GET  ?batch=<배치 이름>  - 해당 다운로드 배치의 완료 파일
+    GET  ?since=<ISO 시각>   - 매니페스트에서 그 이후 다운로드된 파일
+    GET  (인자 없음)         - 매니페스트의 모든 파일
+    POST {"names": [...]} 또는 {"urls": [...]} - 파일명/문서 URL 선택
+    """
+    data = request.get_json(silent=True) or {}
+    batch = request.args.get('batch')
+
+    if data.get('names'):
+        files = select_names(DOWNLOAD_FOLDER, data['names'])
+        label = 'selection'
+    elif batch:
+        items = call_on_agent_loop(agent.download_queue.snapshot) if agent else None
+        files = select_batch(DOWNLOAD_FOLDER, batch, items)
+        label = batch
+    else:
+        manifest = agent.manifest if agent else DownloadManifest(
+            Path(DOWNLOAD_FOLDER) / "download_manifest.json"
+        )
+        try:
+            files = select_manifest(manifest, DOWNLOAD_FOLDER,
+                                    urls=data.get('urls'), since=request.args.get('since'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': f'잘못된 since 값: {e}'}), 400
+        label = 'manifest'
+
+    if not files:
+        return jsonify({'success': False, 'message': '내보낼 파일이 없습니다.'}), 404
+
+    filename = f"limra_{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return Response(
+        iter_zip(files),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@app.route('/api/ai/summarize/stream')
+def api_ai_summarize_stream():
+    """다운로드된 파일 AI 요약 스트림 (SSE) - ?file=<파일명>&language=ko"""
+    path = Path(DOWNLOAD_FOLDER) / Path(request.args.get('file', '')).name
+    if not path.is_file():
+        return sse_error('파일을 찾을 수 없습니다.')
+    language = request.args.get('language', 'ko')
+
+    try:
+        ai = get_ai_helper()
+    except Exception as e:
+        return sse_error(f'AI 초기화 실패: {e}')
+
+    return stream_text(lambda: ai.summarize_pdf_stream(str(path), language))
+
+
+@app.route('/api/ai/report/stream')
+def api_ai_report_stream():
+    """최근 검색 결과 종합 리포트 스트림 (SSE) - ?keyword=...&language=ko"""
+    documents = agent_status['results']
+    if not documents:
+        return sse_error('먼저 검색하세요.')
+    keyword = request.args.get('keyword') or 'LIMRA research'
+    language = request.args.get('language', 'ko')
+
+    try:
+        ai = get_ai_helper()
+    except Exception as e:
+        return sse_error(f'AI 초기화 실패: {e}')
+
+    return stream_text(lambda: ai.generate_report_stream(documents, keyword, language))
+
+
 @app.route('/api/files')
 def list_files():
     """다운로드된 파일 목록"""
@@ -0,0 +1,203 @@
+"""
+다운로드 묶음 ZIP 스트리밍 내보내기
+- 임시 아카이브를 메모리/디스크에 만들지 않고 청크 단위로 ZIP 생성
+- 이미 압축된 PDF 등은 저장(stored) 방식, 텍스트 캡처는 deflate
+- 배치(다운로드 큐) 또는 매니페스트 선택으로 파일 목록 구성
+"""
+
+import json
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from download_queue import DownloadQueue
+
+
+# 이미 압축된 형식 - 다시 압축해도 크기가 거의 줄지 않으므로 stored로 저장
+STORED_EXTENSIONS = {
+    '.pdf', '.zip', '.docx', '.xlsx', '.pptx',
+    '.png', '.jpg', '.jpeg', '.gif', '.mp4', '.mp3',
+}
+
+CHUNK_SIZE = 256 * 1024
+
+
+class _ChunkSink:
+    """ZipFile이 기록하는 바이트를 모아 두었다가 제너레이터가 꺼내 가는 쓰기 전용 버퍼
+
+    seek/tell을 지원하지 않으므로 ZipFile은 스트리밍 모드(data descriptor)로 동작합니다.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _unique_arcnames(files: list) -> list:
+    """(arcname, path) 목록에서 같은 파일 중복 제거 및 이름 충돌 시 번호 부여"""
+    seen_paths = set()
+    used_names = set()
+    result = []
+    for arcname, path in files:
+        resolved = Path(path).resolve()
+        if resolved in seen_paths:
+            continue
+        seen_paths.add(resolved)
+
+        name = arcname
+        stem, suffix = Path(arcname).stem, Path(arcname).suffix
+        counter = 1
+        while name in used_names:
+            name = f"{stem}_{counter}{suffix}"
+            counter += 1
+        used_names.add(name)
+        result.append((name, path))
+    return result
+
+
+def iter_zip(files: list, chunk_size: int = CHUNK_SIZE):
+    """
+    ZIP 아카이브를 청크 단위로 생성하는 제너레이터 (메모리 사용량은 청크 크기 수준)
+
+    Args:
+        files: [(ZIP 안의 이름, 파일 경로), ...] (없는 파일은 건너뜀)
+        chunk_size: 파일 읽기 단위 (바이트)
+
+    Yields:
+        ZIP 바이트 청크
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode='w', allowZip64=True) as archive:
+        for arcname, path in _unique_arcnames(files):
+            path = Path(path)
+            if not path.is_file():
+                continue
+
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            if path.suffix.lower() in STORED_EXTENSIONS:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+
+            with open(path, 'rb') as src, archive.open(info, 'w') as dst:
+                for chunk in iter(lambda: src.read(chunk_size), b''):
+                    dst.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    # 중앙 디렉터리
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def write_zip(files: list, output) -> int:
+    """
+    ZIP을 파일 또는 바이너리 스트림에 스트리밍 기록
+
+    Args:
+        files: [(ZIP 안의 이름, 파일 경로), ...]
+        output: 저장 경로 또는 write()를 가진 바이너리 스트림 (예: sys.stdout.buffer)
+
+    Returns:
+        기록한 바이트 수
+    """
+    written = 0
+    if hasattr(output, 'write'):
+        for chunk in iter_zip(files):
+            output.write(chunk)
+            written += len(chunk)
+        return written
+
+    with open(output, 'wb') as f:
+        for chunk in iter_zip(files):
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+# ----------------------------------------------------------------------
+# 파일 선택
+# ----------------------------------------------------------------------
+
+def select_batch(folder: str, batch: str, items: list = None) -> list:
+    """다운로드 큐 배치에서 완료된 파일 목록
+
+    Args:
+        folder: 다운로드 폴더
+        batch: 배치 이름
+        items: 큐 항목 목록 (없으면 download_queue_state.json에서 읽음)
+
+    Returns:
+        [(ZIP 안의 이름, 파일 경로), ...]
+    """
+    if items is None:
+        state_path = Path(folder) / DownloadQueue.STATE_NAME
+        if not state_path.exists():
+            return []
+        with open(state_path, 'r', encoding='utf-8') as f:
+            items = json.load(f).get('items', [])
+
+    return [
+        (Path(item['filepath']).name, Path(item['filepath']))
+        for item in items
+        if item.get('batch') == batch and item.get('status') == 'done' and item.get('filepath')
+    ]
+
+
+def select_manifest(
+    manifest,
+    folder: str,
+    urls: list = None,
+    since: str = None,
+    methods: list = None
+) -> list:
+    """다운로드 매니페스트에서 조건에 맞는 파일 목록
+
+    Args:
+        manifest: DownloadManifest
+        folder: 다운로드 폴더
+        urls: 포함할 문서 URL 목록 (없으면 전체)
+        since: 이 시각(ISO 형식) 이후 다운로드된 항목만
+        methods: 확보 방식 필터 (direct / click / pdf_link / page_capture)
+
+    Returns:
+        [(ZIP 안의 이름, 파일 경로), ...] (다운로드 시각 순)
+    """
+    since_dt = datetime.fromisoformat(since) if since else None
+    wanted = set(urls) if urls else None
+
+    selected = []
+    for url, entry in manifest.entries.items():
+        if wanted is not None and url not in wanted:
+            continue
+        if methods and entry.get('method') not in methods:
+            continue
+        if since_dt and datetime.fromisoformat(entry['downloaded_at']) < since_dt:
+            continue
+        path = manifest.local_path(url, folder)
+        if path:
+            selected.append((entry['downloaded_at'], entry['filepath'], path))
+
+    selected.sort()
+    return [(name, path) for _, name, path in selected]
+
+
+def select_names(folder: str, names: list) -> list:
+    """다운로드 폴더의 파일명 목록 (폴더 밖 경로는 무시)"""
+    root = Path(folder)
+    return [(Path(name).name, root / Path(name).name) for name in names]